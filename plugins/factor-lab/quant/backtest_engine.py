@@ -20,6 +20,8 @@ import numpy as np
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from quant.data_manager import QuantDataManager
+from quant.price_panel import PricePanel
+from quant.fundamentals_panel import FundamentalsPanel
 from strategies.base import Strategy
 from utils.dashboard_generator import generate_backtest_dashboard
 
@@ -118,6 +120,7 @@ class BacktestEngine:
         self.initial_cash = initial_cash
         self.commission = commission
         self.slippage = slippage
+        self._price_panel: Optional[PricePanel] = None
 
     def run_backtest(
         self,
@@ -126,7 +129,9 @@ class BacktestEngine:
         start_date: str,
         end_date: str,
         rebalance_freq: str = 'monthly',  # 'monthly', 'quarterly'
-        top_n: int = 50
+        top_n: int = 50,
+        price_panel: Optional[PricePanel] = None,
+        fundamentals: Optional[FundamentalsPanel] = None
     ) -> BacktestResult:
         """
         Run backtest for a strategy
@@ -138,6 +143,10 @@ class BacktestEngine:
             end_date: Backtest end date (YYYY-MM-DD)
             rebalance_freq: Rebalancing frequency ('monthly', 'quarterly')
             top_n: Number of stocks to hold
+            price_panel: Preloaded prices covering the period plus the
+                         strategy's history_days (loaded if None)
+            fundamentals: Preloaded point-in-time fundamentals for strategies
+                          with uses_fundamentals (loaded if None)
 
         Returns:
             BacktestResult with performance metrics
@@ -165,11 +174,28 @@ class BacktestEngine:
         print(f"First rebalance: {rebalance_dates[0]}")
         print(f"Last rebalance: {rebalance_dates[-1]}")
 
+        # Preload date × ticker close prices once for all price lookups
+        if price_panel is None:
+            price_panel = self._load_price_panel(
+                universe,
+                start_date,
+                end_date,
+                history_days=strategy.history_days
+            )
+        self._price_panel = price_panel
+        strategy.set_price_panel(self._price_panel)
+
+        # Point-in-time fundamentals: one query, as-of lookups per rebalance
+        if strategy.uses_fundamentals:
+            if fundamentals is None:
+                fundamentals = self._load_fundamentals(universe, end_date)
+            strategy.set_fundamentals(fundamentals)
+
         # Initialize portfolio
         cash = self.initial_cash
         holdings = {}  # {ticker: shares}
         trade_history = []
-        equity_curve = []
+        snapshots = []  # portfolio state after each rebalance
 
         # Run simulation
         for i, rebalance_date in enumerate(rebalance_dates):
@@ -204,19 +230,17 @@ class BacktestEngine:
                 rebalance_date
             )
 
-            equity_curve.append({
+            snapshots.append({
                 'date': rebalance_date,
                 'portfolio_value': portfolio_value,
                 'cash': cash,
-                'holdings_value': portfolio_value - cash
+                'holdings': holdings
             })
 
             print(f"  Portfolio Value: ${portfolio_value:,.0f}")
 
-        # Create equity curve DataFrame
-        equity_df = pd.DataFrame(equity_curve)
-        equity_df['date'] = pd.to_datetime(equity_df['date'])
-        equity_df.set_index('date', inplace=True)
+        # Mark to market daily between rebalances
+        equity_df = self._build_daily_equity_curve(snapshots, end_date)
 
         # Create trade history DataFrame
         trade_df = pd.DataFrame(trade_history)
@@ -355,10 +379,57 @@ class BacktestEngine:
 
         return current_cash, new_holdings, trades
 
+    def _load_price_panel(
+        self,
+        universe: List[str],
+        start_date: str,
+        end_date: str,
+        history_days: int = 0
+    ) -> PricePanel:
+        """
+        Build the close-price panel covering the backtest period
+
+        Args:
+            universe: List of tickers to load
+            start_date: Backtest start date (YYYY-MM-DD)
+            end_date: Backtest end date (YYYY-MM-DD)
+            history_days: Extra calendar days of history the strategy needs
+
+        Returns:
+            PricePanel with as-of lookups for every rebalance date
+        """
+        lookback = max(10, history_days)
+        start = (datetime.strptime(start_date, '%Y-%m-%d') - timedelta(days=lookback)).strftime('%Y-%m-%d')
+        end = (datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        panel = PricePanel.from_data_manager(self.data_manager, universe, start, end)
+        print(f"Price panel: {len(panel)} dates × {len(panel.tickers)} tickers")
+
+        return panel
+
+    def _load_fundamentals(self, universe: List[str], end_date: str) -> FundamentalsPanel:
+        """
+        Build the point-in-time fundamentals panel for the backtest period
+
+        Args:
+            universe: List of tickers to load
+            end_date: Backtest end date (YYYY-MM-DD)
+
+        Returns:
+            FundamentalsPanel with as-of lookups for every rebalance date
+        """
+        fundamentals = FundamentalsPanel.from_data_manager(self.data_manager, universe, end_date)
+        print(f"Fundamentals: {len(fundamentals)} snapshots × {len(fundamentals.tickers)} tickers")
+
+        return fundamentals
+
     def _get_price(self, ticker: str, date: str) -> Optional[float]:
         """
         Get stock price on a specific date
 
+        Uses the preloaded price panel when the ticker is in it,
+        otherwise falls back to a cache/API lookup.
+
         Args:
             ticker: Stock ticker
             date: Date (YYYY-MM-DD)
@@ -366,6 +437,9 @@ class BacktestEngine:
         Returns:
             Close price or None if not available
         """
+        if self._price_panel is not None and ticker in self._price_panel:
+            return self._price_panel.get_price(ticker, date)
+
         # Get historical data around the date
         date_obj = datetime.strptime(date, '%Y-%m-%d')
         start = (date_obj - timedelta(days=10)).strftime('%Y-%m-%d')
@@ -416,6 +490,70 @@ class BacktestEngine:
 
         return total
 
+    def _build_daily_equity_curve(
+        self,
+        snapshots: List[Dict],
+        end_date: str
+    ) -> pd.DataFrame:
+        """
+        Build a daily mark-to-market equity curve
+
+        Each rebalance contributes its own valuation point, followed by every
+        trading day until the next rebalance (or end_date). Holdings and cash
+        are fixed within a segment, so each day's value is a holdings-vector ×
+        price-matrix dot product over the price panel.
+
+        Args:
+            snapshots: Portfolio state after each rebalance
+                       (date, portfolio_value, cash, holdings)
+            end_date: Backtest end date (YYYY-MM-DD)
+
+        Returns:
+            DataFrame indexed by date with portfolio_value, cash,
+            holdings_value and rebalance (True on rebalance points)
+        """
+        panel = self._price_panel
+        dates, values, cash_values, is_rebalance = [], [], [], []
+
+        for i, snap in enumerate(snapshots):
+            dates.append(np.datetime64(snap['date'], 'D'))
+            values.append(snap['portfolio_value'])
+            cash_values.append(snap['cash'])
+            is_rebalance.append(True)
+
+            # Trading days strictly after this rebalance, up to the next one
+            lo = int(np.searchsorted(panel.dates, np.datetime64(snap['date'], 'D'), side='right'))
+            if i + 1 < len(snapshots):
+                hi = int(np.searchsorted(panel.dates, np.datetime64(snapshots[i + 1]['date'], 'D'), side='left'))
+            else:
+                hi = int(np.searchsorted(panel.dates, np.datetime64(end_date, 'D'), side='right'))
+
+            if hi <= lo:
+                continue
+
+            tickers = list(snap['holdings'])
+            shares = np.array([snap['holdings'][t] for t in tickers], dtype=np.float64)
+            prices = panel.prices_at_rows(np.arange(lo, hi), panel.columns(tickers))
+
+            # Unavailable prices count as zero, like _calculate_portfolio_value
+            holdings_value = np.nan_to_num(prices) @ shares
+
+            dates.extend(panel.dates[lo:hi])
+            values.extend(snap['cash'] + holdings_value)
+            cash_values.extend([snap['cash']] * (hi - lo))
+            is_rebalance.extend([False] * (hi - lo))
+
+        equity_df = pd.DataFrame({
+            'date': pd.to_datetime(np.array(dates, dtype='datetime64[D]')),
+            'portfolio_value': np.array(values, dtype=np.float64),
+            'cash': np.array(cash_values, dtype=np.float64),
+            'rebalance': is_rebalance
+        })
+        equity_df['holdings_value'] = equity_df['portfolio_value'] - equity_df['cash']
+        equity_df.set_index('date', inplace=True)
+
+        return equity_df[['portfolio_value', 'cash', 'holdings_value', 'rebalance']]
+
     def _calculate_performance_metrics(
         self,
         equity_curve: pd.DataFrame,
@@ -442,6 +580,7 @@ class BacktestEngine:
         annual_return = (((final_value / initial_value) ** (1 / years)) - 1) * 100 if years > 0 else 0
 
         # Sharpe Ratio (assume risk-free rate = 0 for simplicity)
+        # Daily mark-to-market values, so sqrt(252) annualization applies
         returns = equity_curve['portfolio_value'].pct_change().dropna()
         sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
 
@@ -552,6 +691,35 @@ class BacktestEngine:
         plt.close()
 
 
+STRATEGY_CHOICES = ['momentum', 'value', 'quality', 'buy_hold']
+
+
+def create_strategy(name: str) -> Tuple[Strategy, str]:
+    """
+    Create a strategy from its CLI name
+
+    Args:
+        name: One of STRATEGY_CHOICES
+
+    Returns:
+        Tuple of (strategy instance, display name)
+    """
+    if name == 'momentum':
+        from strategies.momentum import MomentumStrategy
+        return MomentumStrategy(), "Momentum Strategy"
+    elif name == 'value':
+        from strategies.value_factor import ValueFactorStrategy
+        return ValueFactorStrategy(), "Value Factor Strategy"
+    elif name == 'quality':
+        from strategies.quality import QualityStrategy
+        return QualityStrategy(), "Quality Strategy"
+    elif name == 'buy_hold':
+        from strategies.base import BuyAndHoldStrategy
+        return BuyAndHoldStrategy(), "Buy and Hold Strategy"
+    else:
+        raise ValueError(f"Unknown strategy: {name}")
+
+
 def main():
     """Test BacktestEngine"""
     import sys
@@ -610,7 +778,7 @@ Examples:
     )
 
     parser.add_argument('--strategy', type=str, required=True,
-                       choices=['momentum', 'value', 'quality', 'buy_hold'],
+                       choices=STRATEGY_CHOICES,
                        help='Strategy to backtest')
 
     parser.add_argument('--universe', type=str, default='SP500',
@@ -659,25 +827,7 @@ Examples:
     if args.html is None:
         args.html = os.path.join(output_dir, 'dashboards', f'backtest_{strategy_short}_{timestamp}.html')
 
-    # Import strategies
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-    if args.strategy == 'momentum':
-        from strategies.momentum import MomentumStrategy
-        strategy = MomentumStrategy()
-        strategy_name = "Momentum Strategy"
-    elif args.strategy == 'value':
-        from strategies.value_factor import ValueFactorStrategy
-        strategy = ValueFactorStrategy()
-        strategy_name = "Value Factor Strategy"
-    elif args.strategy == 'quality':
-        from strategies.quality import QualityStrategy
-        strategy = QualityStrategy()
-        strategy_name = "Quality Strategy"
-    else:  # buy_hold
-        from strategies.base import BuyAndHoldStrategy
-        strategy = BuyAndHoldStrategy()
-        strategy_name = "Buy and Hold Strategy"
+    strategy, strategy_name = create_strategy(args.strategy)
 
     # Load universe
     print(f"\n{'='*60}")
@@ -5,15 +5,21 @@ Data Manager for factor-lab
 Handles:
 - Data fetching from yfinance (US stocks) and pykrx (KR stocks)
 - SQLite caching (30-day validity)
+- Point-in-time fundamentals history (ticker, as_of_date snapshots)
+- Persistent per-thread SQLite connections (ConnectionManager)
 - Universe definitions (S&P 500, KOSPI 200, etc.)
 """
 
 import os
 import sys
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import pandas as pd
+import numpy as np
 import yfinance as yf
 
 # Add parent directory to path
@@ -26,6 +32,191 @@ os.makedirs(CACHE_DIR, exist_ok=True)
 DB_PATH = os.path.join(CACHE_DIR, 'market_data_cache.db')
 CACHE_VALIDITY_DAYS = 30
 
+# stock_info columns (excluding updated_at), in table order
+STOCK_INFO_COLUMNS = ['ticker', 'name', 'sector', 'price', 'market_cap', 'pe_ratio', 'pb_ratio',
+                      'roe', 'debt_to_equity', 'operating_margin', 'net_margin', 'current_ratio', 'beta']
+
+HISTORICAL_INSERT_SQL = 'INSERT OR REPLACE INTO historical_prices VALUES (?, ?, ?, ?, ?, ?, ?)'
+
+# fundamentals_history columns: one stock_info snapshot per (ticker, as_of_date)
+FUNDAMENTALS_COLUMNS = ['ticker', 'as_of_date'] + STOCK_INFO_COLUMNS[1:]
+
+FUNDAMENTALS_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO fundamentals_history ({', '.join(FUNDAMENTALS_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(FUNDAMENTALS_COLUMNS))})"
+)
+
+# Days after a fiscal period ends before its statements are assumed public
+# (SEC deadlines: 10-Q within 40-45 days, 10-K within 60-90 days)
+QUARTERLY_REPORT_LAG_DAYS = 45
+ANNUAL_REPORT_LAG_DAYS = 75
+
+# Per-connection pragmas tuned for a read-heavy cache
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',      # safe with WAL, avoids fsync per commit
+    'PRAGMA cache_size=-65536',       # 64MB page cache
+    'PRAGMA mmap_size=268435456',     # 256MB memory-mapped reads
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA busy_timeout=30000',      # wait for writers instead of failing
+)
+
+# Prepared statements kept per connection (sqlite3 statement cache)
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionManager:
+    """
+    Long-lived SQLite connections, one per thread
+
+    Connections are opened lazily on first use in each thread and reused
+    for the manager's lifetime, so their prepared-statement caches stay warm.
+
+    Usage:
+        with ConnectionManager(DB_PATH) as db:
+            rows = db.connection().execute('SELECT ...').fetchall()
+            with db.transaction() as conn:
+                conn.executemany('INSERT ...', rows)
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize Connection Manager
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._reset()
+
+    def _reset(self):
+        """Forget all connections (fresh state for this process)"""
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection (opened on first use)"""
+        if self._pid != os.getpid():
+            # Forked child: SQLite connections must not cross processes
+            self._reset()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30,
+                check_same_thread=False,  # only so close_all() can run from any thread
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run a block in one transaction on the calling thread's connection"""
+        conn = self.connection()
+        with conn:  # commit on success, rollback on error
+            yield conn
+
+    def close_all(self):
+        """Close every connection opened by this manager"""
+        if self._pid != os.getpid():
+            self._reset()
+            return
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __enter__(self) -> 'ConnectionManager':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: Optional[str] = None) -> ConnectionManager:
+    """
+    Get the process-wide ConnectionManager for a database
+
+    Args:
+        db_path: SQLite database file (default: factor-lab cache)
+
+    Returns:
+        Shared ConnectionManager instance
+    """
+    db_path = os.path.abspath(db_path or DB_PATH)
+    with _managers_lock:
+        if db_path not in _managers:
+            _managers[db_path] = ConnectionManager(db_path)
+        return _managers[db_path]
+
+
+def map_tickers(
+    func: Callable[[str], Any],
+    tickers: List[str],
+    workers: int = 1,
+    label: str = 'Progress',
+    max_errors_shown: int = 5
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Apply an I/O-bound function to each ticker, optionally on a thread pool
+
+    Args:
+        func: Called as func(ticker)
+        tickers: Stock tickers
+        workers: Thread count (1 = run serially in the calling thread)
+        label: Prefix for progress lines
+        max_errors_shown: Only print the first N errors
+
+    Returns:
+        Tuple of ({ticker: result} for non-None results, error count)
+    """
+    results = {}
+    errors = 0
+    total = len(tickers)
+
+    def record(i: int, ticker: str, call: Callable[[], Any]):
+        nonlocal errors
+        # Progress indicator
+        if i % 50 == 0 or i == total:
+            print(f"  {label}: {i}/{total} ({i/total*100:.1f}%)")
+        try:
+            result = call()
+            if result is not None:
+                results[ticker] = result
+        except Exception as e:
+            errors += 1
+            if errors <= max_errors_shown:
+                print(f"  Error processing {ticker}: {e}")
+
+    if workers <= 1:
+        for i, ticker in enumerate(tickers, 1):
+            record(i, ticker, lambda: func(ticker))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(func, ticker): ticker for ticker in tickers}
+            for i, future in enumerate(as_completed(futures), 1):
+                record(i, futures[future], future.result)
+
+    if errors > max_errors_shown:
+        print(f"  ... and {errors - max_errors_shown} more errors")
+
+    return results, errors
+
 
 class QuantDataManager:
     """
@@ -38,14 +229,34 @@ class QuantDataManager:
     - Universe definitions (S&P 500, KOSPI 200, etc.)
     """
 
-    def __init__(self):
+    def __init__(self, db: Optional[ConnectionManager] = None):
+        """
+        Initialize Data Manager
+
+        Args:
+            db: ConnectionManager to use (default: shared manager for DB_PATH)
+        """
+        self.db = db or get_connection_manager(DB_PATH)
         self._init_database()
 
+    def close(self):
+        """Close the underlying database connections"""
+        self.db.close_all()
+
+    def __enter__(self) -> 'QuantDataManager':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def _init_database(self):
         """Initialize SQLite database for caching"""
-        conn = sqlite3.connect(DB_PATH)
+        conn = self.db.connection()
         cursor = conn.cursor()
 
+        # WAL: readers don't block the writer (persistent per database file)
+        cursor.execute('PRAGMA journal_mode=WAL')
+
         # Table: stock_info (fundamentals)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS stock_info (
@@ -80,6 +291,34 @@ class QuantDataManager:
             )
         ''')
 
+        # Table: fundamentals_history (point-in-time stock_info snapshots)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fundamentals_history (
+                ticker TEXT,
+                as_of_date TEXT,
+                name TEXT,
+                sector TEXT,
+                price REAL,
+                market_cap REAL,
+                pe_ratio REAL,
+                pb_ratio REAL,
+                roe REAL,
+                debt_to_equity REAL,
+                operating_margin REAL,
+                net_margin REAL,
+                current_ratio REAL,
+                beta REAL,
+                PRIMARY KEY (ticker, as_of_date)
+            )
+        ''')
+
+        # Snapshots cached before fundamentals_history existed
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO fundamentals_history ({', '.join(FUNDAMENTALS_COLUMNS)})
+            SELECT ticker, substr(updated_at, 1, 10), {', '.join(STOCK_INFO_COLUMNS[1:])}
+            FROM stock_info
+        ''')
+
         # Table: universe_members
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS universe_members (
@@ -91,7 +330,6 @@ class QuantDataManager:
         ''')
 
         conn.commit()
-        conn.close()
 
     def get_universe(self, name: str) -> List[str]:
         """
@@ -131,8 +369,7 @@ class QuantDataManager:
 
     def _get_cached_universe(self, name: str) -> Optional[List[str]]:
         """Check if cached universe is still valid"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        cursor = self.db.connection().cursor()
 
         cursor.execute('''
             SELECT ticker, updated_at FROM universe_members
@@ -140,7 +377,6 @@ class QuantDataManager:
         ''', (name,))
 
         rows = cursor.fetchall()
-        conn.close()
 
         if not rows:
             return None
@@ -154,22 +390,16 @@ class QuantDataManager:
 
     def _cache_universe(self, name: str, tickers: List[str]):
         """Cache universe members"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        with self.db.transaction() as conn:
+            # Delete old cache
+            conn.execute('DELETE FROM universe_members WHERE universe = ?', (name,))
 
-        # Delete old cache
-        cursor.execute('DELETE FROM universe_members WHERE universe = ?', (name,))
-
-        # Insert new cache
-        updated_at = datetime.now().isoformat()
-        for ticker in tickers:
-            cursor.execute('''
+            # Insert new cache
+            updated_at = datetime.now().isoformat()
+            conn.executemany('''
                 INSERT INTO universe_members (universe, ticker, updated_at)
                 VALUES (?, ?, ?)
-            ''', (name, ticker, updated_at))
-
-        conn.commit()
-        conn.close()
+            ''', [(name, ticker, updated_at) for ticker in tickers])
 
     def _fetch_sp500(self) -> List[str]:
         """Fetch S&P 500 tickers from Wikipedia"""
@@ -290,17 +520,54 @@ class QuantDataManager:
             print(f"Error fetching {ticker}: {e}")
             return None
 
+    def get_stock_info_bulk(self, tickers: List[str], workers: int = 1) -> pd.DataFrame:
+        """
+        Get fundamentals for many tickers as one DataFrame
+
+        Valid cache rows are read in one query per 500 tickers; only the
+        remaining tickers go through get_stock_info() (API + cache).
+
+        Args:
+            tickers: Stock ticker symbols
+            workers: Threads for fetching uncached tickers (1 = serial)
+
+        Returns:
+            DataFrame indexed by ticker (input order), one column per
+            STOCK_INFO_COLUMNS field; tickers without data are omitted
+        """
+        cursor = self.db.connection().cursor()
+        cutoff = (datetime.now() - timedelta(days=CACHE_VALIDITY_DAYS)).isoformat()
+
+        cached = {}
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT * FROM stock_info
+                WHERE ticker IN ({placeholders}) AND updated_at >= ?
+            ''', (*chunk, cutoff))
+            for row in cursor.fetchall():
+                cached[row[0]] = dict(zip(STOCK_INFO_COLUMNS, row))
+
+        missing = [t for t in tickers if t not in cached]
+        if missing:
+            print(f"Fetching fundamentals for {len(missing)} uncached tickers...")
+            fetched, _ = map_tickers(self.get_stock_info, missing, workers=workers, label='Fundamentals')
+            cached.update(fetched)
+
+        records = [cached[t] for t in tickers if cached.get(t)]
+
+        return pd.DataFrame.from_records(records, columns=STOCK_INFO_COLUMNS).set_index('ticker', drop=False)
+
     def _get_cached_stock_info(self, ticker: str) -> Optional[Dict]:
         """Check if cached stock info is still valid"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        cursor = self.db.connection().cursor()
 
         cursor.execute('''
             SELECT * FROM stock_info WHERE ticker = ?
         ''', (ticker,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return None
@@ -311,39 +578,202 @@ class QuantDataManager:
             return None
 
         # Convert to dict
-        columns = ['ticker', 'name', 'sector', 'price', 'market_cap', 'pe_ratio', 'pb_ratio',
-                   'roe', 'debt_to_equity', 'operating_margin', 'net_margin', 'current_ratio', 'beta']
-
-        return {col: row[i] for i, col in enumerate(columns)}
+        return {col: row[i] for i, col in enumerate(STOCK_INFO_COLUMNS)}
 
     def _cache_stock_info(self, stock_info: Dict):
-        """Cache stock info"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
+        """Cache stock info (and record it as today's fundamentals snapshot)"""
         updated_at = datetime.now().isoformat()
 
-        cursor.execute('''
-            INSERT OR REPLACE INTO stock_info VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            stock_info['ticker'],
-            stock_info['name'],
-            stock_info['sector'],
-            stock_info['price'],
-            stock_info['market_cap'],
-            stock_info['pe_ratio'],
-            stock_info['pb_ratio'],
-            stock_info['roe'],
-            stock_info['debt_to_equity'],
-            stock_info['operating_margin'],
-            stock_info['net_margin'],
-            stock_info['current_ratio'],
-            stock_info['beta'],
-            updated_at
-        ))
+        with self.db.transaction() as conn:
+            conn.execute(FUNDAMENTALS_INSERT_SQL, (
+                stock_info['ticker'],
+                updated_at[:10],
+                *(stock_info[col] for col in STOCK_INFO_COLUMNS[1:])
+            ))
+            conn.execute('''
+                INSERT OR REPLACE INTO stock_info VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                stock_info['ticker'],
+                stock_info['name'],
+                stock_info['sector'],
+                stock_info['price'],
+                stock_info['market_cap'],
+                stock_info['pe_ratio'],
+                stock_info['pb_ratio'],
+                stock_info['roe'],
+                stock_info['debt_to_equity'],
+                stock_info['operating_margin'],
+                stock_info['net_margin'],
+                stock_info['current_ratio'],
+                stock_info['beta'],
+                updated_at
+            ))
 
-        conn.commit()
-        conn.close()
+    def get_fundamentals_history(self, tickers: List[str], end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get cached point-in-time fundamentals snapshots
+
+        Only reads the cache (no API calls).
+
+        Args:
+            tickers: Stock tickers
+            end: Latest as_of_date to include (YYYY-MM-DD, default: all)
+
+        Returns:
+            DataFrame with FUNDAMENTALS_COLUMNS, sorted by as_of_date then ticker
+        """
+        conn = self.db.connection()
+        end = end or '9999-12-31'
+
+        frames = []
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            query = f'''
+                SELECT {', '.join(FUNDAMENTALS_COLUMNS)}
+                FROM fundamentals_history
+                WHERE ticker IN ({placeholders}) AND as_of_date <= ?
+            '''
+            frames.append(pd.read_sql_query(query, conn, params=(*chunk, end)))
+
+        if not frames:
+            return pd.DataFrame(columns=FUNDAMENTALS_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True)
+
+        return df.sort_values(['as_of_date', 'ticker'], kind='stable').reset_index(drop=True)
+
+    def cache_fundamentals_bulk(self, records: List[Dict]) -> int:
+        """
+        Cache fundamentals snapshots in a single transaction
+
+        Args:
+            records: Dicts with FUNDAMENTALS_COLUMNS keys (missing keys = NULL)
+
+        Returns:
+            Number of snapshots written
+        """
+        rows = [tuple(record.get(col) for col in FUNDAMENTALS_COLUMNS) for record in records]
+        with self.db.transaction() as conn:
+            conn.executemany(FUNDAMENTALS_INSERT_SQL, rows)
+
+        return len(rows)
+
+    def download_fundamentals_history(self, ticker: str) -> List[Dict]:
+        """
+        Derive point-in-time fundamentals snapshots from financial statements
+
+        Annual and quarterly statements (trailing twelve months) are turned
+        into stock_info-style snapshots dated when the filing was public
+        (period end + reporting lag). Valuation ratios use the cached close
+        on that date, so run populate_cache.py for prices first. Name,
+        sector and beta come from the current stock_info.
+
+        Network only (does not write to the cache).
+
+        Args:
+            ticker: Stock ticker
+
+        Returns:
+            List of snapshot dicts (FUNDAMENTALS_COLUMNS keys), oldest first
+        """
+        stock = yf.Ticker(ticker)
+        current = self._get_cached_stock_info(ticker) or {}
+
+        periods = pd.concat([
+            self._derive_fundamentals(stock.income_stmt, stock.balance_sheet, 1, ANNUAL_REPORT_LAG_DAYS),
+            self._derive_fundamentals(
+                stock.quarterly_income_stmt, stock.quarterly_balance_sheet, 4, QUARTERLY_REPORT_LAG_DAYS
+            )
+        ])
+        today = pd.Timestamp(datetime.now().date())
+        periods = periods[periods.index <= today]  # filings not public yet
+        periods = periods[~periods.index.duplicated(keep='last')].sort_index()
+        if periods.empty:
+            return []
+
+        start = (periods.index[0] - timedelta(days=10)).strftime('%Y-%m-%d')
+        end = periods.index[-1].strftime('%Y-%m-%d')
+        closes = self.get_close_prices([ticker], start, end)
+        close = closes[ticker].dropna() if ticker in closes.columns else pd.Series(dtype=float)
+
+        snapshots = []
+        for as_of, period in periods.iterrows():
+            prior = close[:as_of]
+            fresh = not prior.empty and (as_of - prior.index[-1]).days <= 10
+            price = float(prior.iloc[-1]) if fresh else np.nan
+            shares = period['shares']
+            equity = period['equity']
+            eps = period['net_income'] / shares if shares > 0 else np.nan
+            book_per_share = equity / shares if shares > 0 else np.nan
+
+            snapshot = {
+                'ticker': ticker,
+                'as_of_date': as_of.strftime('%Y-%m-%d'),
+                'name': current.get('name', ticker),
+                'sector': current.get('sector', 'Unknown'),
+                'price': price,
+                'market_cap': price * shares,
+                'pe_ratio': price / eps if eps > 0 else np.nan,
+                'pb_ratio': price / book_per_share if book_per_share > 0 else np.nan,
+                'roe': period['net_income'] / equity if equity > 0 else np.nan,
+                'debt_to_equity': period['total_debt'] / equity * 100 if equity > 0 else np.nan,  # percent, as yfinance
+                'operating_margin': period['operating_income'] / period['revenue'] if period['revenue'] > 0 else np.nan,
+                'net_margin': period['net_income'] / period['revenue'] if period['revenue'] > 0 else np.nan,
+                'current_ratio': (period['current_assets'] / period['current_liabilities']
+                                  if period['current_liabilities'] > 0 else np.nan),
+                'beta': current.get('beta')
+            }
+            for key, value in snapshot.items():
+                if isinstance(value, float):  # includes numpy floats
+                    snapshot[key] = None if np.isnan(value) else float(value)
+            snapshots.append(snapshot)
+
+        return snapshots
+
+    @staticmethod
+    def _derive_fundamentals(
+        income: pd.DataFrame,
+        balance: pd.DataFrame,
+        ttm_periods: int,
+        lag_days: int
+    ) -> pd.DataFrame:
+        """
+        Align income statement (summed over ttm_periods) and balance sheet per period
+
+        Returns:
+            DataFrame indexed by public date (period end + lag_days) with
+            net_income, revenue, operating_income, equity, total_debt,
+            current_assets, current_liabilities, shares
+        """
+        def row(statement: pd.DataFrame, names: List[str]) -> pd.Series:
+            for name in names:
+                if statement is not None and name in statement.index:
+                    return pd.to_numeric(statement.loc[name], errors='coerce')
+            return pd.Series(np.nan, index=statement.columns if statement is not None else [])
+
+        if income is None or balance is None or income.empty or balance.empty:
+            return pd.DataFrame()
+
+        flows = pd.DataFrame({
+            'net_income': row(income, ['Net Income', 'Net Income Common Stockholders']),
+            'revenue': row(income, ['Total Revenue', 'Operating Revenue']),
+            'operating_income': row(income, ['Operating Income', 'EBIT'])
+        }).sort_index()
+        flows = flows.rolling(ttm_periods, min_periods=ttm_periods).sum()
+
+        stocks = pd.DataFrame({
+            'equity': row(balance, ['Stockholders Equity', 'Common Stock Equity']),
+            'total_debt': row(balance, ['Total Debt']),
+            'current_assets': row(balance, ['Current Assets']),
+            'current_liabilities': row(balance, ['Current Liabilities']),
+            'shares': row(balance, ['Ordinary Shares Number', 'Share Issued'])
+        }).sort_index()
+
+        periods = flows.join(stocks, how='inner').dropna(subset=['net_income', 'equity', 'shares'])
+        periods.index = pd.DatetimeIndex(periods.index).normalize() + pd.Timedelta(days=lag_days)
+
+        return periods
 
     def get_historical_data(self, ticker: str, start: str, end: str, force_refresh: bool = False) -> Optional[pd.DataFrame]:
         """
@@ -367,10 +797,9 @@ class QuantDataManager:
         # Fetch from yfinance
         try:
             print(f"Fetching {ticker} historical data ({start} to {end})...")
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start, end=end)
+            hist = self.download_historical(ticker, start, end)
 
-            if hist.empty:
+            if hist is None:
                 print(f"No data available for {ticker}")
                 return None
 
@@ -383,9 +812,61 @@ class QuantDataManager:
             print(f"Error fetching historical data for {ticker}: {e}")
             return None
 
+    def download_historical(self, ticker: str, start: str, end: str) -> Optional[pd.DataFrame]:
+        """
+        Download historical OHLCV data from yfinance without touching the cache
+
+        Safe to call from worker threads; callers are responsible for
+        caching the result (see _cache_historical).
+
+        Args:
+            ticker: Stock ticker
+            start: Start date (YYYY-MM-DD)
+            end: End date (YYYY-MM-DD, exclusive)
+
+        Returns:
+            DataFrame with OHLCV data, or None if empty
+
+        Raises:
+            Exception: Propagates yfinance/network errors
+        """
+        stock = yf.Ticker(ticker)
+        hist = stock.history(start=start, end=end)
+
+        if hist.empty:
+            return None
+
+        return hist
+
+    def get_last_cached_dates(self, tickers: List[str]) -> Dict[str, str]:
+        """
+        Get the most recent cached date for each ticker
+
+        Args:
+            tickers: Stock tickers
+
+        Returns:
+            Dict mapping ticker -> last cached date (YYYY-MM-DD); uncached tickers omitted
+        """
+        cursor = self.db.connection().cursor()
+
+        last_dates = {}
+        # Stay below SQLite's host parameter limit
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT ticker, MAX(date) FROM historical_prices
+                WHERE ticker IN ({placeholders})
+                GROUP BY ticker
+            ''', chunk)
+            last_dates.update({ticker: date for ticker, date in cursor.fetchall()})
+
+        return last_dates
+
     def _get_cached_historical(self, ticker: str, start: str, end: str) -> Optional[pd.DataFrame]:
         """Check if cached historical data covers the requested period"""
-        conn = sqlite3.connect(DB_PATH)
+        conn = self.db.connection()
 
         query = '''
             SELECT date, open, high, low, close, volume
@@ -395,7 +876,6 @@ class QuantDataManager:
         '''
 
         df = pd.read_sql_query(query, conn, params=(ticker, start, end))
-        conn.close()
 
         if df.empty:
             return None
@@ -408,26 +888,82 @@ class QuantDataManager:
 
         return df
 
+    def get_close_prices(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        """
+        Get cached close prices for many tickers in one query
+
+        Only reads the cache (no API calls). Tickers without cached rows
+        in the period are absent from the result.
+
+        Args:
+            tickers: Stock tickers
+            start: Start date (YYYY-MM-DD)
+            end: End date (YYYY-MM-DD)
+
+        Returns:
+            Wide DataFrame (index: date, columns: tickers) of close prices
+        """
+        conn = self.db.connection()
+
+        frames = []
+        # Stay below SQLite's host parameter limit
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            query = f'''
+                SELECT date, ticker, close
+                FROM historical_prices
+                WHERE ticker IN ({placeholders}) AND date >= ? AND date <= ?
+            '''
+            frames.append(pd.read_sql_query(query, conn, params=(*chunk, start, end)))
+
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['date', 'ticker', 'close'])
+        if df.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='date'))
+
+        df['date'] = pd.to_datetime(df['date'])
+
+        return df.pivot(index='date', columns='ticker', values='close').sort_index()
+
     def _cache_historical(self, ticker: str, df: pd.DataFrame):
         """Cache historical data"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        self.cache_historical_bulk({ticker: df})
 
-        for date, row in df.iterrows():
-            cursor.execute('''
-                INSERT OR REPLACE INTO historical_prices VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                ticker,
-                date.strftime('%Y-%m-%d'),
-                row['Open'],
-                row['High'],
-                row['Low'],
-                row['Close'],
-                int(row['Volume'])
-            ))
+    def cache_historical_bulk(self, frames: Dict[str, pd.DataFrame]) -> int:
+        """
+        Cache historical data for many tickers in a single transaction
 
-        conn.commit()
-        conn.close()
+        Args:
+            frames: Dict mapping ticker -> OHLCV DataFrame (yfinance format)
+
+        Returns:
+            Number of rows written
+        """
+        total = 0
+        with self.db.transaction() as conn:
+            for ticker, df in frames.items():
+                if df is None or df.empty:
+                    continue
+                rows = self._historical_rows(ticker, df)
+                conn.executemany(HISTORICAL_INSERT_SQL, rows)
+                total += len(df)
+
+        return total
+
+    @staticmethod
+    def _historical_rows(ticker: str, df: pd.DataFrame):
+        """Convert an OHLCV DataFrame to insert tuples via NumPy columns"""
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)  # keep exchange-local calendar dates
+        dates = index.values.astype('datetime64[D]').astype(str).tolist()
+        opens = df['Open'].to_numpy(dtype=np.float64).tolist()
+        highs = df['High'].to_numpy(dtype=np.float64).tolist()
+        lows = df['Low'].to_numpy(dtype=np.float64).tolist()
+        closes = df['Close'].to_numpy(dtype=np.float64).tolist()
+        volumes = np.nan_to_num(df['Volume'].to_numpy(dtype=np.float64)).astype(np.int64).tolist()
+
+        return zip([ticker] * len(dates), dates, opens, highs, lows, closes, volumes)
 
     def _update_cache_validity(self, ticker: str, validity_days: int) -> None:
         """
@@ -13,15 +13,16 @@ Calculates 5-factor scores based on Fama-French 5-Factor Model:
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 import yaml
 
 # Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_manager import QuantDataManager
+from quant.data_manager import QuantDataManager
+from quant.price_panel import PricePanel
 
 # Load factor definitions
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'factor_definitions.yaml')
@@ -30,6 +31,14 @@ with open(CONFIG_PATH, 'r') as f:
 
 SECTOR_BENCHMARKS = FACTOR_CONFIG['sector_benchmarks']
 
+# Column order of calculate_composite_score() / score_universe() results
+SCORE_COLUMNS = [
+    'ticker', 'name', 'sector', 'price', 'market_cap',
+    'composite_score', 'value_score', 'quality_score', 'momentum_score',
+    'low_vol_score', 'size_score', 'grade',
+    'pe_ratio', 'pb_ratio', 'roe', 'debt_to_equity', 'beta'
+]
+
 
 class FactorCalculator:
     """
@@ -38,8 +47,14 @@ class FactorCalculator:
     Based on Fama-French 5-Factor Model
     """
 
-    def __init__(self):
-        self.data_manager = QuantDataManager()
+    def __init__(self, data_manager: Optional[QuantDataManager] = None):
+        """
+        Initialize Factor Calculator
+
+        Args:
+            data_manager: Data manager instance (creates new if None)
+        """
+        self.data_manager = data_manager or QuantDataManager()
 
     def calculate_value_score(self, ticker: str, stock_info: Dict, sector: str) -> float:
         """
@@ -394,6 +409,278 @@ class FactorCalculator:
             print(f"Error calculating composite score for {ticker}: {e}")
             return None
 
+    def score_universe(
+        self,
+        tickers: List[str],
+        weights: Dict[str, float],
+        stock_info: Optional[pd.DataFrame] = None,
+        price_panel: Optional[PricePanel] = None,
+        workers: int = 1
+    ) -> pd.DataFrame:
+        """
+        Calculate composite scores for a whole universe at once
+
+        Vectorized equivalent of calling calculate_composite_score() per
+        ticker: fundamentals are loaded into one DataFrame and every factor
+        is scored column-wise with NumPy.
+
+        Args:
+            tickers: Stock tickers
+            weights: Factor weights dict
+                     e.g. {'value': 0.3, 'quality': 0.4, 'momentum': 0.3}
+            stock_info: Fundamentals from get_stock_info_bulk()
+                        (loaded from the data manager if None)
+            price_panel: Close prices covering the last 450 days
+                         (loaded from the data manager if None)
+            workers: Threads for fetching uncached data (1 = serial);
+                     scoring itself is always one vectorized pass
+
+        Returns:
+            DataFrame with SCORE_COLUMNS, one row per ticker with fundamentals
+            (input order); tickers without data are omitted
+        """
+        if stock_info is None:
+            stock_info = self.data_manager.get_stock_info_bulk(tickers, workers=workers)
+        info = stock_info[stock_info['ticker'].isin(tickers)]
+        if info.empty:
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+
+        universe = info['ticker'].tolist()
+
+        if price_panel is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+            start_date = (datetime.now() - timedelta(days=450)).strftime('%Y-%m-%d')
+            price_panel = PricePanel.from_data_manager(
+                self.data_manager, universe, start_date, end_date, workers=workers
+            )
+
+        closes = price_panel.values[:, price_panel.columns(universe)]
+        closes[:, price_panel.columns(universe) < 0] = np.nan
+
+        value_scores = self._value_scores(info)
+        quality_scores = self._quality_scores(info)
+        momentum_scores = self._momentum_scores(closes)
+        low_vol_scores = self._low_vol_scores(info, closes, price_panel.dates)
+        size_scores = self._size_scores(info)
+
+        composite = (
+            value_scores * weights.get('value', 0) +
+            quality_scores * weights.get('quality', 0) +
+            momentum_scores * weights.get('momentum', 0) +
+            low_vol_scores * weights.get('low_volatility', 0) +
+            size_scores * weights.get('size', 0)
+        )
+
+        grades = np.select(
+            [composite >= 90, composite >= 80, composite >= 70, composite >= 60, composite >= 50],
+            ['A+ (Exceptional)', 'A  (Excellent)', 'B+ (Good)', 'B  (Fair)', 'C  (Weak)'],
+            default='D  (Poor)'
+        )
+
+        scored = pd.DataFrame({
+            'ticker': universe,
+            'name': info['name'].to_numpy(),
+            'sector': info['sector'].to_numpy(),
+            'price': info['price'].to_numpy(),
+            'market_cap': info['market_cap'].to_numpy(),
+            'composite_score': np.round(composite, 2),
+            'value_score': np.round(value_scores, 2),
+            'quality_score': np.round(quality_scores, 2),
+            'momentum_score': np.round(momentum_scores, 2),
+            'low_vol_score': np.round(low_vol_scores, 2),
+            'size_score': np.round(size_scores, 2),
+            'grade': grades,
+            'pe_ratio': info['pe_ratio'].to_numpy(),
+            'pb_ratio': info['pb_ratio'].to_numpy(),
+            'roe': info['roe'].to_numpy(),
+            'debt_to_equity': info['debt_to_equity'].to_numpy(),
+            'beta': info['beta'].to_numpy()
+        })
+
+        return scored[SCORE_COLUMNS]
+
+    def score_fundamentals(self, info: pd.DataFrame) -> pd.DataFrame:
+        """
+        Value and quality scores for a fundamentals snapshot
+
+        Args:
+            info: Fundamentals (get_stock_info_bulk() or FundamentalsPanel.asof())
+
+        Returns:
+            DataFrame indexed like info with value_score and quality_score
+        """
+        return pd.DataFrame({
+            'value_score': self._value_scores(info),
+            'quality_score': self._quality_scores(info)
+        }, index=info.index)
+
+    def _value_scores(self, info: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_value_score()"""
+        pe_ratio = info['pe_ratio'].astype(float).fillna(0).to_numpy()
+        pb_ratio = info['pb_ratio'].astype(float).fillna(0).to_numpy()
+
+        sectors = info['sector'].tolist()
+        sector_pe = np.array([SECTOR_BENCHMARKS.get(s, {}).get('pe_ratio', 20.0) for s in sectors], dtype=float)
+        sector_pb = np.array([SECTOR_BENCHMARKS.get(s, {}).get('pb_ratio', 3.0) for s in sectors], dtype=float)
+
+        pe_discount = ((sector_pe - pe_ratio) / sector_pe) * 100
+        pe_score = np.where(
+            pe_ratio > 0,
+            self._normalize_array(pe_discount, excellent=30, good=10, acceptable=-10, poor=-30),
+            50.0
+        )
+
+        pb_discount = ((sector_pb - pb_ratio) / sector_pb) * 100
+        pb_score = np.where(
+            pb_ratio > 0,
+            self._normalize_array(pb_discount, excellent=30, good=10, acceptable=-10, poor=-30),
+            50.0
+        )
+
+        return np.clip(pe_score * 0.5 + pb_score * 0.5, 0, 100)
+
+    def _quality_scores(self, info: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_quality_score()"""
+        roe = info['roe'].astype(float).fillna(0).to_numpy()
+        debt_to_equity = info['debt_to_equity'].astype(float).fillna(0).to_numpy()
+        operating_margin = info['operating_margin'].astype(float).fillna(0).to_numpy()
+
+        roe_score = self._normalize_array(roe * 100, excellent=20, good=15, acceptable=10, poor=5)
+
+        with np.errstate(divide='ignore'):
+            debt_inverse = 100 / (1 + debt_to_equity)
+        debt_score = np.where(
+            debt_to_equity >= 0,
+            self._normalize_array(debt_inverse, excellent=80, good=60, acceptable=40, poor=20),
+            50.0
+        )
+
+        margin_score = self._normalize_array(operating_margin * 100, excellent=20, good=15, acceptable=10, poor=5)
+
+        return np.clip(roe_score * 0.40 + debt_score * 0.30 + margin_score * 0.30, 0, 100)
+
+    def _momentum_scores(self, closes: np.ndarray, period: int = 252) -> np.ndarray:
+        """
+        Vectorized calculate_momentum_score()
+
+        Args:
+            closes: Close prices (dates × tickers) for the last 450 days
+            period: Minimum trading days required per ticker
+
+        Returns:
+            Momentum scores (50 = neutral where history is insufficient)
+        """
+        num_tickers = closes.shape[1]
+        if len(closes) < period:
+            return np.full(num_tickers, 50.0)
+
+        # Per-ticker rows, as if each ticker's history were read on its own
+        packed, counts = self._pack_valid(closes)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return_12m = ((packed[-21] - packed[-252]) / packed[-252]) * 100
+            return_6m = ((packed[-1] - packed[-126]) / packed[-126]) * 100
+
+        mom_12m_score = self._normalize_array(return_12m, excellent=30, good=15, acceptable=5, poor=-10)
+        mom_6m_score = self._normalize_array(return_6m, excellent=15, good=8, acceptable=3, poor=-5)
+
+        momentum = np.clip(mom_12m_score * 0.70 + mom_6m_score * 0.30, 0, 100)
+
+        return np.where(counts >= period, momentum, 50.0)
+
+    def _low_vol_scores(self, info: pd.DataFrame, closes: np.ndarray, dates: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_low_vol_score()
+
+        Args:
+            info: Fundamentals DataFrame (beta)
+            closes: Close prices (dates × tickers)
+            dates: Row dates of closes (datetime64[D])
+
+        Returns:
+            Low volatility scores
+        """
+        beta = info['beta'].astype(float).fillna(0).to_numpy()
+        beta = np.where(beta == 0, 1.0, beta)  # matches `beta or 1.0`
+
+        beta_score = self._normalize_array(1.5 - beta, excellent=0.7, good=0.5, acceptable=0.3, poor=0)
+
+        # 60-day volatility from the last 90 calendar days
+        cutoff = np.datetime64(datetime.now().date(), 'D') - np.timedelta64(90, 'D')
+        recent = closes[dates >= cutoff]
+
+        vol_score = np.full(closes.shape[1], 50.0)
+        if len(recent) >= 60:
+            packed, counts = self._pack_valid(recent)
+            tail = packed[-61:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = tail[1:] / tail[:-1] - 1
+
+            has_history = counts >= 60
+            volatility = np.full(closes.shape[1], np.nan)
+            if has_history.any():
+                volatility[has_history] = np.nanstd(returns[:, has_history], axis=0, ddof=1) * np.sqrt(252) * 100
+
+            vol_score = np.where(
+                has_history,
+                self._normalize_array(50 - volatility, excellent=35, good=30, acceptable=25, poor=20),
+                50.0
+            )
+
+        return np.clip(beta_score * 0.50 + vol_score * 0.50, 0, 100)
+
+    def _size_scores(self, info: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_size_score()"""
+        market_cap_b = info['market_cap'].astype(float).fillna(0).to_numpy() / 1_000_000_000
+
+        return np.select(
+            [market_cap_b == 0, market_cap_b < 2, market_cap_b < 10, market_cap_b < 50],
+            [50.0, 100.0, 70.0, 40.0],
+            default=20.0
+        )
+
+    @staticmethod
+    def _pack_valid(values: np.ndarray):
+        """
+        Move each column's valid (non-NaN) values to the bottom, keeping order
+
+        Row -k of the result is then the k-th most recent observation of each
+        ticker, like hist['Close'].iloc[-k] on the ticker's own history.
+
+        Returns:
+            Tuple of (packed values, valid counts per column)
+        """
+        valid = ~np.isnan(values)
+        order = np.argsort(valid, axis=0, kind='stable')
+
+        return np.take_along_axis(values, order, axis=0), valid.sum(axis=0)
+
+    def _normalize_array(
+        self,
+        values: np.ndarray,
+        excellent: float,
+        good: float,
+        acceptable: float,
+        poor: float
+    ) -> np.ndarray:
+        """
+        Vectorized _normalize() over an array of values
+
+        Piecewise-linear interpolation through (poor, 25), (acceptable, 50),
+        (good, 75), (excellent, 100), with the same below-poor tail.
+        """
+        values = np.asarray(values, dtype=float)
+
+        scaled = np.interp(values, [poor, acceptable, good, excellent], [25.0, 50.0, 75.0, 100.0])
+
+        if poor != 0:
+            with np.errstate(invalid='ignore'):
+                below = 25.0 * np.clip(1 - np.abs((values - poor) / poor), 0, 1)
+        else:
+            below = np.zeros_like(values)
+
+        return np.select([values >= poor, values < poor], [scaled, below], default=np.nan)
+
     def _normalize(
         self,
         value: float,
@@ -92,22 +92,28 @@ def screen_stocks(
     universe: str,
     factor_weights: Dict[str, float],
     min_score: float = 0,
-    max_results: int = None
+    max_results: int = None,
+    workers: int = 1
 ) -> List[Dict]:
     """
     Screen stocks using multi-factor scoring
 
+    Data fetching (yfinance/SQLite, I/O-bound) runs on `workers` threads;
+    scoring is a single vectorized pass. Results and ordering are the
+    same for any worker count.
+
     Args:
         universe: Universe name (SP500, KOSPI200, NASDAQ100)
         factor_weights: Factor weights dict
         min_score: Minimum composite score threshold
         max_results: Maximum number of results (None = all)
+        workers: Concurrent fetch threads (1 = serial)
 
     Returns:
         List of stock dicts sorted by composite score
     """
     data_mgr = QuantDataManager()
-    calc = FactorCalculator()
+    calc = FactorCalculator(data_manager=data_mgr)
 
     # Load universe
     print(f"\n{'='*60}")
@@ -122,41 +128,41 @@ def screen_stocks(
     tickers = data_mgr.get_universe(universe)
     print(f"Universe size: {len(tickers)} tickers\n")
 
-    # Calculate scores for each ticker
-    results = []
-    errors = 0
+    # Fetch missing data (optionally concurrent), then score in one vectorized pass
+    print(f"Calculating factor scores ({workers} fetch worker{'s' if workers > 1 else ''})...")
+    scored = calc.score_universe(tickers, factor_weights, workers=workers)
+    print(f"  Scored: {len(scored)}/{len(tickers)} tickers")
 
-    print("Calculating factor scores...")
-    for i, ticker in enumerate(tickers, 1):
-        try:
-            # Progress indicator
-            if i % 50 == 0 or i == len(tickers):
-                print(f"  Progress: {i}/{len(tickers)} ({i/len(tickers)*100:.1f}%)")
+    results = _to_results(scored, min_score, max_results)
 
-            score_data = calc.calculate_composite_score(ticker, factor_weights)
+    print(f"\nScreening complete: {len(results)} stocks passed (min score: {min_score})")
+    print(f"No data: {len(tickers) - len(scored)} tickers\n")
 
-            if score_data and score_data['composite_score'] >= min_score:
-                results.append(score_data)
+    return results
 
-        except Exception as e:
-            errors += 1
-            if errors <= 5:  # Only show first 5 errors
-                print(f"  Error processing {ticker}: {e}")
 
-    if errors > 5:
-        print(f"  ... and {errors - 5} more errors")
+def _to_results(scored: pd.DataFrame, min_score: float, max_results: int = None) -> List[Dict]:
+    """
+    Filter, sort and convert a score_universe() DataFrame to result dicts
 
-    # Sort by composite score (descending)
-    results.sort(key=lambda x: x['composite_score'], reverse=True)
+    Args:
+        scored: Scored universe DataFrame
+        min_score: Minimum composite score threshold
+        max_results: Maximum number of results (None = all)
+
+    Returns:
+        List of stock dicts sorted by composite score (ties keep universe order)
+    """
+    passed = scored[scored['composite_score'] >= min_score]
+    passed = passed.sort_values('composite_score', ascending=False, kind='stable')
 
-    # Limit results
     if max_results:
-        results = results[:max_results]
+        passed = passed.head(max_results)
 
-    print(f"\nScreening complete: {len(results)} stocks passed (min score: {min_score})")
-    print(f"Errors encountered: {errors}\n")
+    # NaN -> None so JSON export and display checks behave like scalar results
+    passed = passed.astype(object).where(passed.notna(), None)
 
-    return results
+    return passed.to_dict('records')
 
 
 def display_results(results: List[Dict], top_n: int = 20):
@@ -261,6 +267,9 @@ Examples:
 
   # Export to JSON
   python3 factor_screener.py --universe SP500 --factors value:1.0 --output results.json
+
+  # Fetch uncached data on 8 threads
+  python3 factor_screener.py --universe SP500 --factors value:0.5,quality:0.5 --workers 8
         """
     )
 
@@ -307,6 +316,13 @@ Examples:
         help='Number of stocks to display in terminal (default: 20)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Concurrent data-fetch threads (default: 1 = serial)'
+    )
+
     parser.add_argument(
         '--html',
         type=str,
@@ -337,7 +353,8 @@ Examples:
             universe=args.universe,
             factor_weights=factor_weights,
             min_score=args.min_score,
-            max_results=args.top_n
+            max_results=args.top_n,
+            workers=args.workers
         )
 
         # Display results
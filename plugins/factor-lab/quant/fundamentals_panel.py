@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Fundamentals Panel for factor-lab
+
+Point-in-time fundamentals index used by value/quality backtests:
+- Loaded once per backtest from the fundamentals_history table (one bulk query)
+- As-of join: latest snapshot per ticker on or before a rebalance date
+- No API calls in the backtest loop (tickers without snapshots are skipped)
+"""
+
+import os
+import sys
+from typing import List, Optional
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quant.data_manager import STOCK_INFO_COLUMNS, FUNDAMENTALS_COLUMNS
+from quant.price_panel import DateLike, _to_day
+
+# Ignore snapshots older than this (annual filings + reporting lag slack)
+DEFAULT_MAX_STALENESS_DAYS = 450
+
+
+class FundamentalsPanel:
+    """
+    Versioned fundamentals snapshots with as-of lookup semantics
+
+    Attributes:
+        history: Snapshots (FUNDAMENTALS_COLUMNS) sorted by as_of_date
+        tickers: Tickers with at least one snapshot
+    """
+
+    def __init__(
+        self,
+        history: pd.DataFrame,
+        max_staleness_days: int = DEFAULT_MAX_STALENESS_DAYS
+    ):
+        """
+        Initialize Fundamentals Panel
+
+        Args:
+            history: Snapshots with FUNDAMENTALS_COLUMNS (any order)
+            max_staleness_days: Reject snapshots older than this many calendar days
+        """
+        history = history.reindex(columns=FUNDAMENTALS_COLUMNS)
+        history = history.sort_values(['as_of_date', 'ticker'], kind='stable').reset_index(drop=True)
+
+        self.history = history
+        self.tickers = sorted(history['ticker'].unique().tolist())
+        self.max_staleness = np.timedelta64(max_staleness_days, 'D')
+
+        self._dates = pd.to_datetime(history['as_of_date']).values.astype('datetime64[D]')
+
+    @classmethod
+    def from_data_manager(
+        cls,
+        data_manager,
+        tickers: List[str],
+        end: Optional[str] = None,
+        max_staleness_days: int = DEFAULT_MAX_STALENESS_DAYS
+    ) -> 'FundamentalsPanel':
+        """
+        Build a panel from the data manager's fundamentals_history cache
+
+        Args:
+            data_manager: QuantDataManager instance
+            tickers: Tickers to load
+            end: Latest as_of_date needed (YYYY-MM-DD, default: all)
+            max_staleness_days: See __init__
+
+        Returns:
+            FundamentalsPanel instance
+        """
+        history = data_manager.get_fundamentals_history(list(dict.fromkeys(tickers)), end)
+
+        return cls(history, max_staleness_days=max_staleness_days)
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    def asof(self, date: DateLike, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Latest snapshot per ticker on or before date
+
+        Args:
+            date: Rebalance date
+            tickers: Restrict to (and order by) these tickers (default: all)
+
+        Returns:
+            DataFrame indexed by ticker with STOCK_INFO_COLUMNS (same shape as
+            QuantDataManager.get_stock_info_bulk); tickers without a fresh
+            snapshot are omitted
+        """
+        day = _to_day(date)
+        stop = int(np.searchsorted(self._dates, day, side='right'))
+        start = int(np.searchsorted(self._dates, day - self.max_staleness, side='left'))
+
+        latest = self.history.iloc[start:stop].drop_duplicates('ticker', keep='last')
+        latest = latest.set_index('ticker', drop=False)
+
+        if tickers is not None:
+            latest = latest.reindex([t for t in dict.fromkeys(tickers) if t in latest.index])
+
+        return latest[STOCK_INFO_COLUMNS]
+
+    def coverage(self, date: DateLike, tickers: List[str]) -> float:
+        """Fraction of tickers with a snapshot usable on date"""
+        if not tickers:
+            return 0.0
+        return len(self.asof(date, tickers)) / len(set(tickers))
+
+
+def main():
+    """Test FundamentalsPanel with synthetic snapshots"""
+    print("=" * 60)
+    print("TEST: Fundamentals Panel")
+    print("=" * 60)
+
+    history = pd.DataFrame([
+        {'ticker': 'AAA', 'as_of_date': '2022-03-15', 'sector': 'Technology', 'pe_ratio': 30.0},
+        {'ticker': 'AAA', 'as_of_date': '2023-03-15', 'sector': 'Technology', 'pe_ratio': 22.0},
+        {'ticker': 'BBB', 'as_of_date': '2021-01-10', 'sector': 'Energy', 'pe_ratio': 8.0},
+    ])
+    panel = FundamentalsPanel(history)
+
+    for date in ['2022-01-01', '2022-06-30', '2023-06-30']:
+        snapshot = panel.asof(date, ['AAA', 'BBB'])
+        print(f"{date}: {snapshot['pe_ratio'].to_dict()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Price Panel for factor-lab
+
+Columnar in-memory close-price store (date × ticker) used by the backtest
+engine and strategies:
+- Loaded once per backtest from the SQLite cache (one bulk query)
+- Backed by a NumPy float64 matrix (NaN = no observation)
+- O(1) as-of lookups (last close on or before a date)
+"""
+
+import os
+import sys
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple, Union
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quant.data_manager import map_tickers
+
+# Maximum age of an as-of price (matches the old 10-day lookup window)
+DEFAULT_MAX_STALENESS_DAYS = 10
+
+DateLike = Union[str, datetime, pd.Timestamp, np.datetime64]
+
+
+def _to_day(date: DateLike) -> np.datetime64:
+    """Convert a date-like value to a naive numpy datetime64[D]"""
+    ts = pd.Timestamp(date)
+    if ts.tz is not None:
+        ts = ts.tz_localize(None)
+    return np.datetime64(ts.normalize().date(), 'D')
+
+
+class PricePanel:
+    """
+    Date × ticker close-price matrix with as-of lookup semantics
+
+    Attributes:
+        dates: Sorted trading dates (numpy datetime64[D])
+        tickers: Column order of the matrix
+        values: Close prices, shape (len(dates), len(tickers)), NaN where missing
+    """
+
+    def __init__(
+        self,
+        closes: pd.DataFrame,
+        max_staleness_days: int = DEFAULT_MAX_STALENESS_DAYS
+    ):
+        """
+        Initialize Price Panel
+
+        Args:
+            closes: Wide DataFrame of close prices (index: dates, columns: tickers)
+            max_staleness_days: Reject as-of prices older than this many calendar days
+        """
+        closes = closes.sort_index()
+        index = pd.DatetimeIndex(closes.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+
+        self.dates = index.normalize().values.astype('datetime64[D]')
+        self.tickers = [str(t) for t in closes.columns]
+        self.values = closes.to_numpy(dtype=np.float64, na_value=np.nan)
+        self.max_staleness = np.timedelta64(max_staleness_days, 'D')
+
+        self._col = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        # Row index of the last valid observation at or before each row (-1 = none)
+        rows = np.arange(len(self.dates), dtype=np.int64)[:, None]
+        last_valid = np.where(np.isnan(self.values), -1, rows)
+        self._last_valid = np.maximum.accumulate(last_valid, axis=0) if len(self.dates) else last_valid
+
+    @classmethod
+    def from_data_manager(
+        cls,
+        data_manager,
+        tickers: List[str],
+        start: str,
+        end: str,
+        max_staleness_days: int = DEFAULT_MAX_STALENESS_DAYS,
+        workers: int = 1
+    ) -> 'PricePanel':
+        """
+        Build a panel from the data manager's cache
+
+        Tickers missing from the cache are fetched individually through
+        get_historical_data() (which also caches them for the next run).
+
+        Args:
+            data_manager: QuantDataManager instance
+            tickers: Tickers to load
+            start: Start date (YYYY-MM-DD)
+            end: End date (YYYY-MM-DD)
+            max_staleness_days: See __init__
+            workers: Threads for fetching uncached tickers (1 = serial)
+
+        Returns:
+            PricePanel instance
+        """
+        tickers = list(dict.fromkeys(tickers))
+        closes = data_manager.get_close_prices(tickers, start, end)
+
+        missing = [t for t in tickers if t not in closes.columns]
+        if missing:
+            print(f"  Price panel: fetching {len(missing)} uncached tickers...")
+
+        histories, _ = map_tickers(
+            lambda ticker: data_manager.get_historical_data(ticker, start, end),
+            missing,
+            workers=workers,
+            label='Prices'
+        )
+
+        fetched = {}
+        for ticker in missing:
+            hist = histories.get(ticker)
+            if hist is None or hist.empty:
+                continue
+            series = hist['Close'].copy()
+            if series.index.tz is not None:
+                series.index = series.index.tz_localize(None)
+            series.index = series.index.normalize()
+            fetched[ticker] = series[~series.index.duplicated(keep='last')]
+
+        if fetched:
+            closes = closes.join(pd.DataFrame(fetched), how='outer')
+
+        closes = closes.reindex(columns=tickers)
+
+        return cls(closes, max_staleness_days=max_staleness_days)
+
+    def share(self) -> Tuple[Dict, List[SharedMemory]]:
+        """
+        Copy the price matrices into shared memory for worker processes
+
+        Returns:
+            Tuple of (picklable spec for attach(), shared memory blocks).
+            The caller owns the blocks and must close() and unlink() them.
+        """
+        spec = {
+            'dates': self.dates,
+            'tickers': self.tickers,
+            'max_staleness_days': int(self.max_staleness / np.timedelta64(1, 'D')),
+        }
+        blocks = []
+
+        for key, array in (('values', self.values), ('last_valid', self._last_valid)):
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            spec[key] = (block.name, array.shape, array.dtype.str)
+            blocks.append(block)
+
+        return spec, blocks
+
+    @classmethod
+    def attach(cls, spec: Dict) -> Tuple['PricePanel', List[SharedMemory]]:
+        """
+        Build a zero-copy panel over blocks created by share()
+
+        Intended for child processes of the owner (they share its resource
+        tracker, so attaching does not take over unlinking the blocks).
+
+        Args:
+            spec: Spec returned by share()
+
+        Returns:
+            Tuple of (read-only PricePanel, attached blocks to close() when done)
+        """
+        panel = cls.__new__(cls)
+        panel.dates = spec['dates']
+        panel.tickers = spec['tickers']
+        panel.max_staleness = np.timedelta64(spec['max_staleness_days'], 'D')
+        panel._col = {ticker: i for i, ticker in enumerate(panel.tickers)}
+
+        blocks = []
+        for key, attr in (('values', 'values'), ('last_valid', '_last_valid')):
+            name, shape, dtype = spec[key]
+            block = SharedMemory(name=name)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            array.flags.writeable = False
+            setattr(panel, attr, array)
+            blocks.append(block)
+
+        return panel, blocks
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._col
+
+    def row_asof(self, date: DateLike) -> int:
+        """Index of the last trading date on or before date (-1 if none)"""
+        return int(np.searchsorted(self.dates, _to_day(date), side='right')) - 1
+
+    def columns(self, tickers: List[str]) -> np.ndarray:
+        """Column indices for tickers (-1 for tickers not in the panel)"""
+        return np.array([self._col.get(t, -1) for t in tickers], dtype=np.int64)
+
+    def prices_at_row(self, row: int, cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized as-of prices at a panel row
+
+        Args:
+            row: Panel row index (see row_asof)
+            cols: Column indices (default: all tickers, -1 entries yield NaN)
+
+        Returns:
+            Float array of prices, NaN where unavailable or stale
+        """
+        if cols is None:
+            cols = np.arange(len(self.tickers), dtype=np.int64)
+
+        if row < 0 or row >= len(self.dates):
+            return np.full(len(cols), np.nan)
+
+        return self.prices_at_rows(np.array([row]), cols)[0]
+
+    def prices_at_rows(self, rows: np.ndarray, cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized as-of prices for a block of panel rows
+
+        Args:
+            rows: Panel row indices (each within 0..len(panel)-1)
+            cols: Column indices (default: all tickers, -1 entries yield NaN)
+
+        Returns:
+            Float array of shape (len(rows), len(cols)), NaN where unavailable or stale
+        """
+        if cols is None:
+            cols = np.arange(len(self.tickers), dtype=np.int64)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        shape = (len(rows), len(cols))
+
+        out = np.full(shape, np.nan)
+        if not len(rows) or not len(cols):
+            return out
+
+        valid_cols = cols >= 0
+        src = np.full(shape, -1, dtype=np.int64)
+        src[:, valid_cols] = self._last_valid[rows[:, None], cols[valid_cols]]
+
+        ok = src >= 0
+        age = self.dates[rows][:, None] - self.dates[np.where(ok, src, 0)]
+        ok &= age <= self.max_staleness
+
+        col_grid = np.broadcast_to(cols, shape)
+        out[ok] = self.values[src[ok], col_grid[ok]]
+
+        return out
+
+    def get_price(self, ticker: str, date: DateLike) -> Optional[float]:
+        """
+        As-of close price
+
+        Args:
+            ticker: Stock ticker
+            date: Lookup date
+
+        Returns:
+            Last close on or before date, or None if unavailable or stale
+        """
+        col = self._col.get(ticker)
+        if col is None:
+            return None
+
+        day = _to_day(date)
+        row = int(np.searchsorted(self.dates, day, side='right')) - 1
+        if row < 0:
+            return None
+
+        src = self._last_valid[row, col]
+        if src < 0 or day - self.dates[src] > self.max_staleness:
+            return None
+
+        return float(self.values[src, col])
+
+    def get_prices(self, tickers: List[str], date: DateLike) -> Dict[str, float]:
+        """
+        As-of close prices for several tickers (unavailable tickers omitted)
+
+        Args:
+            tickers: Stock tickers
+            date: Lookup date
+
+        Returns:
+            Dict mapping ticker -> price
+        """
+        prices = {}
+        for ticker in tickers:
+            price = self.get_price(ticker, date)
+            if price is not None:
+                prices[ticker] = price
+        return prices
+
+
+def main():
+    """Test PricePanel with synthetic data"""
+    print("=" * 60)
+    print("TEST: Price Panel")
+    print("=" * 60)
+
+    dates = pd.bdate_range('2024-01-01', periods=10)
+    closes = pd.DataFrame({
+        'AAA': np.arange(10, dtype=float) + 100,
+        'BBB': [np.nan] * 3 + list(np.arange(7, dtype=float) + 50),
+    }, index=dates)
+    closes.iloc[5:, 1] = np.nan  # BBB stops trading
+
+    panel = PricePanel(closes, max_staleness_days=3)
+
+    print(f"Dates: {len(panel)}, Tickers: {panel.tickers}")
+    print(f"AAA on 2024-01-06 (Sat): {panel.get_price('AAA', '2024-01-06')}")
+    print(f"BBB on 2024-01-02 (before listing): {panel.get_price('BBB', '2024-01-02')}")
+    print(f"BBB on 2024-01-08: {panel.get_price('BBB', '2024-01-08')}")
+    print(f"BBB on 2024-01-12 (stale): {panel.get_price('BBB', '2024-01-12')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep Runner for factor-lab
+
+Runs a grid of backtests (strategy × top_n × rebalance × commission × slippage):
+- Price panel loaded once (covering the longest strategy lookback)
+- Panel shared with worker processes via shared memory (no per-run reload)
+- Point-in-time fundamentals loaded once and sent to each worker at startup
+- One results table plus one equity curve CSV per run
+"""
+
+import os
+import sys
+import io
+import time
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quant.data_manager import QuantDataManager
+from quant.price_panel import PricePanel
+from quant.fundamentals_panel import FundamentalsPanel
+from quant.backtest_engine import BacktestEngine, STRATEGY_CHOICES, create_strategy, get_output_dir
+
+RESULT_COLUMNS = [
+    'run_id', 'strategy', 'top_n', 'rebalance', 'commission', 'slippage',
+    'total_return', 'annual_return', 'sharpe_ratio', 'max_drawdown',
+    'win_rate', 'num_trades', 'final_value', 'seconds', 'error'
+]
+
+# Per-process state set up by _init_worker
+_worker: Dict = {}
+
+
+def build_grid(
+    strategies: List[str],
+    top_ns: List[int],
+    rebalances: List[str],
+    commissions: List[float],
+    slippages: List[float]
+) -> List[Dict]:
+    """
+    Expand parameter lists into one dict per backtest run
+
+    Returns:
+        List of run configs (with run_id)
+    """
+    grid = []
+    for i, (strategy, top_n, rebalance, commission, slippage) in enumerate(
+        itertools.product(strategies, top_ns, rebalances, commissions, slippages)
+    ):
+        grid.append({
+            'run_id': f"run_{i + 1:03d}",
+            'strategy': strategy,
+            'top_n': top_n,
+            'rebalance': rebalance,
+            'commission': commission,
+            'slippage': slippage
+        })
+    return grid
+
+
+def _init_worker(panel_spec: Dict, settings: Dict):
+    """Attach the shared price panel once per worker process"""
+    panel, blocks = PricePanel.attach(panel_spec)
+    _worker['panel'] = panel
+    _worker['blocks'] = blocks  # keep the mappings alive
+    _worker['settings'] = settings
+
+
+def _run_one(config: Dict, panel: PricePanel, settings: Dict, data_manager: QuantDataManager) -> Tuple[Dict, Optional[pd.DataFrame]]:
+    """
+    Run a single grid point
+
+    Returns:
+        Tuple of (result row, equity curve or None on error)
+    """
+    row = dict(config)
+    start = time.perf_counter()
+
+    try:
+        strategy, _ = create_strategy(config['strategy'])
+        engine = BacktestEngine(
+            data_manager=data_manager,
+            initial_cash=settings['initial_cash'],
+            commission=config['commission'],
+            slippage=config['slippage']
+        )
+
+        # Per-run engine logging would interleave across workers
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = engine.run_backtest(
+                strategy=strategy,
+                universe=settings['universe'],
+                start_date=settings['start_date'],
+                end_date=settings['end_date'],
+                rebalance_freq=config['rebalance'],
+                top_n=config['top_n'],
+                price_panel=panel,
+                fundamentals=settings['fundamentals']
+            )
+
+        row.update({
+            'total_return': result.total_return,
+            'annual_return': result.annual_return,
+            'sharpe_ratio': result.sharpe_ratio,
+            'max_drawdown': result.max_drawdown,
+            'win_rate': result.win_rate,
+            'num_trades': result.num_trades,
+            'final_value': float(result.equity_curve['portfolio_value'].iloc[-1]),
+            'error': None
+        })
+        equity_curve = result.equity_curve
+
+    except Exception as e:
+        row['error'] = str(e)
+        equity_curve = None
+
+    row['seconds'] = time.perf_counter() - start
+    return row, equity_curve
+
+
+def _run_in_worker(config: Dict) -> Tuple[Dict, Optional[pd.DataFrame]]:
+    """Process pool task: run a grid point against the shared panel"""
+    if 'data_manager' not in _worker:
+        _worker['data_manager'] = QuantDataManager()
+    return _run_one(config, _worker['panel'], _worker['settings'], _worker['data_manager'])
+
+
+def run_sweep(
+    grid: List[Dict],
+    universe: List[str],
+    start_date: str,
+    end_date: str,
+    output_dir: str,
+    initial_cash: float = 100000,
+    processes: int = 1,
+    data_manager: Optional[QuantDataManager] = None
+) -> pd.DataFrame:
+    """
+    Run every grid point and write results
+
+    Args:
+        grid: Run configs from build_grid()
+        universe: List of tickers to trade
+        start_date: Backtest start date (YYYY-MM-DD)
+        end_date: Backtest end date (YYYY-MM-DD)
+        output_dir: Directory for results.csv and equity_curves/
+        initial_cash: Starting capital ($)
+        processes: Worker processes (1 = run in this process)
+        data_manager: Data manager instance (creates new if None)
+
+    Returns:
+        DataFrame of results (one row per run, grid order)
+    """
+    data_manager = data_manager or QuantDataManager()
+
+    # One panel covering the longest lookback of any strategy in the grid
+    strategies = [create_strategy(name)[0] for name in {c['strategy'] for c in grid}]
+    history_days = max(strategy.history_days for strategy in strategies)
+    lookback = max(10, history_days)
+    panel_start = (datetime.strptime(start_date, '%Y-%m-%d') - timedelta(days=lookback)).strftime('%Y-%m-%d')
+    panel_end = (datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    print(f"Loading price panel ({panel_start} to {panel_end})...")
+    panel = PricePanel.from_data_manager(data_manager, universe, panel_start, panel_end)
+    print(f"✓ Price panel: {len(panel)} dates × {len(panel.tickers)} tickers\n")
+
+    fundamentals = None
+    if any(strategy.uses_fundamentals for strategy in strategies):
+        fundamentals = FundamentalsPanel.from_data_manager(data_manager, universe, end_date)
+        print(f"✓ Fundamentals: {len(fundamentals)} snapshots × {len(fundamentals.tickers)} tickers\n")
+
+    settings = {
+        'universe': universe,
+        'start_date': start_date,
+        'end_date': end_date,
+        'initial_cash': initial_cash,
+        'fundamentals': fundamentals
+    }
+
+    curves_dir = os.path.join(output_dir, 'equity_curves')
+    os.makedirs(curves_dir, exist_ok=True)
+
+    rows = []
+    start = time.perf_counter()
+
+    def record(row: Dict, equity_curve: Optional[pd.DataFrame]):
+        rows.append(row)
+        if equity_curve is not None:
+            equity_curve.to_csv(os.path.join(curves_dir, f"{row['run_id']}.csv"))
+            status = f"✓ Sharpe {row['sharpe_ratio']:.2f}, Return {row['total_return']:.1f}%"
+        else:
+            status = f"✗ Error: {row['error']}"
+        print(f"[{len(rows)}/{len(grid)}] {row['run_id']} {row['strategy']} "
+              f"top{row['top_n']} {row['rebalance']} "
+              f"c={row['commission']} s={row['slippage']} ... {status}")
+
+    if processes <= 1:
+        for config in grid:
+            record(*_run_one(config, panel, settings, data_manager))
+    else:
+        spec, blocks = panel.share()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(spec, settings)
+            ) as executor:
+                futures = [executor.submit(_run_in_worker, config) for config in grid]
+                for future in as_completed(futures):
+                    record(*future.result())
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    elapsed = time.perf_counter() - start
+
+    order = {config['run_id']: i for i, config in enumerate(grid)}
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    results = results.sort_values('run_id', key=lambda s: s.map(order)).reset_index(drop=True)
+    results.to_csv(os.path.join(output_dir, 'results.csv'), index=False)
+
+    print(f"\n✓ {len(grid)} runs in {elapsed:.1f}s ({processes} process{'es' if processes > 1 else ''})")
+
+    return results
+
+
+def _parse_list(value: str, cast=str) -> List:
+    """Parse a comma-separated CLI value"""
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def cli_main():
+    """CLI entry point for parameter sweeps"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Run a grid of backtests over strategy parameters",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Momentum vs value, two portfolio sizes, both rebalancing frequencies
+  python3 sweep_runner.py --strategies momentum,value --top-n 20,50 \\
+      --rebalance monthly,quarterly --start-date 2014-01-01 --end-date 2024-01-01
+
+  # Transaction cost sensitivity on 8 processes
+  python3 sweep_runner.py --strategies momentum --commission 0,0.001,0.002 \\
+      --slippage 0,0.0005,0.001 --start-date 2020-01-01 --end-date 2024-01-01 --processes 8
+        """
+    )
+
+    parser.add_argument('--strategies', type=str, default='momentum',
+                       help=f"Comma-separated strategies ({', '.join(STRATEGY_CHOICES)})")
+
+    parser.add_argument('--universe', type=str, default='SP500',
+                       choices=['SP500', 'NASDAQ100', 'KOSPI200', 'KOSDAQ150'],
+                       help='Stock universe (default: SP500)')
+
+    parser.add_argument('--start-date', type=str, required=True,
+                       help='Start date (YYYY-MM-DD)')
+
+    parser.add_argument('--end-date', type=str, required=True,
+                       help='End date (YYYY-MM-DD)')
+
+    parser.add_argument('--top-n', type=str, default='50',
+                       help='Comma-separated portfolio sizes (default: 50)')
+
+    parser.add_argument('--rebalance', type=str, default='monthly',
+                       help='Comma-separated rebalancing frequencies (default: monthly)')
+
+    parser.add_argument('--commission', type=str, default='0.001',
+                       help='Comma-separated commission rates (default: 0.001)')
+
+    parser.add_argument('--slippage', type=str, default='0.0005',
+                       help='Comma-separated slippage rates (default: 0.0005)')
+
+    parser.add_argument('--initial-cash', type=float, default=100000,
+                       help='Initial capital (default: 100000)')
+
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                       help='Worker processes (default: CPU count, 1 = no pool)')
+
+    parser.add_argument('--output', type=str, default=None,
+                       help='Output directory (default: tempo/factor-lab/backtests/sweep_YYYYMMDD_HHMMSS/)')
+
+    args = parser.parse_args()
+
+    strategies = _parse_list(args.strategies)
+    rebalances = _parse_list(args.rebalance)
+    for name in strategies:
+        if name not in STRATEGY_CHOICES:
+            parser.error(f"unknown strategy '{name}' (choose from {', '.join(STRATEGY_CHOICES)})")
+    for freq in rebalances:
+        if freq not in ('monthly', 'quarterly'):
+            parser.error(f"unknown rebalance frequency '{freq}' (choose from monthly, quarterly)")
+
+    grid = build_grid(
+        strategies,
+        _parse_list(args.top_n, int),
+        rebalances,
+        _parse_list(args.commission, float),
+        _parse_list(args.slippage, float)
+    )
+
+    if args.output is None:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        args.output = os.path.join(get_output_dir(), 'backtests', f'sweep_{timestamp}')
+
+    print(f"\n{'='*60}")
+    print("PARAMETER SWEEP")
+    print(f"{'='*60}")
+    print(f"Universe: {args.universe}")
+    print(f"Period: {args.start_date} to {args.end_date}")
+    print(f"Grid: {len(grid)} runs")
+    print(f"Processes: {args.processes}")
+    print(f"{'='*60}\n")
+
+    data_mgr = QuantDataManager()
+    universe = data_mgr.get_universe(args.universe)
+    print(f"Universe size: {len(universe)} stocks")
+
+    results = run_sweep(
+        grid,
+        universe,
+        args.start_date,
+        args.end_date,
+        output_dir=args.output,
+        initial_cash=args.initial_cash,
+        processes=args.processes,
+        data_manager=data_mgr
+    )
+
+    ok = results[results['error'].isna()]
+    if not ok.empty:
+        print(f"\nTop runs by Sharpe ratio:")
+        top = ok.sort_values('sharpe_ratio', ascending=False, kind='stable').head(10)
+        print(top[['run_id', 'strategy', 'top_n', 'rebalance', 'commission', 'slippage',
+                   'total_return', 'sharpe_ratio', 'max_drawdown']].to_string(index=False))
+
+    print(f"\n✓ Results saved to {args.output}/")
+    print(f"  - results.csv")
+    print(f"  - equity_curves/ ({len(ok)} files)")
+
+
+if __name__ == '__main__':
+    cli_main()
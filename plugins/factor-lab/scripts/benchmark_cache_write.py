@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Cache Write Benchmark
+
+Purpose: Compare historical_prices write throughput of the legacy per-row
+path (iterrows + one INSERT per row) against the bulk executemany path.
+
+Usage:
+    python3 scripts/benchmark_cache_write.py --tickers 500 --rows 2500
+
+Runs against a temporary database; the real cache is never touched.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quant.data_manager as data_manager_module
+from quant.data_manager import QuantDataManager, get_connection_manager
+
+
+def make_synthetic_frames(num_tickers: int, num_rows: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Generate random-walk OHLCV frames in yfinance format
+
+    Args:
+        num_tickers: Number of tickers
+        num_rows: Trading days per ticker
+        seed: Random seed
+
+    Returns:
+        Dict mapping ticker -> DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end='2024-12-31', periods=num_rows, tz='America/New_York')
+
+    frames = {}
+    for i in range(num_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, num_rows)))
+        frames[f"SYN{i:04d}"] = pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, 0.005, num_rows)),
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Volume': rng.integers(100_000, 10_000_000, num_rows).astype(float)
+        }, index=dates)
+
+    return frames
+
+
+def legacy_cache_historical(db_path: str, ticker: str, df: pd.DataFrame):
+    """Previous implementation: one INSERT per row via iterrows, one commit per ticker"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    for date, row in df.iterrows():
+        cursor.execute('''
+            INSERT OR REPLACE INTO historical_prices VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            ticker,
+            date.strftime('%Y-%m-%d'),
+            row['Open'],
+            row['High'],
+            row['Low'],
+            row['Close'],
+            int(row['Volume'])
+        ))
+
+    conn.commit()
+    conn.close()
+
+
+def _remove_database(db_path: str):
+    """Close pooled connections and delete the database (incl. WAL files)"""
+    get_connection_manager(db_path).close_all()
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _fresh_manager(db_path: str) -> QuantDataManager:
+    """Point the data manager at an empty database"""
+    _remove_database(db_path)
+    data_manager_module.DB_PATH = db_path
+    return QuantDataManager()
+
+
+def run_benchmark(num_tickers: int, num_rows: int, batch_size: int, skip_legacy: bool = False):
+    """Run legacy vs bulk write benchmark and print rows/sec"""
+    print("=" * 60)
+    print("CACHE WRITE BENCHMARK")
+    print("=" * 60)
+    print(f"Tickers: {num_tickers}, Rows/ticker: {num_rows}, Batch: {batch_size} tickers")
+
+    frames = make_synthetic_frames(num_tickers, num_rows)
+    total_rows = num_tickers * num_rows
+    print(f"Total rows: {total_rows:,}\n")
+
+    original_db_path = data_manager_module.DB_PATH
+    tmp_dir = tempfile.mkdtemp(prefix='factor_lab_bench_')
+    db_path = os.path.join(tmp_dir, 'bench.db')
+
+    try:
+        results = {}
+
+        if not skip_legacy:
+            _fresh_manager(db_path)
+            start = time.perf_counter()
+            for ticker, df in frames.items():
+                legacy_cache_historical(db_path, ticker, df)
+            results['legacy (iterrows)'] = time.perf_counter() - start
+
+        manager = _fresh_manager(db_path)
+        start = time.perf_counter()
+        tickers = list(frames)
+        for i in range(0, len(tickers), batch_size):
+            batch = {t: frames[t] for t in tickers[i:i + batch_size]}
+            manager.cache_historical_bulk(batch)
+        results['bulk (executemany)'] = time.perf_counter() - start
+
+        # Sanity check: every row landed
+        conn = sqlite3.connect(db_path)
+        stored = conn.execute('SELECT COUNT(*) FROM historical_prices').fetchone()[0]
+        conn.close()
+
+        print(f"{'Method':<22} {'Seconds':>10} {'Rows/sec':>14}")
+        print('-' * 48)
+        for name, seconds in results.items():
+            print(f"{name:<22} {seconds:>10.2f} {total_rows / seconds:>14,.0f}")
+
+        if len(results) == 2:
+            speedup = results['legacy (iterrows)'] / results['bulk (executemany)']
+            print(f"\nSpeedup: {speedup:.1f}x")
+
+        print(f"Rows stored: {stored:,}")
+
+    finally:
+        data_manager_module.DB_PATH = original_db_path
+        _remove_database(db_path)
+        os.rmdir(tmp_dir)
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark historical price cache writes")
+
+    parser.add_argument('--tickers', type=int, default=500,
+                        help='Number of synthetic tickers (default: 500)')
+    parser.add_argument('--rows', type=int, default=2500,
+                        help='Trading days per ticker (default: 2500 ≈ 10 years)')
+    parser.add_argument('--batch', type=int, default=25,
+                        help='Tickers per bulk transaction (default: 25)')
+    parser.add_argument('--skip-legacy', action='store_true',
+                        help='Only run the bulk path')
+
+    args = parser.parse_args()
+
+    run_benchmark(args.tickers, args.rows, args.batch, skip_legacy=args.skip_legacy)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,31 +6,128 @@ Purpose: Pre-download all historical data for S&P 500 to avoid rate limiting dur
 
 Usage:
     python3 scripts/populate_cache.py --universe SP500 --years 10
+    python3 scripts/populate_cache.py --universe SP500 --fundamentals
+
+Features:
+    - Concurrent downloads (bounded worker pool)
+    - Token-bucket rate limiting (average request rate, optional burst)
+    - Incremental mode: only dates after each ticker's last cached date
+    - Checkpointing: an interrupted run resumes where it stopped
+    - Batched cache writes (one transaction per group of tickers)
+    - Optional point-in-time fundamentals backfill for value/quality backtests
 
 Timeline:
-    - 500 stocks × 2 seconds delay = ~17 minutes minimum
-    - With retries and errors: ~30-45 minutes
+    - Full refresh: 500 stocks at the default 1.5s per request ≈ 12-13 minutes
+      (same request rate as the original sequential script; workers only
+      overlap network latency)
+    - Incremental daily refresh: ~500 small requests, also rate-limited
 """
 
 import os
 import sys
+import json
 import time
+import threading
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional, Set
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from quant.data_manager import QuantDataManager
+from quant.data_manager import QuantDataManager, CACHE_DIR, DB_PATH
+
+# Default rate limit: the original sequential script's 1.5s/request, no burst
+DEFAULT_DELAY = 1.5
+DEFAULT_BURST = 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each API call consumes one token, blocking until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Initialize Token Bucket
+
+        Args:
+            rate: Tokens added per second (average request rate)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def _checkpoint_path(universe: str) -> str:
+    """Checkpoint file for a universe"""
+    return os.path.join(CACHE_DIR, f'populate_cache_{universe}.checkpoint.json')
+
+
+def _load_checkpoint(path: str, run_key: Dict) -> Set[str]:
+    """
+    Load completed tickers from a checkpoint matching this run
+
+    Returns:
+        Set of completed tickers (empty if no matching checkpoint)
+    """
+    if not os.path.exists(path):
+        return set()
+
+    try:
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return set()
+
+    if checkpoint.get('run') != run_key:
+        return set()
+
+    return set(checkpoint.get('completed', []))
+
+
+def _save_checkpoint(path: str, run_key: Dict, completed: Set[str]) -> None:
+    """Atomically write the checkpoint file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'run': run_key, 'completed': sorted(completed)}, f)
+    os.replace(tmp_path, path)
 
 
 def populate_cache(
     universe: str = 'SP500',
     years: int = 10,
-    delay: float = 1.5,
+    delay: float = DEFAULT_DELAY,
     cache_days: int = 365,
-    limit: int = None
+    limit: int = None,
+    workers: int = 8,
+    burst: int = DEFAULT_BURST,
+    incremental: bool = True,
+    resume: bool = True,
+    write_batch: int = 25
 ) -> None:
     """
     Pre-populate cache with historical data
@@ -38,16 +135,22 @@ def populate_cache(
     Args:
         universe: Stock universe (SP500, NASDAQ100, etc.)
         years: Number of years of historical data
-        delay: Delay between API calls (seconds)
+        delay: Average delay between API calls (seconds); rate = 1/delay
         cache_days: Cache validity in days (default: 365)
         limit: Limit to first N stocks (for testing, default: None = all)
+        workers: Number of concurrent download threads
+        burst: Maximum number of back-to-back API calls
+        incremental: Only download dates after each ticker's last cached date
+        resume: Skip tickers completed by an interrupted run with the same settings
+        write_batch: Tickers per cache write transaction
     """
     print("=" * 80)
     print("CACHE PRE-POPULATION")
     print("=" * 80)
     print(f"\nUniverse: {universe}")
     print(f"Years: {years}")
-    print(f"Delay: {delay}s per stock")
+    print(f"Mode: {'incremental' if incremental else 'full refresh'}")
+    print(f"Rate limit: {1 / delay:.1f} req/s (burst {burst}), {workers} workers")
     print(f"Cache validity: {cache_days} days")
     print()
 
@@ -70,56 +173,137 @@ def populate_cache(
     start_date = (datetime.now() - timedelta(days=years * 365)).strftime('%Y-%m-%d')
 
     print(f"Date range: {start_date} to {end_date}")
-    print(f"Estimated time: {len(tickers) * delay / 60:.1f} minutes")
+
+    # Resume from checkpoint
+    checkpoint_path = _checkpoint_path(universe)
+    run_key = {
+        'universe': universe,
+        'start_date': start_date,
+        'end_date': end_date,
+        'incremental': incremental
+    }
+    completed = _load_checkpoint(checkpoint_path, run_key) if resume else set()
+    if completed:
+        print(f"Resuming: {len(completed)} tickers already done (checkpoint)")
+
+    # Per-ticker start dates
+    last_dates = data_mgr.get_last_cached_dates(tickers) if incremental else {}
+    jobs = {}
+    up_to_date = 0
+    for ticker in tickers:
+        if ticker in completed:
+            continue
+
+        ticker_start = start_date
+        if ticker in last_dates:
+            next_day = datetime.strptime(last_dates[ticker], '%Y-%m-%d') + timedelta(days=1)
+            ticker_start = max(start_date, next_day.strftime('%Y-%m-%d'))
+
+        if ticker_start >= end_date:
+            up_to_date += 1
+            completed.add(ticker)
+            continue
+
+        jobs[ticker] = ticker_start
+
+    if incremental:
+        print(f"Already up to date: {up_to_date} tickers")
+    print(f"To download: {len(jobs)} tickers")
+    print(f"Estimated time: {len(jobs) * delay / 60:.1f} minutes")
     print()
 
-    # Download data for each ticker
+    # Download concurrently; cache writes stay on this thread
+    bucket = TokenBucket(rate=1 / delay, capacity=burst)
+
+    def fetch(ticker: str, ticker_start: str):
+        bucket.acquire()
+        return data_mgr.download_historical(ticker, ticker_start, end_date)
+
     success_count = 0
+    no_new_data = 0
     error_count = 0
     errors = []
-
-    for i, ticker in enumerate(tickers, 1):
-        try:
-            # Progress indicator
-            progress = (i / len(tickers)) * 100
-            print(f"[{i}/{len(tickers)}] ({progress:.1f}%) Fetching {ticker}...", end=" ")
-
-            # Fetch and cache data
-            hist = data_mgr.get_historical_data(
-                ticker,
-                start_date,
-                end_date,
-                force_refresh=True  # Force API call even if cached
-            )
-
-            if hist is not None and len(hist) > 0:
+    done = 0
+    pending = {}  # ticker -> DataFrame awaiting the next batched write
+
+    def flush():
+        """Write pending tickers in one transaction, then checkpoint them"""
+        if pending:
+            data_mgr.cache_historical_bulk(pending)
+            for ticker in pending:
                 # Update cache validity to 365 days
                 data_mgr._update_cache_validity(ticker, cache_days)
-                print(f"✓ {len(hist)} days")
+            completed.update(pending)
+            pending.clear()
+        _save_checkpoint(checkpoint_path, run_key, completed)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {
+            executor.submit(fetch, ticker, ticker_start): ticker
+            for ticker, ticker_start in jobs.items()
+        }
+
+        for future in as_completed(futures):
+            ticker = futures[future]
+            done += 1
+            progress = (done / len(jobs)) * 100
+            prefix = f"[{done}/{len(jobs)}] ({progress:.1f}%) {ticker}..."
+
+            try:
+                hist = future.result()
+            except Exception as e:
+                print(f"{prefix} ✗ Error: {e}")
+                error_count += 1
+                errors.append(f"{ticker}: {e}")
+                continue
+
+            if hist is not None and len(hist) > 0:
+                pending[ticker] = hist
+                print(f"{prefix} ✓ {len(hist)} days")
                 success_count += 1
+            elif ticker in last_dates:
+                # Incremental fetch with nothing new (weekend/holiday)
+                print(f"{prefix} - No new data")
+                no_new_data += 1
+                completed.add(ticker)
             else:
-                print(f"⚠ No data")
+                print(f"{prefix} ⚠ No data")
                 error_count += 1
                 errors.append(f"{ticker}: No data available")
+                continue
 
-            # Rate limiting delay
-            if i < len(tickers):  # Don't delay after last ticker
-                time.sleep(delay)
+            if len(pending) >= write_batch:
+                flush()
 
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            error_count += 1
-            errors.append(f"{ticker}: {e}")
-            time.sleep(delay)  # Still delay on error
-            continue
+        flush()
+
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        flush()
+        print(f"\n\nInterrupted. Progress saved to {checkpoint_path}")
+        print("Run the same command again to resume.")
+        return
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        data_mgr.close()
+
+    # Run finished: errors are retried next time, so only drop a clean checkpoint
+    if error_count == 0 and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    elif error_count:
+        _save_checkpoint(checkpoint_path, run_key, completed)
 
     # Summary
+    total = max(len(jobs), 1)
     print()
     print("=" * 80)
     print("CACHE PRE-POPULATION COMPLETE")
     print("=" * 80)
-    print(f"\nSuccessful: {success_count}/{len(tickers)} ({success_count/len(tickers)*100:.1f}%)")
-    print(f"Errors: {error_count}/{len(tickers)} ({error_count/len(tickers)*100:.1f}%)")
+    print(f"\nSuccessful: {success_count}/{len(jobs)} ({success_count/total*100:.1f}%)")
+    if incremental:
+        print(f"Up to date: {up_to_date + no_new_data}")
+    print(f"Errors: {error_count}/{len(jobs)} ({error_count/total*100:.1f}%)")
 
     if errors:
         print(f"\n{len(errors)} Errors:")
@@ -127,17 +311,97 @@ def populate_cache(
             print(f"  - {error}")
         if len(errors) > 10:
             print(f"  ... and {len(errors) - 10} more")
+        print("\nRe-run the same command to retry failed tickers.")
 
-    # Get cache location
-    import os
-    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-    db_path = os.path.join(cache_dir, 'market_data_cache.db')
-
-    print(f"\nCache location: {db_path}")
+    print(f"\nCache location: {DB_PATH}")
     print(f"Cache validity: {cache_days} days")
     print("\n✓ Backtests can now run without rate limiting!")
 
 
+def populate_fundamentals(
+    universe: str = 'SP500',
+    delay: float = DEFAULT_DELAY,
+    limit: int = None,
+    workers: int = 8,
+    burst: int = DEFAULT_BURST,
+    write_batch: int = 25
+) -> None:
+    """
+    Backfill point-in-time fundamentals history from financial statements
+
+    Run after the price cache is populated (P/E, P/B use cached closes).
+
+    Args:
+        universe: Stock universe (SP500, NASDAQ100, etc.)
+        delay: Average delay between API calls (seconds); rate = 1/delay
+        limit: Limit to first N stocks (for testing, default: None = all)
+        workers: Number of concurrent download threads
+        burst: Maximum number of back-to-back API calls
+        write_batch: Tickers per cache write transaction
+    """
+    print("=" * 80)
+    print("FUNDAMENTALS HISTORY BACKFILL")
+    print("=" * 80)
+
+    data_mgr = QuantDataManager()
+    tickers = data_mgr.get_universe(universe)
+    if limit is not None and limit > 0:
+        tickers = tickers[:limit]
+    print(f"\nTickers: {len(tickers)}")
+    print(f"Estimated time: {len(tickers) * 2 * delay / 60:.1f} minutes\n")
+
+    bucket = TokenBucket(rate=1 / delay, capacity=burst)
+
+    def fetch(ticker: str):
+        bucket.acquire()
+        data_mgr.get_stock_info(ticker)  # name/sector/beta (cached for 30 days)
+        bucket.acquire()
+        return data_mgr.download_fundamentals_history(ticker)
+
+    snapshot_count = 0
+    errors = []
+    pending = []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(fetch, ticker): ticker for ticker in tickers}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            ticker = futures[future]
+            prefix = f"[{done}/{len(tickers)}] {ticker}..."
+
+            try:
+                snapshots = future.result()
+            except Exception as e:
+                print(f"{prefix} ✗ Error: {e}")
+                errors.append(f"{ticker}: {e}")
+                continue
+
+            if not snapshots:
+                print(f"{prefix} ⚠ No statements")
+                errors.append(f"{ticker}: No statements available")
+                continue
+
+            print(f"{prefix} ✓ {len(snapshots)} snapshots "
+                  f"({snapshots[0]['as_of_date']} to {snapshots[-1]['as_of_date']})")
+            pending.extend(snapshots)
+            snapshot_count += len(snapshots)
+
+            if done % write_batch == 0:
+                data_mgr.cache_fundamentals_bulk(pending)
+                pending.clear()
+
+    data_mgr.cache_fundamentals_bulk(pending)
+    data_mgr.close()
+
+    print(f"\n✓ {snapshot_count} snapshots for {len(tickers) - len(errors)}/{len(tickers)} tickers")
+    if errors:
+        print(f"\n{len(errors)} Errors:")
+        for error in errors[:10]:
+            print(f"  - {error}")
+        if len(errors) > 10:
+            print(f"  ... and {len(errors) - 10} more")
+
+
 def main():
     """CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -148,11 +412,17 @@ Examples:
   # Test with 10 stocks first
   python3 scripts/populate_cache.py --universe SP500 --years 10 --limit 10
 
-  # Populate S&P 500 with 10 years of data
+  # Populate S&P 500 with 10 years of data (only missing dates are downloaded)
   python3 scripts/populate_cache.py --universe SP500 --years 10
 
-  # Populate NASDAQ 100 with 5 years
-  python3 scripts/populate_cache.py --universe NASDAQ100 --years 5 --delay 2.0
+  # Re-download everything, slower rate
+  python3 scripts/populate_cache.py --universe NASDAQ100 --years 5 --full --delay 2.0
+
+  # Ignore checkpoint from an interrupted run
+  python3 scripts/populate_cache.py --universe SP500 --no-resume
+
+  # Prices, then point-in-time fundamentals for value/quality backtests
+  python3 scripts/populate_cache.py --universe SP500 --fundamentals
         """
     )
 
@@ -174,8 +444,40 @@ Examples:
     parser.add_argument(
         '--delay',
         type=float,
-        default=1.5,
-        help='Delay between API calls in seconds (default: 1.5)'
+        default=DEFAULT_DELAY,
+        help=f'Average delay between API calls in seconds (default: {DEFAULT_DELAY}, as measured for 503/503 success)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Concurrent download threads (default: 8)'
+    )
+
+    parser.add_argument(
+        '--burst',
+        type=int,
+        default=DEFAULT_BURST,
+        help=f'Maximum back-to-back API calls (default: {DEFAULT_BURST} = no burst)'
+    )
+
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-download the full date range instead of only missing dates'
+    )
+
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Ignore checkpoint from a previous interrupted run'
+    )
+
+    parser.add_argument(
+        '--fundamentals',
+        action='store_true',
+        help='Also backfill point-in-time fundamentals (for value/quality backtests)'
     )
 
     parser.add_argument(
@@ -194,15 +496,32 @@ Examples:
 
     args = parser.parse_args()
 
+    if args.delay <= 0:
+        parser.error('--delay must be positive')
+
     # Run cache population
     populate_cache(
         universe=args.universe,
         years=args.years,
         delay=args.delay,
         cache_days=args.cache_days,
-        limit=args.limit
+        limit=args.limit,
+        workers=args.workers,
+        burst=args.burst,
+        incremental=not args.full,
+        resume=not args.no_resume
     )
 
+    if args.fundamentals:
+        print()
+        populate_fundamentals(
+            universe=args.universe,
+            delay=args.delay,
+            limit=args.limit,
+            workers=args.workers,
+            burst=args.burst
+        )
+
 
 if __name__ == '__main__':
     main()
@@ -21,8 +21,16 @@ class Strategy(ABC):
     Optional overrides:
     - get_portfolio_weights(): Custom position sizing (default: equal weight)
     - validate_selection(): Custom validation logic
+    - history_days: Price history to preload for batch mode (default: 0)
+    - uses_fundamentals: Preload point-in-time fundamentals (default: False)
     """
 
+    # Calendar days of price history needed before a rebalance date
+    history_days: int = 0
+
+    # Whether select_stocks() reads fundamentals (BacktestEngine preloads them)
+    uses_fundamentals: bool = False
+
     def __init__(self, name: str, description: str):
         """
         Initialize strategy
@@ -33,6 +41,27 @@ class Strategy(ABC):
         """
         self.name = name
         self.description = description
+        self.price_panel = None
+        self.fundamentals = None
+
+    def set_price_panel(self, price_panel) -> None:
+        """
+        Attach a shared PricePanel (set by BacktestEngine before a run)
+
+        Strategies may use it for batch calculations instead of
+        per-ticker data_manager lookups. None disables batch mode.
+        """
+        self.price_panel = price_panel
+
+    def set_fundamentals(self, fundamentals) -> None:
+        """
+        Attach a point-in-time FundamentalsPanel (set by BacktestEngine before a run)
+
+        Strategies should read fundamentals as of each rebalance date from it
+        instead of data_manager.get_stock_info(), which only holds today's
+        snapshot. None restores the per-ticker lookup.
+        """
+        self.fundamentals = fundamentals
 
     @abstractmethod
     def select_stocks(
@@ -15,6 +15,7 @@ import os
 import sys
 from datetime import datetime, timedelta
 from typing import List
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -35,6 +36,11 @@ class MomentumStrategy(Strategy):
     - lookback_days: 252 (≈12 months trading days)
     - skip_days: 21 (≈1 month trading days)
     - top_n: Number of stocks to select
+
+    Batch mode:
+    When a PricePanel is attached (BacktestEngine does this), momentum for
+    the whole universe is computed from the shared price matrix in one
+    vectorized pass instead of one data_manager lookup per ticker.
     """
 
     def __init__(self, lookback_days: int = 252, skip_days: int = 21):
@@ -52,6 +58,10 @@ class MomentumStrategy(Strategy):
         self.lookback_days = lookback_days
         self.skip_days = skip_days
 
+        # Calendar days to preload: trading days * 1.5 + holiday buffer
+        # (252 + 21 -> 439 days ≈ 300 trading days)
+        self.history_days = int((lookback_days + skip_days) * 1.5) + 30
+
     def select_stocks(
         self,
         universe: List[str],
@@ -71,6 +81,9 @@ class MomentumStrategy(Strategy):
         Returns:
             List of top N tickers by momentum
         """
+        if self.price_panel is not None:
+            return self._select_stocks_batch(universe, date, top_n)
+
         momentum_scores = []
 
         # Calculate momentum for each stock
@@ -97,6 +110,82 @@ class MomentumStrategy(Strategy):
 
         return selected
 
+    def calculate_momentum_batch(
+        self,
+        universe: List[str],
+        date: str,
+        price_panel
+    ) -> np.ndarray:
+        """
+        Calculate momentum for the whole universe at once
+
+        Uses the same point-in-time rules as _calculate_momentum: only rows
+        strictly before the rebalance date, skip the most recent skip_days,
+        then look back lookback_days.
+
+        Args:
+            universe: List of ticker symbols
+            date: Rebalance date (YYYY-MM-DD)
+            price_panel: PricePanel covering the lookback window
+
+        Returns:
+            Array of returns (%) aligned with universe, NaN if insufficient data
+        """
+        # Last row strictly before the rebalance date
+        end_row = int(np.searchsorted(price_panel.dates, np.datetime64(date, 'D'), side='left')) - 1
+
+        row_1m = end_row - self.skip_days
+        row_12m = row_1m - self.lookback_days
+
+        if row_12m < 0:
+            print(f"  Warning: price panel has {end_row + 1} trading days before {date}, "
+                  f"momentum needs {self.lookback_days + self.skip_days + 1} (no stocks selected)")
+            return np.full(len(universe), np.nan)
+
+        cols = price_panel.columns(universe)
+        price_1m_ago = price_panel.prices_at_row(row_1m, cols)
+        price_12m_ago = price_panel.prices_at_row(row_12m, cols)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            momentum = (price_1m_ago / price_12m_ago - 1) * 100
+
+        momentum[~np.isfinite(momentum)] = np.nan
+        return momentum
+
+    def _select_stocks_batch(
+        self,
+        universe: List[str],
+        date: str,
+        top_n: int
+    ) -> List[str]:
+        """
+        Select top N tickers using the attached price panel
+
+        Args:
+            universe: List of ticker symbols
+            date: Rebalance date (YYYY-MM-DD)
+            top_n: Number of stocks to select
+
+        Returns:
+            List of top N tickers by momentum (descending)
+        """
+        momentum = self.calculate_momentum_batch(universe, date, self.price_panel)
+
+        valid = np.flatnonzero(~np.isnan(momentum))
+        k = min(top_n, len(valid))
+        if k <= 0:
+            return []
+
+        # Partial selection of the top k, then order only those k
+        scores = momentum[valid]
+        if k < len(valid):
+            top = np.sort(np.argpartition(-scores, k - 1)[:k])
+        else:
+            top = np.arange(len(valid))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [universe[i] for i in valid[top]]
+
     def _calculate_momentum(
         self,
         ticker: str,
@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.base import Strategy
 from quant.factor_calculator import FactorCalculator
 from typing import List
+import numpy as np
 
 
 class QualityStrategy(Strategy):
@@ -32,8 +33,15 @@ class QualityStrategy(Strategy):
     3. Select top N stocks
 
     Higher quality score = Better fundamentals
+
+    Point-in-time mode:
+    When a FundamentalsPanel is attached (BacktestEngine does this), each
+    rebalance scores the snapshot that was public on that date, in one
+    vectorized pass and without API calls.
     """
 
+    uses_fundamentals = True
+
     def __init__(self):
         """Initialize Quality Factor Strategy"""
         super().__init__(
@@ -61,6 +69,9 @@ class QualityStrategy(Strategy):
         Returns:
             List of top N tickers by quality score
         """
+        if self.fundamentals is not None:
+            return self._select_stocks_asof(universe, date, top_n)
+
         quality_scores = []
 
         # Calculate quality score for each stock
@@ -100,6 +111,21 @@ class QualityStrategy(Strategy):
 
         return selected
 
+    def _select_stocks_asof(self, universe: List[str], date: str, top_n: int) -> List[str]:
+        """Rank the point-in-time fundamentals snapshot for date"""
+        info = self.fundamentals.asof(date, universe)
+        if info.empty:
+            print(f"  Warning: No point-in-time fundamentals on or before {date} "
+                  f"(run scripts/populate_cache.py --fundamentals)")
+            return []
+
+        scores = self.factor_calc.score_fundamentals(info)['quality_score'].to_numpy()
+
+        # Stable sort keeps universe order among ties (same as the per-ticker path)
+        order = np.argsort(-scores, kind='stable')[:top_n]
+
+        return info['ticker'].iloc[order].tolist()
+
 
 def main():
     """Test Quality Factor Strategy"""
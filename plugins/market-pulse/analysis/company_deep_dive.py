@@ -6,8 +6,11 @@
 
 import sys
 import os
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 # 기존 분석 도구 임포트
@@ -116,6 +119,19 @@ class DeepDiveReport:
     investment_horizon: str  # 단기/중기/장기
     confidence_level: float  # 0-100
 
+    # 단계별 소요 시간 (초, 실행 순서)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class AnalysisStage:
+    """심층 분석 단계 (스케줄러 실행 단위)"""
+    name: str
+    label: str
+    run: Callable  # 선행 단계 결과를 deps 순서대로 인자로 받음
+    deps: Tuple[str, ...] = ()
+    required: bool = False  # None 반환 시 분석 중단
+
 
 class CompanyDeepDiveAnalyzer:
     """
@@ -123,61 +139,183 @@ class CompanyDeepDiveAnalyzer:
     8가지 투자 대가의 철학을 통합한 멀티 퍼스펙티브 분석
     """
 
+    # 전 단계가 사용하는 MCP 도구 (종목당 1회 배치 조회)
+    DEEP_DIVE_TOOLS = [
+        "get_company_info", "get_fundamental_metrics",
+        "get_valuation_metrics", "get_price_data"
+    ]
+
+    # 단계 동시 실행 수 (독립 단계: 그레이엄, 버핏, 린치, 달리오, 피셔)
+    DEFAULT_STAGE_WORKERS = 5
+
+    # 관심 종목 동시 분석 수 (전역 상한)
+    DEFAULT_WATCHLIST_WORKERS = 4
+
     def __init__(self):
         self.mcp_client = StockMCPClient()
         self.graham_calc = IntrinsicValueCalculator()
         self.lynch_screener = LynchScreener()
 
-    def analyze(self, ticker: str) -> Optional[DeepDiveReport]:
-        """종합 심층 분석 실행"""
+    def _get_metrics(self, ticker: str, tool: str, prefetched: Optional[Dict] = None) -> Dict:
+        """미리 받아온 배치 결과가 있으면 사용, 없으면 MCP 도구 개별 호출"""
+        if prefetched and tool in prefetched:
+            return prefetched[tool]
+        return getattr(self.mcp_client, tool)(ticker)
+
+    def _prefetch(self, tickers: List[str], max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """분석에 필요한 원시 데이터 배치 조회 (실패 시 빈 dict → 단계별 개별 호출)"""
+        try:
+            return self.mcp_client.get_batch_metrics(
+                tickers, tools=self.DEEP_DIVE_TOOLS, max_workers=max_workers
+            )
+        except Exception as e:
+            print(f"⚠️ 배치 조회 실패, 단계별 조회로 진행: {str(e)}")
+            return {}
+
+    def _build_stages(self, ticker: str, sector: str, prefetched: Optional[Dict]) -> List[AnalysisStage]:
+        """분석 단계와 의존 관계 정의 (위상 정렬 순서)"""
+        return [
+            AnalysisStage("graham", "그레이엄 안전마진",
+                          lambda: self.graham_calc.calculate_graham_value(ticker, prefetched=prefetched),
+                          required=True),
+            AnalysisStage("buffett", "버핏 경제적 해자",
+                          lambda: self._analyze_buffett(ticker, sector, prefetched)),
+            AnalysisStage("lynch", "린치 GARP",
+                          lambda: self.lynch_screener.classify_stock(ticker, prefetched=prefetched),
+                          required=True),
+            AnalysisStage("munger", "멍거 역행 사고",
+                          lambda graham, lynch: self._analyze_munger(ticker, graham, lynch),
+                          deps=("graham", "lynch")),
+            AnalysisStage("asness", "애스니스 팩터",
+                          lambda graham, lynch: self._analyze_asness(ticker, graham, lynch),
+                          deps=("graham", "lynch")),
+            AnalysisStage("dalio", "달리오 경제 사이클",
+                          lambda: self._analyze_dalio(ticker, sector)),
+            AnalysisStage("fisher", "피셔 스캐터버트",
+                          lambda: self._analyze_fisher(ticker, prefetched)),
+        ]
+
+    def _run_stages(self, stages: List[AnalysisStage], max_workers: int,
+                    verbose: bool = True) -> Optional[Tuple[Dict, Dict[str, float]]]:
+        """
+        의존 관계를 지키며 단계 실행 (선행 단계가 끝난 단계부터 동시 실행)
+
+        Args:
+            stages: 분석 단계 (위상 정렬 순서)
+            max_workers: 동시 실행 수 (1 이하 = 현재 스레드에서 순차 실행)
+            verbose: 단계 완료 출력 여부
+
+        Returns:
+            (단계별 결과, 단계별 소요 시간) 또는 필수 단계 실패 시 None
+        """
+        results = {}
+        timings = {}
+        total = len(stages)
+
+        def timed(stage: AnalysisStage, args: List):
+            start = time.perf_counter()
+            value = stage.run(*args)
+            return value, time.perf_counter() - start
+
+        def finish(stage: AnalysisStage, value, elapsed: float) -> bool:
+            timings[stage.name] = elapsed
+            if verbose:
+                print(f"   {len(timings)}/{total} {stage.label} 분석 완료 ({elapsed:.2f}s)")
+            if value is None and stage.required:
+                return False
+            results[stage.name] = value
+            return True
+
+        if max_workers <= 1:
+            for stage in stages:
+                value, elapsed = timed(stage, [results[d] for d in stage.deps])
+                if not finish(stage, value, elapsed):
+                    return None
+            return results, timings
+
+        pending = list(stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for stage in [s for s in pending if all(d in results for d in s.deps)]:
+                    pending.remove(stage)
+                    future = executor.submit(timed, stage, [results[d] for d in stage.deps])
+                    running[future] = stage
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    if not finish(stage, *future.result()):
+                        for other in running:
+                            other.cancel()
+                        return None
+
+        return results, timings
+
+    def analyze(self, ticker: str, prefetched: Optional[Dict] = None,
+                stage_workers: Optional[int] = None,
+                verbose: bool = True) -> Optional[DeepDiveReport]:
+        """
+        종합 심층 분석 실행
+
+        원시 데이터를 한 번에 조회한 뒤 서로 독립적인 단계(그레이엄, 버핏, 린치,
+        달리오, 피셔)는 동시에, 그레이엄·린치 결과가 필요한 단계(멍거, 애스니스)는
+        두 단계가 끝난 뒤 실행
+
+        Args:
+            ticker: 종목 티커
+            prefetched: get_batch_metrics로 받아온 이 종목의 {도구: 결과} (없으면 배치 조회)
+            stage_workers: 단계 동시 실행 수 (기본값: DEFAULT_STAGE_WORKERS, 1 = 순차)
+            verbose: 진행 상황 출력 여부
+
+        Returns:
+            DeepDiveReport (stage_timings 포함) 또는 실패 시 None
+        """
+        if stage_workers is None:
+            stage_workers = self.DEFAULT_STAGE_WORKERS
+
         try:
-            print(f"\n🔍 {ticker} 심층 분석 시작...\n")
+            if verbose:
+                print(f"\n🔍 {ticker} 심층 분석 시작...\n")
+
+            # 기본 데이터 수집 (전 단계 공용, 1회)
+            start = time.perf_counter()
+            if prefetched is None:
+                prefetched = self._prefetch([ticker]).get(ticker.upper())
+            company_info = self._get_metrics(ticker, "get_company_info", prefetched)
+            timings = {"prefetch": time.perf_counter() - start}
 
-            # 기본 데이터 수집
-            company_info = self.mcp_client.get_company_info(ticker)
             if "error" in company_info:
-                print(f"❌ {ticker} 데이터 수집 실패")
+                if verbose:
+                    print(f"❌ {ticker} 데이터 수집 실패")
                 return None
 
             company_name = company_info.get('name', ticker)
             sector = company_info.get('sector', 'Unknown')
 
-            print(f"📊 {company_name} ({sector})")
-
-            # 1. 그레이엄 분석
-            print("   1/7 그레이엄 안전마진 분석...")
-            graham = self.graham_calc.calculate_graham_value(ticker)
-            if not graham:
-                return None
-
-            # 2. 버핏 분석
-            print("   2/7 버핏 경제적 해자 분석...")
-            buffett = self._analyze_buffett(ticker, sector)
+            if verbose:
+                print(f"📊 {company_name} ({sector})")
 
-            # 3. 린치 분석
-            print("   3/7 린치 GARP 분석...")
-            lynch = self.lynch_screener.classify_stock(ticker)
-            if not lynch:
+            # 1~7. 투자 대가별 분석
+            stages = self._build_stages(ticker, sector, prefetched)
+            outcome = self._run_stages(stages, stage_workers, verbose=verbose)
+            if outcome is None:
                 return None
 
-            # 4. 멍거 분석
-            print("   4/7 멍거 역행 사고 분석...")
-            munger = self._analyze_munger(ticker, graham, lynch)
-
-            # 5. 애스니스 분석
-            print("   5/7 애스니스 팩터 분석...")
-            asness = self._analyze_asness(ticker, graham, lynch)
+            stage_results, stage_timings = outcome
+            timings.update(stage_timings)
 
-            # 6. 달리오 분석
-            print("   6/7 달리오 경제 사이클 분석...")
-            dalio = self._analyze_dalio(ticker, sector)
-
-            # 7. 피셔 분석
-            print("   7/7 피셔 스캐터버트 분석...")
-            fisher = self._analyze_fisher(ticker)
+            graham = stage_results["graham"]
+            buffett = stage_results["buffett"]
+            lynch = stage_results["lynch"]
+            munger = stage_results["munger"]
+            asness = stage_results["asness"]
+            dalio = stage_results["dalio"]
+            fisher = stage_results["fisher"]
 
             # 종합 평가
-            print("   📊 종합 평가 계산 중...")
+            if verbose:
+                print("   📊 종합 평가 계산 중...")
             overall_score = self._calculate_overall_score(
                 graham, buffett, lynch, munger, asness, dalio, fisher
             )
@@ -186,7 +324,8 @@ class CompanyDeepDiveAnalyzer:
             horizon = self._determine_investment_horizon(lynch, dalio)
             confidence = self._calculate_confidence_level(graham, lynch, munger)
 
-            print(f"✅ 분석 완료!\n")
+            if verbose:
+                print(f"✅ 분석 완료!\n")
 
             return DeepDiveReport(
                 ticker=ticker,
@@ -203,18 +342,61 @@ class CompanyDeepDiveAnalyzer:
                 risk_reward_ratio=risk_reward,
                 final_recommendation=final_rec,
                 investment_horizon=horizon,
-                confidence_level=confidence
+                confidence_level=confidence,
+                stage_timings=timings
             )
 
         except Exception as e:
             print(f"❌ {ticker} 분석 오류: {str(e)}")
             return None
 
-    def _analyze_buffett(self, ticker: str, sector: str) -> BuffettAnalysis:
+    def analyze_watchlist(self, tickers: List[str],
+                          max_workers: Optional[int] = None) -> List[DeepDiveReport]:
+        """
+        관심 종목 일괄 심층 분석
+
+        전 종목 원시 데이터를 배치 조회(서버 병렬 처리)한 뒤 종목 단위로 동시 분석.
+        종목 안의 단계는 순차 실행하므로 동시 작업 수는 max_workers를 넘지 않음
+
+        Args:
+            tickers: 분석할 종목 리스트
+            max_workers: 전역 동시 실행 수 (배치 조회·종목 분석 공통, 기본값: DEFAULT_WATCHLIST_WORKERS)
+
+        Returns:
+            분석 성공 종목의 DeepDiveReport (입력 순서)
+        """
+        if max_workers is None:
+            max_workers = self.DEFAULT_WATCHLIST_WORKERS
+        max_workers = max(1, max_workers)
+        tickers = list(dict.fromkeys(tickers))
+
+        print(f"\n🔍 {len(tickers)}개 종목 심층 분석 중 (동시 {max_workers}개)...\n")
+
+        start = time.perf_counter()
+        batch = self._prefetch(tickers, max_workers=max_workers)
+
+        def analyze_one(ticker: str) -> Optional[DeepDiveReport]:
+            report = self.analyze(ticker, prefetched=batch.get(ticker.upper()),
+                                  stage_workers=1, verbose=False)
+            if report:
+                print(f"✅ {ticker}: {report.overall_score}/100 {report.final_recommendation}")
+            else:
+                print(f"❌ {ticker}: 분석 실패")
+            return report
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            reports = list(executor.map(analyze_one, tickers))
+
+        reports = [r for r in reports if r]
+        print(f"\n✅ {len(reports)}/{len(tickers)}개 종목 분석 완료 ({time.perf_counter() - start:.1f}s)\n")
+
+        return reports
+
+    def _analyze_buffett(self, ticker: str, sector: str,
+                         prefetched: Optional[Dict] = None) -> BuffettAnalysis:
         """워렌 버핏 경제적 해자 분석"""
         try:
-            fundamental = self.mcp_client.get_fundamental_metrics(ticker)
-            company_info = self.mcp_client.get_company_info(ticker)
+            fundamental = self._get_metrics(ticker, "get_fundamental_metrics", prefetched)
 
             roe = fundamental.get('profitability', {}).get('roe', 0)
             net_margin = fundamental.get('profitability', {}).get('net_margin', 0)
@@ -258,7 +440,7 @@ class CompanyDeepDiveAnalyzer:
                 moat_score += 10
 
             # 6. 규모의 경제 (시가총액 기반)
-            valuation = self.mcp_client.get_valuation_metrics(ticker)
+            valuation = self._get_metrics(ticker, "get_valuation_metrics", prefetched)
             market_cap = valuation.get('market_cap', 0)
             if market_cap > 100_000_000_000:  # $100B+
                 advantages.append("✅ 대규모 경제력")
@@ -476,13 +658,13 @@ class CompanyDeepDiveAnalyzer:
             positioning_recommendation=positioning
         )
 
-    def _analyze_fisher(self, ticker: str) -> FisherAnalysis:
+    def _analyze_fisher(self, ticker: str, prefetched: Optional[Dict] = None) -> FisherAnalysis:
         """필립 피셔 스캐터버트 분석 (간단화 버전)"""
         # 실제로는 고객, 공급업체, 경쟁사 인터뷰 필요
         # 여기서는 재무 지표 기반 휴리스틱 사용
 
         try:
-            fundamental = self.mcp_client.get_fundamental_metrics(ticker)
+            fundamental = self._get_metrics(ticker, "get_fundamental_metrics", prefetched)
 
             roe = fundamental.get('profitability', {}).get('roe', 0)
             growth = fundamental.get('growth', {}).get('earnings_growth', 0)
@@ -725,14 +907,76 @@ class CompanyDeepDiveAnalyzer:
 
         return "\n".join(lines)
 
+    def format_stage_timings(self, report: DeepDiveReport) -> str:
+        """단계별 소요 시간 표"""
+        lines = []
+        lines.append(f"⏱️  {report.ticker} 단계별 소요 시간")
+        lines.append("-" * 40)
+        for name, elapsed in report.stage_timings.items():
+            lines.append(f"   {name:<12} {elapsed * 1000:>10.1f} ms")
+        lines.append("-" * 40)
+        return "\n".join(lines)
+
+    def format_watchlist_table(self, reports: List[DeepDiveReport]) -> str:
+        """관심 종목 심층 분석 요약 테이블 (종합 점수 높은 순)"""
+        lines = []
+        lines.append("=" * 100)
+        lines.append(f"{'티커':<8} {'회사명':<25} {'종합':>6} {'신뢰도':>6} {'리스크-보상':>10}  추천")
+        lines.append("-" * 100)
+
+        for r in sorted(reports, key=lambda x: x.overall_score, reverse=True):
+            lines.append(
+                f"{r.ticker:<8} {r.company_name[:25]:<25} {r.overall_score:>6.1f} "
+                f"{r.confidence_level:>6.0f} {r.risk_reward_ratio:>10.2f}  {r.final_recommendation}"
+            )
+
+        lines.append("=" * 100)
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="기업 심층 분석 (8가지 투자 대가 관점)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 단일 종목 상세 리포트
+  python3 company_deep_dive.py AAPL
+
+  # 관심 종목 일괄 분석 (동시 4개)
+  python3 company_deep_dive.py AAPL MSFT GOOGL NVDA --workers 4
+
+  # 단계별 소요 시간 출력
+  python3 company_deep_dive.py AAPL --timings
+        """
+    )
+    parser.add_argument('tickers', nargs='*', default=['AAPL'],
+                        help='분석할 종목 (기본값: AAPL, 2개 이상이면 관심 종목 모드)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='동시 실행 수 (단일: 단계, 관심 종목: 종목, 1 = 순차)')
+    parser.add_argument('--timings', action='store_true',
+                        help='단계별 소요 시간 출력')
+    args = parser.parse_args()
 
-# 사용 예시
-if __name__ == "__main__":
     analyzer = CompanyDeepDiveAnalyzer()
+    tickers = [t.upper() for t in args.tickers]
+
+    if len(tickers) == 1:
+        report = analyzer.analyze(tickers[0], stage_workers=args.workers)
+        if report:
+            print("\n" + analyzer.generate_comprehensive_report(report))
+            if args.timings:
+                print("\n" + analyzer.format_stage_timings(report))
+        return
+
+    reports = analyzer.analyze_watchlist(tickers, max_workers=args.workers)
+    if reports:
+        print(analyzer.format_watchlist_table(reports))
+        if args.timings:
+            for report in reports:
+                print("\n" + analyzer.format_stage_timings(report))
 
-    # Apple 심층 분석
-    ticker = "AAPL"
-    report = analyzer.analyze(ticker)
 
-    if report:
-        print("\n" + analyzer.generate_comprehensive_report(report))
+# 사용 예시
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,13 @@
 
 import sys
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
 # MCP 클라이언트 임포트
 current_dir = os.path.dirname(os.path.abspath(__file__))
 mcp_dir = os.path.join(os.path.dirname(current_dir), 'mcp')
@@ -45,41 +48,246 @@ class SafetyMarginResult:
     notes: str
 
 
+# 컬럼형 밸류에이션 엔진 입력 (종목당 1행)
+FUNDAMENTALS_COLUMNS = [
+    "ticker", "company_name", "current_price", "eps", "growth_rate",
+    "per", "pbr", "roe", "free_cashflow", "market_cap"
+]
+
+
+class ValuationEngine:
+    """
+    컬럼형 밸류에이션 엔진
+    종목 × 연도 × 시나리오 NumPy 브로드캐스팅으로 그레이엄 / 다단계 DCF / 안전마진을
+    전 종목 한 번에 계산 (종목별 반복·MCP 호출 없음)
+
+    DCF 성장 경로 (다단계):
+    - 1단계: high_growth_years년 동안 earnings_growth 유지
+    - 2단계: fade_years년 동안 영구성장률까지 선형 감소
+    - 터미널: 영구성장률 (마지막 예측 FCF 기준, calculate_dcf_value와 동일한 방식)
+    fade_years=0이면 calculate_dcf_value와 같은 결과
+    """
+
+    def __init__(self, high_growth_years: int = 5, fade_years: int = 0):
+        self.high_growth_years = high_growth_years
+        self.fade_years = fade_years
+
+    @staticmethod
+    def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+        """숫자 컬럼을 float 배열로 (누락/비숫자 = NaN)"""
+        if name not in frame.columns:
+            return np.full(len(frame), np.nan)
+        return pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def safety_margins(intrinsic_values: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """
+        안전마진(%) = (내재가치 - 현재가) / 내재가치 × 100
+        내재가치 ≤ 0 → -100, 계산 불가(NaN) → NaN
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        prices = prices.reshape(prices.shape + (1,) * (np.ndim(intrinsic_values) - prices.ndim))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margins = (intrinsic_values - prices) / intrinsic_values * 100
+        margins = np.where(intrinsic_values > 0, margins, -100.0)
+        return np.where(np.isnan(intrinsic_values), np.nan, margins)
+
+    def graham_values(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        그레이엄 내재가치 IV = EPS × (8.5 + 2g)
+
+        Returns:
+            (종목,) 배열, EPS·성장률·현재가 중 하나라도 없거나 0이면 NaN
+        """
+        eps = self._column(frame, "eps")
+        growth = self._column(frame, "growth_rate")
+        price = self._column(frame, "current_price")
+
+        valid = (np.nan_to_num(eps) != 0) & (np.nan_to_num(growth) != 0) & (np.nan_to_num(price) != 0)
+        return np.where(valid, eps * (8.5 + 2 * growth), np.nan)
+
+    def growth_paths(self, growth: np.ndarray, terminal_growths: np.ndarray) -> np.ndarray:
+        """
+        연도별 FCF 성장률
+
+        Args:
+            growth: (종목,) 1단계 성장률 (소수)
+            terminal_growths: (G,) 영구성장률 (소수)
+
+        Returns:
+            (종목, G, 연도) 성장률 배열
+        """
+        fade = np.arange(1, self.fade_years + 1) / (self.fade_years + 1)  # (F,)
+        g = growth[:, None, None]
+        tg = terminal_growths[None, :, None]
+
+        stage1 = np.broadcast_to(g, (len(growth), len(terminal_growths), self.high_growth_years))
+        stage2 = g + (tg - g) * fade  # (종목, G, F)
+        return np.concatenate([stage1, stage2], axis=-1)
+
+    def dcf_values(self, frame: pd.DataFrame,
+                   discount_rates: Sequence[float] = (0.10,),
+                   terminal_growths: Sequence[float] = (0.03,)) -> np.ndarray:
+        """
+        다단계 DCF 주당 내재가치 (할인율 × 영구성장률 민감도 그리드)
+
+        Args:
+            frame: FUNDAMENTALS_COLUMNS 형식 DataFrame (growth_rate는 %)
+            discount_rates: 할인율 목록 (R,)
+            terminal_growths: 영구성장률 목록 (G,)
+
+        Returns:
+            (종목, R, G) 배열, FCF ≤ 0 / 시가총액 없음 / 할인율 ≤ 영구성장률이면 NaN
+        """
+        r = np.asarray(discount_rates, dtype=np.float64)
+        tg = np.asarray(terminal_growths, dtype=np.float64)
+        fcf0 = self._column(frame, "free_cashflow")
+        growth = self._column(frame, "growth_rate") / 100
+        price = self._column(frame, "current_price")
+        market_cap = self._column(frame, "market_cap")
+
+        years = self.high_growth_years + self.fade_years
+        t = np.arange(1, years + 1, dtype=np.float64)
+
+        # FCF 예측: (종목, 1, G, 연도)
+        fcf = fcf0[:, None, None] * np.cumprod(1 + self.growth_paths(growth, tg), axis=-1)
+        fcf = fcf[:, None, :, :]
+
+        # 할인 계수: (R, 1, 연도)
+        discount = (1 + r)[:, None, None] ** -t
+
+        discounted = fcf * discount  # (종목, R, G, 연도)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terminal = (discounted[..., -1] * (1 + tg)) / (r[:, None] - tg) * discount[..., -1]
+        enterprise_value = discounted.sum(axis=-1) + terminal  # (종목, R, G)
+
+        # 주당 가치 (간단화: 주식 수 = 시가총액 / 현재가)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_share = enterprise_value * (price / market_cap)[:, None, None]
+
+        valid = (fcf0 > 0) & (price > 0) & (market_cap > 0)
+        scenario_ok = (r[:, None] > tg)[None, :, :]
+        return np.where(valid[:, None, None] & scenario_ok, per_share, np.nan)
+
+    def value_universe(self, frame: pd.DataFrame,
+                       discount_rate: float = 0.10,
+                       terminal_growth: float = 0.03,
+                       discount_rates: Optional[Sequence[float]] = None,
+                       terminal_growths: Optional[Sequence[float]] = None) -> pd.DataFrame:
+        """
+        전 종목 그레이엄 / DCF 내재가치와 안전마진
+
+        Args:
+            frame: FUNDAMENTALS_COLUMNS 형식 DataFrame
+            discount_rate: 기준 시나리오 할인율
+            terminal_growth: 기준 시나리오 영구성장률
+            discount_rates: 민감도 그리드 할인율 (기본값: 기준값 ±2%p)
+            terminal_growths: 민감도 그리드 영구성장률 (기본값: 기준값 ±1%p)
+
+        Returns:
+            입력 컬럼 + graham_value, graham_margin, dcf_value, dcf_margin
+            (기준 시나리오), dcf_margin_min/median/max (그리드 전체)
+        """
+        if discount_rates is None:
+            discount_rates = [discount_rate - 0.02, discount_rate, discount_rate + 0.02]
+        if terminal_growths is None:
+            terminal_growths = [terminal_growth - 0.01, terminal_growth, terminal_growth + 0.01]
+
+        price = self._column(frame, "current_price")
+        result = frame.reset_index(drop=True).copy()
+
+        graham = self.graham_values(frame)
+        result["graham_value"] = graham
+        result["graham_margin"] = self.safety_margins(graham, price)
+
+        base = self.dcf_values(frame, [discount_rate], [terminal_growth])[:, 0, 0]
+        result["dcf_value"] = base
+        result["dcf_margin"] = self.safety_margins(base, price)
+
+        grid = self.safety_margins(self.dcf_values(frame, discount_rates, terminal_growths), price)
+        flat = grid.reshape(len(frame), -1)
+        has_value = ~np.isnan(flat).all(axis=1)
+        for name, reducer in (("min", np.nanmin), ("median", np.nanmedian), ("max", np.nanmax)):
+            column = np.full(len(frame), np.nan)
+            if has_value.any():
+                column[has_value] = reducer(flat[has_value], axis=1)
+            result[f"dcf_margin_{name}"] = column
+
+        return result
+
+    def sensitivity_table(self, frame: pd.DataFrame, ticker: str,
+                          discount_rates: Sequence[float],
+                          terminal_growths: Sequence[float]) -> pd.DataFrame:
+        """
+        한 종목의 DCF 주당 가치 민감도 표 (행: 할인율, 열: 영구성장률)
+        """
+        row = frame[frame["ticker"] == ticker]
+        values = self.dcf_values(row, discount_rates, terminal_growths)
+        return pd.DataFrame(
+            values[0] if len(row) else np.nan,
+            index=pd.Index(list(discount_rates), name="discount_rate"),
+            columns=pd.Index(list(terminal_growths), name="terminal_growth")
+        )
+
+
 class IntrinsicValueCalculator:
     """
     내재가치 계산기
     벤저민 그레이엄과 워렌 버핏의 가치투자 원칙 구현
     """
 
+    # 계산 방법별로 필요한 MCP 도구 (배치 조회용)
+    GRAHAM_TOOLS = ["get_fundamental_metrics", "get_price_data", "get_company_info"]
+    DCF_TOOLS = [
+        "get_financial_health", "get_price_data", "get_company_info",
+        "get_fundamental_metrics", "get_valuation_metrics"
+    ]
+
     def __init__(self):
         self.mcp_client = StockMCPClient()
 
-    def calculate_graham_value(self, ticker: str) -> Optional[SafetyMarginResult]:
+    def _get_metrics(self, ticker: str, tool: str, prefetched: Optional[Dict] = None) -> Dict:
+        """미리 받아온 배치 결과가 있으면 사용, 없으면 MCP 도구 개별 호출"""
+        if prefetched and tool in prefetched:
+            return prefetched[tool]
+        return getattr(self.mcp_client, tool)(ticker)
+
+    def _prefetch(self, tickers: List[str], tools: List[str]) -> Dict[str, Dict]:
+        """여러 종목 데이터를 배치 조회 (실패 시 빈 dict → 종목별 개별 호출)"""
+        try:
+            return self.mcp_client.get_batch_metrics(tickers, tools=tools)
+        except Exception as e:
+            print(f"⚠️ 배치 조회 실패, 종목별 조회로 진행: {str(e)}")
+            return {}
+
+    def calculate_graham_value(self, ticker: str,
+                               prefetched: Optional[Dict] = None) -> Optional[SafetyMarginResult]:
         """
         그레이엄 내재가치 공식
         IV = EPS × (8.5 + 2g)
 
         Args:
             ticker: 주식 티커 심볼
+            prefetched: get_batch_metrics로 받아온 이 종목의 {도구: 결과} (없으면 개별 호출)
 
         Returns:
             SafetyMarginResult 또는 None (오류 시)
         """
         try:
             # 펀더멘털 데이터 가져오기
-            fundamental = self.mcp_client.get_fundamental_metrics(ticker)
+            fundamental = self._get_metrics(ticker, "get_fundamental_metrics", prefetched)
             if "error" in fundamental:
                 print(f"❌ {ticker}: {fundamental['error']}")
                 return None
 
             # 가격 데이터 가져오기
-            price_data = self.mcp_client.get_price_data(ticker)
+            price_data = self._get_metrics(ticker, "get_price_data", prefetched)
             if "error" in price_data:
                 print(f"❌ {ticker}: {price_data['error']}")
                 return None
 
             # 기업 정보 가져오기
-            company_info = self.mcp_client.get_company_info(ticker)
+            company_info = self._get_metrics(ticker, "get_company_info", prefetched)
             company_name = company_info.get('name', ticker) if "error" not in company_info else ticker
 
             # 필수 데이터 추출
@@ -225,7 +433,8 @@ class IntrinsicValueCalculator:
 
     def calculate_dcf_value(self, ticker: str, discount_rate: float = 0.10,
                            terminal_growth: float = 0.03,
-                           projection_years: int = 5) -> Optional[SafetyMarginResult]:
+                           projection_years: int = 5,
+                           prefetched: Optional[Dict] = None) -> Optional[SafetyMarginResult]:
         """
         DCF (Discounted Cash Flow) 내재가치 계산
 
@@ -234,27 +443,28 @@ class IntrinsicValueCalculator:
             discount_rate: 할인율 (기본값: 10%)
             terminal_growth: 영구 성장률 (기본값: 3%)
             projection_years: 예측 기간 (기본값: 5년)
+            prefetched: get_batch_metrics로 받아온 이 종목의 {도구: 결과} (없으면 개별 호출)
 
         Returns:
             SafetyMarginResult 또는 None
         """
         try:
             # 재무 건전성 데이터 가져오기
-            financial_health = self.mcp_client.get_financial_health(ticker)
+            financial_health = self._get_metrics(ticker, "get_financial_health", prefetched)
             if "error" in financial_health:
                 return None
 
             # 가격 데이터
-            price_data = self.mcp_client.get_price_data(ticker)
+            price_data = self._get_metrics(ticker, "get_price_data", prefetched)
             if "error" in price_data:
                 return None
 
             # 기업 정보
-            company_info = self.mcp_client.get_company_info(ticker)
+            company_info = self._get_metrics(ticker, "get_company_info", prefetched)
             company_name = company_info.get('name', ticker) if "error" not in company_info else ticker
 
             # 펀더멘털 데이터
-            fundamental = self.mcp_client.get_fundamental_metrics(ticker)
+            fundamental = self._get_metrics(ticker, "get_fundamental_metrics", prefetched)
             growth_rate = fundamental.get('growth', {}).get('earnings_growth', 0)
 
             # FCF 데이터
@@ -281,7 +491,7 @@ class IntrinsicValueCalculator:
             enterprise_value = sum(projected_fcf) + discounted_terminal_value
 
             # 4. 주당 가치 (간단화: 시가총액으로 나눔)
-            valuation = self.mcp_client.get_valuation_metrics(ticker)
+            valuation = self._get_metrics(ticker, "get_valuation_metrics", prefetched)
             shares_outstanding = valuation.get('market_cap', 0) / current_price if current_price > 0 else 0
 
             if shares_outstanding <= 0:
@@ -322,6 +532,7 @@ class IntrinsicValueCalculator:
                                   method: str = "graham") -> List[SafetyMarginResult]:
         """
         저평가 종목 스크리닝
+        전 종목 데이터를 배치 조회(서버 병렬 처리)한 뒤 계산
 
         Args:
             tickers: 분석할 종목 리스트
@@ -333,16 +544,21 @@ class IntrinsicValueCalculator:
         """
         results = []
 
+        if method not in ("graham", "dcf"):
+            print(f"⚠️ 알 수 없는 계산 방법: {method}")
+            return results
+
         print(f"\n🔍 {len(tickers)}개 종목 안전마진 분석 중...\n")
 
+        tools = self.GRAHAM_TOOLS if method == "graham" else self.DCF_TOOLS
+        batch = self._prefetch(tickers, tools)
+
         for ticker in tickers:
+            prefetched = batch.get(ticker.upper())
             if method == "graham":
-                result = self.calculate_graham_value(ticker)
-            elif method == "dcf":
-                result = self.calculate_dcf_value(ticker)
+                result = self.calculate_graham_value(ticker, prefetched=prefetched)
             else:
-                print(f"⚠️ 알 수 없는 계산 방법: {method}")
-                continue
+                result = self.calculate_dcf_value(ticker, prefetched=prefetched)
 
             if result and result.safety_margin_pct >= min_safety_margin:
                 results.append(result)
@@ -357,6 +573,83 @@ class IntrinsicValueCalculator:
 
         return results
 
+    def build_fundamentals_frame(self, tickers: List[str],
+                                 batch: Optional[Dict[str, Dict]] = None) -> pd.DataFrame:
+        """
+        배치 조회 결과를 밸류에이션 엔진 입력(FUNDAMENTALS_COLUMNS)으로 변환
+
+        Args:
+            tickers: 종목 리스트
+            batch: get_batch_metrics 결과 (없으면 DCF_TOOLS로 배치 조회)
+
+        Returns:
+            종목당 1행 DataFrame (조회 실패 항목은 NaN)
+        """
+        if batch is None:
+            batch = self._prefetch(tickers, self.DCF_TOOLS)
+
+        def ok(payload: Optional[Dict]) -> Dict:
+            return payload if payload and "error" not in payload else {}
+
+        rows = []
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            data = batch.get(ticker, {})
+            fundamental = ok(data.get("get_fundamental_metrics"))
+            company_info = ok(data.get("get_company_info"))
+
+            rows.append({
+                "ticker": ticker,
+                "company_name": company_info.get("name", ticker),
+                "current_price": ok(data.get("get_price_data")).get("current_price"),
+                "eps": fundamental.get("growth", {}).get("eps"),
+                "growth_rate": fundamental.get("growth", {}).get("earnings_growth"),
+                "per": fundamental.get("valuation", {}).get("per"),
+                "pbr": fundamental.get("valuation", {}).get("pbr"),
+                "roe": fundamental.get("profitability", {}).get("roe"),
+                "free_cashflow": ok(data.get("get_financial_health")).get("free_cashflow"),
+                "market_cap": ok(data.get("get_valuation_metrics")).get("market_cap"),
+            })
+
+        frame = pd.DataFrame(rows, columns=FUNDAMENTALS_COLUMNS)
+        numeric = FUNDAMENTALS_COLUMNS[2:]
+        frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce')
+        return frame
+
+    def screen_universe(self, tickers: List[str],
+                        min_safety_margin: float = 30.0,
+                        method: str = "graham",
+                        discount_rate: float = 0.10,
+                        terminal_growth: float = 0.03,
+                        discount_rates: Optional[Sequence[float]] = None,
+                        terminal_growths: Optional[Sequence[float]] = None,
+                        engine: Optional[ValuationEngine] = None) -> pd.DataFrame:
+        """
+        대규모 유니버스 저평가 스크리닝 (배치 조회 1회 + 벡터 연산 1회)
+
+        Args:
+            tickers: 분석할 종목 리스트
+            min_safety_margin: 최소 안전마진 (기본값: 30%)
+            method: 기준 안전마진 ("graham", "dcf", 또는 "dcf_min" = 민감도 그리드 최악값)
+            discount_rate / terminal_growth: DCF 기준 시나리오
+            discount_rates / terminal_growths: 민감도 그리드 (ValuationEngine.value_universe 참조)
+            engine: 사용할 ValuationEngine (기본값: 5년 단일 단계)
+
+        Returns:
+            기준 안전마진 높은 순으로 정렬된 DataFrame (value_universe 컬럼)
+        """
+        margin_column = {"graham": "graham_margin", "dcf": "dcf_margin", "dcf_min": "dcf_margin_min"}.get(method)
+        if margin_column is None:
+            print(f"⚠️ 알 수 없는 계산 방법: {method}")
+            return pd.DataFrame()
+
+        engine = engine or ValuationEngine()
+        frame = self.build_fundamentals_frame(tickers)
+        valued = engine.value_universe(frame, discount_rate, terminal_growth,
+                                       discount_rates, terminal_growths)
+
+        hits = valued[valued[margin_column] >= min_safety_margin]
+        return hits.sort_values(margin_column, ascending=False, kind='stable').reset_index(drop=True)
+
     def format_result_table(self, results: List[SafetyMarginResult]) -> str:
         """결과를 테이블 형식으로 포맷팅"""
         if not results:
@@ -70,9 +70,18 @@ class LynchScreener:
         "Construction", "Basic Materials", "Industrials"
     ]
 
+    # classify_stock에 필요한 MCP 도구 (배치 조회용)
+    CLASSIFY_TOOLS = ["get_fundamental_metrics", "get_valuation_metrics", "get_company_info"]
+
     def __init__(self):
         self.mcp_client = StockMCPClient()
 
+    def _get_metrics(self, ticker: str, tool: str, prefetched: Optional[Dict] = None) -> Dict:
+        """미리 받아온 배치 결과가 있으면 사용, 없으면 MCP 도구 개별 호출"""
+        if prefetched and tool in prefetched:
+            return prefetched[tool]
+        return getattr(self.mcp_client, tool)(ticker)
+
     def calculate_peg_ratio(self, per: float, growth_rate: float) -> Optional[float]:
         """
         PEG 비율 계산
@@ -90,15 +99,19 @@ class LynchScreener:
 
         return per / growth_rate
 
-    def classify_stock(self, ticker: str) -> Optional[LynchAnalysisResult]:
+    def classify_stock(self, ticker: str, prefetched: Optional[Dict] = None) -> Optional[LynchAnalysisResult]:
         """
         주식을 린치의 6가지 카테고리로 분류
+
+        Args:
+            ticker: 주식 티커 심볼
+            prefetched: get_batch_metrics로 받아온 이 종목의 {도구: 결과} (없으면 개별 호출)
         """
         try:
             # 데이터 수집
-            fundamental = self.mcp_client.get_fundamental_metrics(ticker)
-            valuation = self.mcp_client.get_valuation_metrics(ticker)
-            company_info = self.mcp_client.get_company_info(ticker)
+            fundamental = self._get_metrics(ticker, "get_fundamental_metrics", prefetched)
+            valuation = self._get_metrics(ticker, "get_valuation_metrics", prefetched)
+            company_info = self._get_metrics(ticker, "get_company_info", prefetched)
 
             if "error" in fundamental or "error" in valuation:
                 return None
@@ -325,6 +338,7 @@ class LynchScreener:
         """
         GARP 전략 스크리닝
         (Growth At Reasonable Price)
+        전 종목 데이터를 배치 조회(서버 병렬 처리)한 뒤 분류
 
         Args:
             tickers: 분석할 종목 리스트
@@ -338,8 +352,14 @@ class LynchScreener:
 
         print(f"\n🔍 {len(tickers)}개 종목 GARP 분석 중...\n")
 
+        try:
+            batch = self.mcp_client.get_batch_metrics(tickers, tools=self.CLASSIFY_TOOLS)
+        except Exception as e:
+            print(f"⚠️ 배치 조회 실패, 종목별 조회로 진행: {str(e)}")
+            batch = {}
+
         for ticker in tickers:
-            result = self.classify_stock(ticker)
+            result = self.classify_stock(ticker, prefetched=batch.get(ticker.upper()))
 
             if result and result.peg_ratio > 0 and result.peg_ratio <= max_peg:
                 if result.earnings_growth >= min_growth:
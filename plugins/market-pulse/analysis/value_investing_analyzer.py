@@ -121,11 +121,7 @@ class ValueInvestingAnalyzer:
         """심층 분석 (8가지 관점)"""
         results = []
 
-        for ticker in tickers:
-            report = self.deep_dive.analyze(ticker)
-            if not report:
-                continue
-
+        for report in self.deep_dive.analyze_watchlist(tickers):
             results.append({
                 "ticker": report.ticker,
                 "company_name": report.company_name,
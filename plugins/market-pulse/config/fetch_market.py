@@ -4,14 +4,18 @@ Market Data Fetcher
 Fetches financial market data from free sources (yfinance, pykrx, RSS)
 """
 
+import hashlib
 import json
 import yaml
 import sys
 import os
 import argparse
 import re
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from pathlib import Path
 import pandas as pd
 
@@ -19,6 +23,145 @@ import pandas as pd
 sys.path.append(str(Path(__file__).parent.parent / "data"))
 from market_history import MarketHistoryDB
 
+# Per-source time budget for fetch_all (seconds); override via sources.yaml
+# `fetch_timeouts:` or fetch_all(timeouts=...)
+DEFAULT_SOURCE_TIMEOUTS = {
+    "us_indices": 30,
+    "us_sectors": 30,
+    "vix": 15,
+    "kr_indices": 45,
+    "kr_foreign_institutional": 45,
+    "kr_top_stocks": 60,
+    "treasury_yields": 20,
+    "commodities": 20,
+    "currencies": 20,
+    "crypto": 20,
+    "news": 30,
+    "watchlist": 45,
+}
+DEFAULT_SOURCE_TIMEOUT = 30
+
+# Shared yf.download batches: batch -> period (sections slice their own windows)
+QUOTE_BATCHES = {
+    "history": "3mo",  # us_indices (60d) + us_sectors (2mo), stored in MarketHistoryDB
+    "quote": "5d",     # latest quotes: vix, treasuries, commodities, currencies, crypto, watchlist
+}
+
+
+# RSS news: on-disk cache of conditional-GET validators + parsed entries per feed;
+# override via sources.yaml `news_cache:`
+NEWS_WINDOW_DAYS = 7
+NEWS_ENTRIES_PER_FEED = 10
+DEFAULT_NEWS_CACHE = {
+    "enabled": True,
+    "dir": "~/.cache/market-pulse/news",
+    "refresh_seconds": 300,  # reuse parsed entries without any request
+    "workers": 6,
+}
+
+
+class FeedCache:
+    """
+    On-disk cache for RSS feeds, one JSON file per feed URL.
+
+    Keeps the ETag/Last-Modified validators for conditional GETs and the parsed
+    entries (before the news-window cutoff), so a 304 or a recent fetch needs
+    no download and no parsing.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir).expanduser()
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached record for url, or None if missing/unreadable."""
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record if record.get("url") == url else None
+
+    def save(self, url: str, record: Dict[str, Any]):
+        """Write a record atomically (concurrent feeds never share a file)."""
+        path = self._path(url)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(dict(record, url=url), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write news cache for {url}: {e}", file=sys.stderr)
+
+
+class BatchQuoteLoader:
+    """
+    Downloads many symbols with a single yf.download and serves per-symbol frames.
+
+    Lazy and thread-safe: the first get() downloads every registered symbol,
+    concurrent callers wait for that download instead of issuing their own.
+    """
+
+    def __init__(self, period: str, symbols: List[str]):
+        self.period = period
+        self.symbols = list(dict.fromkeys(symbols))
+        self.error: Optional[Exception] = None
+        self._data: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def covers(self, symbols: List[str]) -> bool:
+        """True if every symbol is part of this batch."""
+        return set(symbols) <= set(self.symbols)
+
+    def _download(self) -> pd.DataFrame:
+        with self._lock:
+            if self._data is None:
+                self._data = pd.DataFrame()
+                if self.symbols:
+                    import yfinance as yf
+                    try:
+                        self._data = yf.download(self.symbols, period=self.period,
+                                                 progress=False, group_by="ticker")
+                    except Exception as e:
+                        print(f"Error downloading {len(self.symbols)} symbols ({self.period}): {e}",
+                              file=sys.stderr)
+                        self.error = e
+        return self._data
+
+    def get(self, symbol: str) -> pd.DataFrame:
+        """OHLCV frame for one symbol (rows without a close dropped, empty if unavailable)."""
+        data = self._download()
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                return pd.DataFrame()
+            frame = data[symbol]
+        elif len(self.symbols) == 1 and symbol in self.symbols:
+            frame = data
+        else:
+            return pd.DataFrame()
+
+        if "Close" not in frame.columns:
+            return pd.DataFrame()
+        return frame[frame["Close"].notna()]
+
+
+def _trim_period(frame: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Keep rows within a yfinance-style period ("60d", "2mo") ending today."""
+    if frame.empty:
+        return frame
+    now = pd.Timestamp.now(tz=frame.index.tz)
+    if period.endswith("mo"):
+        start = now - pd.DateOffset(months=int(period[:-2]))
+    else:
+        start = now - pd.Timedelta(days=int(period.rstrip("d")))
+    return frame[frame.index >= start.normalize()]
+
 
 class MarketDataFetcher:
     """Fetches market data from multiple free sources."""
@@ -38,7 +181,11 @@ class MarketDataFetcher:
 
         # Initialize MarketHistoryDB for 60-day data storage
         self.use_db = use_db
-        self.db = MarketHistoryDB() if use_db else None
+        self.db = MarketHistoryDB(check_same_thread=False) if use_db else None
+        self._db_lock = threading.Lock()  # sources write to the DB from worker threads
+
+        # Batched quote downloads shared by the sections of one fetch_all run
+        self._quote_loaders: Dict[str, BatchQuoteLoader] = {}
         print(f"📊 MarketHistoryDB {'enabled' if use_db else 'disabled'}", file=sys.stderr)
 
     # ──────────────────────────────────────────────
@@ -74,41 +221,63 @@ class MarketDataFetcher:
             "timestamp": now_utc.isoformat(),
         }
 
+    # ──────────────────────────────────────────────
+    # Batched Quotes
+    # ──────────────────────────────────────────────
+
+    def _section_quote_symbols(self) -> Dict[str, Any]:
+        """yfinance symbols each section reads, as section -> (batch, symbols)."""
+        return {
+            "us_indices": ("history", list(self.config["us_indices"])),
+            "us_sectors": ("history", [s["symbol"] for s in self.config["us_sector_etfs"]]),
+            "vix": ("quote", list(self.config["volatility"])[:1]),
+            "treasury_yields": ("quote", list(self.config["treasury_yields"])),
+            "commodities": ("quote", list(self.config["commodities"])),
+            "currencies": ("quote", list(self.config["currencies"])),
+            "crypto": ("quote", [c["symbol"] for c in self.config["crypto_symbols"]]),
+            "watchlist": ("quote", [s["symbol"] for s in self.watchlist.get("us_stocks", [])]
+                          + [c["symbol"] for c in self.watchlist.get("crypto", [])]),
+        }
+
+    def _prime_quotes(self, sections: List[str]):
+        """Register every symbol the given sections need (one download per batch)."""
+        symbols = {batch: [] for batch in QUOTE_BATCHES}
+        for section, (batch, section_symbols) in self._section_quote_symbols().items():
+            if section in sections:
+                symbols[batch].extend(section_symbols)
+
+        self._quote_loaders = {
+            batch: BatchQuoteLoader(QUOTE_BATCHES[batch], batch_symbols)
+            for batch, batch_symbols in symbols.items() if batch_symbols
+        }
+
+    def _quotes(self, section: str) -> BatchQuoteLoader:
+        """Shared loader covering a section, or a section-only one outside fetch_all."""
+        batch, symbols = self._section_quote_symbols()[section]
+        loader = self._quote_loaders.get(batch)
+        if loader is None or not loader.covers(symbols):
+            loader = BatchQuoteLoader(QUOTE_BATCHES[batch], symbols)
+        return loader
+
     # ──────────────────────────────────────────────
     # US Market
     # ──────────────────────────────────────────────
 
     def fetch_us_indices(self) -> Dict[str, Any]:
         """Fetch major US indices with 60-day historical data storage."""
-        import yfinance as yf
+        quotes = self._quotes("us_indices")
 
         result = {}
+        histories = {}
         for symbol, name in self.config["us_indices"].items():
             try:
-                ticker = yf.Ticker(symbol)
-
-                # Fetch 60 days for historical analysis (changed from 5d)
-                hist = ticker.history(period="60d")
+                # 60 days for historical analysis
+                hist = _trim_period(quotes.get(symbol), "60d")
                 if hist.empty:
-                    result[symbol] = {"name": name, "error": "No data"}
+                    result[symbol] = {"name": name, "error": str(quotes.error) if quotes.error else "No data"}
                     continue
 
-                # Save to database if enabled
-                if self.use_db and self.db:
-                    for date_idx, row in hist.iterrows():
-                        date_str = date_idx.strftime('%Y-%m-%d')
-                        ohlcv = {
-                            'open': float(row['Open']),
-                            'high': float(row['High']),
-                            'low': float(row['Low']),
-                            'close': float(row['Close']),
-                            'volume': int(row['Volume']),
-                            'adj_close': float(row['Close'])
-                        }
-                        self.db.save_daily_prices(symbol, date_str, ohlcv)
-
-                    # Calculate and save multi-period returns
-                    self.db.calculate_and_save_returns(symbol)
+                histories[symbol] = hist
 
                 # Return current values (maintain backward compatibility)
                 current = hist["Close"].iloc[-1]
@@ -124,48 +293,26 @@ class MarketDataFetcher:
             except Exception as e:
                 print(f"Error fetching {symbol}: {e}", file=sys.stderr)
                 result[symbol] = {"name": name, "error": str(e)}
+
+        # Save to database if enabled (all indices in one transaction)
+        self._save_histories(histories)
         return result
 
     def fetch_us_sectors(self) -> List[Dict[str, Any]]:
         """Fetch sector ETF performance with 60-day historical data storage."""
-        import yfinance as yf
+        quotes = self._quotes("us_sectors")
 
         results = []
-        symbols = [s["symbol"] for s in self.config["us_sector_etfs"]]
-        names = {s["symbol"]: s["name"] for s in self.config["us_sector_etfs"]}
-
-        try:
-            # Changed from 1mo to 2mo for 60-day data
-            data = yf.download(symbols, period="2mo", progress=False, group_by="ticker")
-        except Exception as e:
-            print(f"Error downloading sector ETFs: {e}", file=sys.stderr)
-            return results
-
+        histories = {}
         for etf in self.config["us_sector_etfs"]:
             sym = etf["symbol"]
             try:
-                if len(symbols) == 1:
-                    hist_df = data
-                else:
-                    hist_df = data[sym]
-
-                # Save to database if enabled
-                if self.use_db and self.db:
-                    for date_idx in hist_df.index:
-                        if pd.notna(hist_df.loc[date_idx, "Close"]):
-                            date_str = date_idx.strftime('%Y-%m-%d')
-                            ohlcv = {
-                                'open': float(hist_df.loc[date_idx, "Open"]),
-                                'high': float(hist_df.loc[date_idx, "High"]),
-                                'low': float(hist_df.loc[date_idx, "Low"]),
-                                'close': float(hist_df.loc[date_idx, "Close"]),
-                                'volume': int(hist_df.loc[date_idx, "Volume"]),
-                                'adj_close': float(hist_df.loc[date_idx, "Close"])
-                            }
-                            self.db.save_daily_prices(sym, date_str, ohlcv)
-
-                    # Calculate and save multi-period returns
-                    self.db.calculate_and_save_returns(sym)
+                # 2 months for 60-day data
+                hist_df = _trim_period(quotes.get(sym), "2mo")
+                if hist_df.empty:
+                    continue
+
+                histories[sym] = hist_df
 
                 # Calculate returns for display (maintain backward compatibility)
                 close = hist_df["Close"].dropna()
@@ -186,10 +333,30 @@ class MarketDataFetcher:
             except Exception as e:
                 print(f"Error processing {sym}: {e}", file=sys.stderr)
                 continue
+
+        # Save to database if enabled (all sector ETFs in one transaction)
+        self._save_histories(histories)
+
         # Sort by 1d performance
         results.sort(key=lambda x: x.get("change_1d", 0), reverse=True)
         return results
 
+    def _save_histories(self, histories: Dict[str, pd.DataFrame]):
+        """Bulk-save OHLCV histories and refresh their multi-period returns."""
+        if not (self.use_db and self.db) or not histories:
+            return
+
+        with self._db_lock:
+            self.db.save_daily_prices_multi(histories)
+
+            # Recompute returns from the earliest re-saved day (revised closes,
+            # yesterday's partial intraday bar)
+            for symbol, hist in histories.items():
+                since = pd.DatetimeIndex(hist.index).min() if not hist.empty else None
+                self.db.calculate_and_save_returns(
+                    symbol, since=since.strftime('%Y-%m-%d') if since is not None else None
+                )
+
     # ──────────────────────────────────────────────
     # Korean Market
     # ──────────────────────────────────────────────
@@ -340,13 +507,12 @@ class MarketDataFetcher:
 
     def fetch_treasury_yields(self) -> Dict[str, Any]:
         """Fetch US treasury yields and spread."""
-        import yfinance as yf
+        quotes = self._quotes("treasury_yields")
 
         result = {}
         for symbol, name in self.config["treasury_yields"].items():
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
+                hist = quotes.get(symbol)
                 if hist.empty:
                     continue
                 value = round(float(hist["Close"].iloc[-1]), 3)
@@ -364,13 +530,12 @@ class MarketDataFetcher:
 
     def fetch_commodities(self) -> Dict[str, Any]:
         """Fetch commodity prices."""
-        import yfinance as yf
+        quotes = self._quotes("commodities")
 
         result = {}
         for symbol, name in self.config["commodities"].items():
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
+                hist = quotes.get(symbol)
                 if hist.empty:
                     continue
                 current = hist["Close"].iloc[-1]
@@ -386,13 +551,12 @@ class MarketDataFetcher:
 
     def fetch_currencies(self) -> Dict[str, Any]:
         """Fetch currency pairs and dollar index."""
-        import yfinance as yf
+        quotes = self._quotes("currencies")
 
         result = {}
         for symbol, name in self.config["currencies"].items():
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
+                hist = quotes.get(symbol)
                 if hist.empty:
                     continue
                 current = hist["Close"].iloc[-1]
@@ -408,14 +572,12 @@ class MarketDataFetcher:
 
     def fetch_vix(self) -> Dict[str, Any]:
         """Fetch VIX volatility index."""
-        import yfinance as yf
-
         try:
+            quotes = self._quotes("vix")
             symbol = list(self.config["volatility"].keys())[0]
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5d")
+            hist = quotes.get(symbol)
             if hist.empty:
-                return {"error": "No data"}
+                return {"error": str(quotes.error) if quotes.error else "No data"}
             current = hist["Close"].iloc[-1]
             prev = hist["Close"].iloc[-2] if len(hist) >= 2 else current
             change_pct = ((current - prev) / prev * 100) if prev else 0
@@ -433,26 +595,13 @@ class MarketDataFetcher:
 
     def fetch_crypto(self) -> List[Dict[str, Any]]:
         """Fetch crypto prices via yfinance."""
-        import yfinance as yf
+        quotes = self._quotes("crypto")
 
         results = []
-        symbols = [c["symbol"] for c in self.config["crypto_symbols"]]
-        names = {c["symbol"]: c["name"] for c in self.config["crypto_symbols"]}
-
-        try:
-            data = yf.download(symbols, period="5d", progress=False, group_by="ticker")
-        except Exception as e:
-            print(f"Error downloading crypto data: {e}", file=sys.stderr)
-            return results
-
         for item in self.config["crypto_symbols"]:
             sym = item["symbol"]
             try:
-                if len(symbols) == 1:
-                    close = data["Close"]
-                else:
-                    close = data[sym]["Close"]
-                close = close.dropna()
+                close = quotes.get(sym).get("Close", pd.Series(dtype=float))
                 if close.empty:
                     continue
                 current = close.iloc[-1]
@@ -473,9 +622,14 @@ class MarketDataFetcher:
     # ──────────────────────────────────────────────
 
     def fetch_market_news(self, category: str = "all", max_items: int = 10) -> List[Dict[str, Any]]:
-        """Fetch market news from RSS feeds."""
-        import feedparser
-        import urllib.request
+        """
+        Fetch market news from RSS feeds.
+
+        Feeds are downloaded concurrently. With the news cache enabled, a feed
+        fetched within `refresh_seconds` is served from disk without a request,
+        and older ones are revalidated with ETag/Last-Modified (304 = reuse the
+        cached entries, no parsing).
+        """
         import ssl
 
         feeds_config = self.config.get("news_feeds", {})
@@ -486,36 +640,46 @@ class MarketDataFetcher:
         else:
             all_feeds = feeds_config.get(category, [])
 
-        entries = []
-        cutoff = datetime.now() - timedelta(days=7)
+        if not all_feeds:
+            return []
+
+        cache_config = {**DEFAULT_NEWS_CACHE, **(self.config.get("news_cache") or {})}
+        cache = FeedCache(cache_config["dir"]) if cache_config["enabled"] else None
+        refresh_seconds = float(cache_config["refresh_seconds"]) if cache else 0.0
 
         ctx = ssl.create_default_context()
         ctx.check_hostname = False
         ctx.verify_mode = ssl.CERT_NONE
 
-        for feed_cfg in all_feeds:
+        def load(feed_cfg):
             try:
-                req = urllib.request.Request(
-                    feed_cfg["url"],
-                    headers={"User-Agent": "Mozilla/5.0"}
-                )
-                with urllib.request.urlopen(req, timeout=10, context=ctx) as resp:
-                    content = resp.read()
-                feed = feedparser.parse(content)
-
-                for entry in feed.entries[:10]:
-                    pub_date = _parse_feed_date(entry)
-                    if pub_date and pub_date > cutoff:
-                        entries.append({
-                            "title": entry.get("title", "No title"),
-                            "link": entry.get("link", ""),
-                            "published": pub_date.isoformat(),
-                            "source": feed_cfg["name"],
-                            "summary": _clean_html(entry.get("summary", ""))[:200],
-                        })
+                return _fetch_feed(feed_cfg["url"], ctx, cache, refresh_seconds)
             except Exception as e:
                 print(f"Error fetching {feed_cfg['name']}: {e}", file=sys.stderr)
-                continue
+                return [], "error"
+
+        workers = max(1, min(int(cache_config["workers"]), len(all_feeds)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(load, all_feeds))
+
+        statuses: Dict[str, int] = {}
+        for _, status in results:
+            statuses[status] = statuses.get(status, 0) + 1
+        print("📰 News feeds: " + ", ".join(f"{n} {s}" for s, n in statuses.items()), file=sys.stderr)
+
+        # Feed order is preserved, so equal scores keep the configured order
+        entries = []
+        cutoff = datetime.now() - timedelta(days=NEWS_WINDOW_DAYS)
+        for feed_cfg, (feed_entries, _) in zip(all_feeds, results):
+            for entry in feed_entries:
+                if datetime.fromisoformat(entry["published"]) > cutoff:
+                    entries.append({
+                        "title": entry["title"],
+                        "link": entry["link"],
+                        "published": entry["published"],
+                        "source": feed_cfg["name"],
+                        "summary": entry["summary"],
+                    })
 
         # Score and sort
         scored = []
@@ -532,24 +696,18 @@ class MarketDataFetcher:
 
     def fetch_watchlist(self) -> Dict[str, Any]:
         """Fetch all watchlist stocks/crypto with alert checking."""
-        import yfinance as yf
+        quotes = self._quotes("watchlist")
 
         result = {"us": [], "kr": [], "crypto": []}
 
         # US stocks
         us_list = self.watchlist.get("us_stocks", [])
         if us_list:
-            symbols = [s["symbol"] for s in us_list]
             try:
-                data = yf.download(symbols, period="5d", progress=False, group_by="ticker")
                 for item in us_list:
                     sym = item["symbol"]
                     try:
-                        if len(symbols) == 1:
-                            close = data["Close"]
-                        else:
-                            close = data[sym]["Close"]
-                        close = close.dropna()
+                        close = quotes.get(sym).get("Close", pd.Series(dtype=float))
                         if close.empty:
                             continue
                         current = float(close.iloc[-1])
@@ -598,17 +756,11 @@ class MarketDataFetcher:
         # Crypto
         crypto_list = self.watchlist.get("crypto", [])
         if crypto_list:
-            symbols = [c["symbol"] for c in crypto_list]
             try:
-                data = yf.download(symbols, period="5d", progress=False, group_by="ticker")
                 for item in crypto_list:
                     sym = item["symbol"]
                     try:
-                        if len(symbols) == 1:
-                            close = data["Close"]
-                        else:
-                            close = data[sym]["Close"]
-                        close = close.dropna()
+                        close = quotes.get(sym).get("Close", pd.Series(dtype=float))
                         if close.empty:
                             continue
                         current = float(close.iloc[-1])
@@ -647,7 +799,8 @@ class MarketDataFetcher:
 
         result = {}
         for symbol in symbols:
-            df = self.db.get_historical_prices(symbol, days=days)
+            with self._db_lock:
+                df = self.db.get_historical_prices(symbol, days=days)
             if not df.empty:
                 result[symbol] = {
                     'dates': [d.strftime('%Y-%m-%d') for d in df['date']],
@@ -661,8 +814,118 @@ class MarketDataFetcher:
     # Orchestrator
     # ──────────────────────────────────────────────
 
-    def fetch_all(self, scope: str = "overview") -> Dict[str, Any]:
-        """Fetch market data based on scope."""
+    def _scope_sources(self, scope: str) -> Dict[str, Callable[[], Any]]:
+        """Data sections (in output order) and their fetchers for a scope."""
+        sources = {}
+
+        if scope in ("overview", "deep", "us"):
+            sources["us_indices"] = self.fetch_us_indices
+            sources["us_sectors"] = self.fetch_us_sectors
+            sources["vix"] = self.fetch_vix
+
+        if scope in ("overview", "deep", "kr"):
+            sources["kr_indices"] = self.fetch_kr_indices
+            sources["kr_foreign_institutional"] = self.fetch_kr_foreign_institutional
+            sources["kr_top_stocks"] = self.fetch_kr_top_stocks
+
+        if scope in ("overview", "deep", "global", "crypto"):
+            sources["treasury_yields"] = self.fetch_treasury_yields
+            sources["commodities"] = self.fetch_commodities
+            sources["currencies"] = self.fetch_currencies
+
+        if scope in ("overview", "deep", "crypto"):
+            sources["crypto"] = self.fetch_crypto
+
+        if scope in ("deep",):
+            sources["news"] = self.fetch_market_news
+
+        if scope in ("watchlist", "deep"):
+            sources["watchlist"] = self.fetch_watchlist
+
+        return sources
+
+    def _fetch_concurrently(
+        self,
+        sources: Dict[str, Callable[[], Any]],
+        timeouts: Dict[str, float]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run independent fetchers in parallel with per-source timeouts.
+
+        Each source runs on its own daemon thread, so a hung source neither
+        blocks the others nor keeps the process alive after output is written.
+
+        Returns:
+            Dictionary mapping source -> {"status": ok|error|timeout, "seconds", "value"/"error"}
+        """
+        futures = {}
+        started = time.perf_counter()
+
+        def run(name: str, fetch: Callable[[], Any], future: Future):
+            start = time.perf_counter()
+            try:
+                future.set_result((fetch(), time.perf_counter() - start, None))
+            except Exception as e:
+                future.set_result((None, time.perf_counter() - start, e))
+
+        for name, fetch in sources.items():
+            future = Future()
+            futures[future] = name
+            threading.Thread(target=run, args=(name, fetch, future),
+                             name=f"fetch-{name}", daemon=True).start()
+
+        deadlines = {
+            future: started + timeouts.get(name, DEFAULT_SOURCE_TIMEOUT)
+            for future, name in futures.items()
+        }
+        outcomes = {}
+        pending = set(futures)
+
+        while pending:
+            now = time.perf_counter()
+            for future in [f for f in pending if deadlines[f] <= now and not f.done()]:
+                name = futures[future]
+                pending.discard(future)
+                limit = timeouts.get(name, DEFAULT_SOURCE_TIMEOUT)
+                print(f"Timeout fetching {name} (>{limit}s)", file=sys.stderr)
+                outcomes[name] = {"status": "timeout", "seconds": round(now - started, 3),
+                                  "error": f"timed out after {limit}s"}
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                pending.discard(future)
+                value, elapsed, error = future.result()
+                if error is None:
+                    outcomes[name] = {"status": "ok", "seconds": round(elapsed, 3), "value": value}
+                else:
+                    print(f"Error fetching {name}: {error}", file=sys.stderr)
+                    outcomes[name] = {"status": "error", "seconds": round(elapsed, 3), "error": str(error)}
+
+        return outcomes
+
+    def fetch_all(
+        self,
+        scope: str = "overview",
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch market data based on scope.
+
+        Independent sources are fetched concurrently, so the total time is close
+        to the slowest source. A source that fails or exceeds its timeout is left
+        out of "data"; its status is reported under "timings".
+
+        Args:
+            scope: overview, us, kr, global, crypto, watchlist or deep
+            timeouts: Per-source timeout overrides in seconds
+                      (defaults: DEFAULT_SOURCE_TIMEOUTS, then sources.yaml fetch_timeouts)
+        """
+        started = time.perf_counter()
         result = {
             "timestamp": datetime.now().isoformat(),
             "scope": scope,
@@ -711,29 +974,25 @@ class MarketDataFetcher:
             }
         }
 
-        if scope in ("overview", "deep", "us"):
-            result["data"]["us_indices"] = self.fetch_us_indices()
-            result["data"]["us_sectors"] = self.fetch_us_sectors()
-            result["data"]["vix"] = self.fetch_vix()
+        limits = dict(DEFAULT_SOURCE_TIMEOUTS)
+        limits.update(self.config.get("fetch_timeouts") or {})
+        limits.update(timeouts or {})
 
-        if scope in ("overview", "deep", "kr"):
-            result["data"]["kr_indices"] = self.fetch_kr_indices()
-            result["data"]["kr_foreign_institutional"] = self.fetch_kr_foreign_institutional()
-            result["data"]["kr_top_stocks"] = self.fetch_kr_top_stocks()
-
-        if scope in ("overview", "deep", "global", "crypto"):
-            result["data"]["treasury_yields"] = self.fetch_treasury_yields()
-            result["data"]["commodities"] = self.fetch_commodities()
-            result["data"]["currencies"] = self.fetch_currencies()
+        sources = self._scope_sources(scope)
 
-        if scope in ("overview", "deep", "crypto"):
-            result["data"]["crypto"] = self.fetch_crypto()
-
-        if scope in ("deep",):
-            result["data"]["news"] = self.fetch_market_news()
+        # One yf.download per quote batch for every section in scope
+        self._prime_quotes(list(sources))
+        try:
+            outcomes = self._fetch_concurrently(sources, limits)
+        finally:
+            self._quote_loaders = {}
 
-        if scope in ("watchlist", "deep"):
-            result["data"]["watchlist"] = self.fetch_watchlist()
+        timings = {}
+        for name in sources:
+            outcome = outcomes[name]
+            if outcome["status"] == "ok":
+                result["data"][name] = outcome.pop("value")
+            timings[name] = outcome
 
         # Add 60-day historical trends for charting
         if self.use_db and self.db and scope in ("overview", "deep", "us", "kr"):
@@ -751,6 +1010,11 @@ class MarketDataFetcher:
             if trend_symbols:
                 result["data"]["historical_trends"] = self.get_historical_trends(trend_symbols, days=60)
 
+        result["timings"] = {
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "sources": timings,
+        }
+
         return result
 
 
@@ -786,6 +1050,63 @@ def _parse_feed_date(entry) -> Optional[datetime]:
     return datetime.now()
 
 
+def _fetch_feed(url: str, ctx, cache: Optional[FeedCache],
+                refresh_seconds: float) -> Tuple[List[Dict[str, str]], str]:
+    """
+    Download and parse one RSS feed, going through the feed cache if given.
+
+    Returns:
+        (entries without "source", status) where status is "cached" (fresh on
+        disk, no request), "not_modified" (304) or "downloaded"
+    """
+    import urllib.error
+    import urllib.request
+
+    cached = cache.load(url) if cache else None
+    if cached and time.time() - cached.get("fetched_at", 0) < refresh_seconds:
+        return cached["entries"], "cached"
+
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=10, context=ctx) as resp:
+            content = resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not cached:
+            raise
+        cached["fetched_at"] = time.time()
+        cache.save(url, cached)
+        return cached["entries"], "not_modified"
+
+    import feedparser
+    feed = feedparser.parse(content)
+
+    entries = []
+    for entry in feed.entries[:NEWS_ENTRIES_PER_FEED]:
+        entries.append({
+            "title": entry.get("title", "No title"),
+            "link": entry.get("link", ""),
+            "published": _parse_feed_date(entry).isoformat(),
+            "summary": _clean_html(entry.get("summary", ""))[:200],
+        })
+
+    if cache:
+        cache.save(url, {
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "entries": entries,
+        })
+    return entries, "downloaded"
+
+
 def _clean_html(text: str) -> str:
     """Remove HTML tags."""
     text = re.sub(r"<[^>]+>", "", text)
@@ -854,10 +1175,17 @@ def main():
         "--with-analysis", action="store_true",
         help="Automatically generate AI insights from data (data-driven heuristics)",
     )
+    parser.add_argument(
+        "--timeout", type=float, default=None,
+        help="Timeout in seconds applied to every source (default: per-source defaults)",
+    )
 
     args = parser.parse_args()
     fetcher = MarketDataFetcher(args.config, args.watchlist)
-    data = fetcher.fetch_all(scope=args.scope)
+    timeouts = None
+    if args.timeout is not None:
+        timeouts = {name: args.timeout for name in fetcher._scope_sources(args.scope)}
+    data = fetcher.fetch_all(scope=args.scope, timeouts=timeouts)
 
     # Auto-generate insights if requested
     if args.with_analysis:
@@ -905,6 +1233,10 @@ def main():
         for section, content in data["data"].items():
             print(f"\n--- {section} ---")
             print(json.dumps(content, indent=2, ensure_ascii=False, default=str)[:500])
+        timings = data.get("timings", {})
+        print(f"\n--- timings ({timings.get('total_seconds')}s total) ---")
+        for section, timing in timings.get("sources", {}).items():
+            print(f"{section:<26} {timing['status']:<8} {timing['seconds']:>8.2f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+MarketHistoryDB ingestion benchmark
+Compares per-row save_daily_prices() (one commit per row, with the old
+rollback journal and with WAL) against save_daily_prices_multi() (executemany
+in one transaction) on temporary DBs, then the cost of refreshing
+multi-period returns after one new trading day (full recompute vs incremental).
+
+Usage:
+    python3 benchmark_market_history.py                     # 25 symbols x 60 days
+    python3 benchmark_market_history.py --symbols 100 --days 250
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from market_history import MarketHistoryDB
+
+
+def make_histories(symbols: int, days: int) -> Dict[str, pd.DataFrame]:
+    """Synthetic yfinance-style OHLCV frames"""
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+
+    histories = {}
+    for i in range(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+        histories[f"SYM{i:03d}"] = pd.DataFrame({
+            'Open': close * 0.995,
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Volume': rng.integers(1_000_000, 5_000_000, days),
+        }, index=index)
+    return histories
+
+
+def ingest_per_row(db: MarketHistoryDB, histories: Dict[str, pd.DataFrame]) -> int:
+    """Previous fetcher path: iterrows() + save_daily_prices() per row"""
+    rows = 0
+    for symbol, hist in histories.items():
+        for date_idx, row in hist.iterrows():
+            db.save_daily_prices(symbol, date_idx.strftime('%Y-%m-%d'), {
+                'open': float(row['Open']),
+                'high': float(row['High']),
+                'low': float(row['Low']),
+                'close': float(row['Close']),
+                'volume': int(row['Volume']),
+                'adj_close': float(row['Close'])
+            })
+            rows += 1
+    return rows
+
+
+def time_ingest(name: str, ingest, histories: Dict[str, pd.DataFrame], tmp_dir: str,
+                rollback_journal: bool = False) -> float:
+    """Ingest into a fresh DB and print rows/sec"""
+    with MarketHistoryDB(db_path=os.path.join(tmp_dir, f"{len(os.listdir(tmp_dir))}.db")) as db:
+        if rollback_journal:
+            # Pre-WAL defaults: rollback journal, fsync on every commit
+            db.conn.execute("PRAGMA journal_mode=DELETE")
+            db.conn.execute("PRAGMA synchronous=FULL")
+
+        start = time.perf_counter()
+        rows = ingest(db, histories)
+        elapsed = time.perf_counter() - start
+
+        stored = db.conn.execute("SELECT COUNT(*) FROM daily_prices").fetchone()[0]
+
+    rate = rows / elapsed if elapsed > 0 else float('inf')
+    print(f"{name:<30} {rows:>8} {elapsed:>10.3f} {rate:>14,.0f} {stored:>8}")
+    return rate
+
+
+def time_returns(histories: Dict[str, pd.DataFrame], tmp_dir: str):
+    """Returns refresh after one new day: full recompute vs incremental"""
+    with MarketHistoryDB(db_path=os.path.join(tmp_dir, "returns.db")) as db:
+        db.save_daily_prices_multi({s: h.iloc[:-1] for s, h in histories.items()})
+        for symbol in histories:
+            db.calculate_and_save_returns(symbol, incremental=False)
+
+        # One new trading day arrives
+        db.save_daily_prices_multi({s: h.iloc[-1:] for s, h in histories.items()})
+
+        for name, incremental in (("full recompute", False), ("incremental", True)):
+            if incremental:
+                db.conn.execute("DELETE FROM multi_period_returns WHERE date = ?",
+                                (next(iter(histories.values())).index[-1].strftime('%Y-%m-%d'),))
+                db.conn.commit()
+
+            start = time.perf_counter()
+            for symbol in histories:
+                db.calculate_and_save_returns(symbol, incremental=incremental)
+            elapsed = time.perf_counter() - start
+
+            print(f"{name:<30} {len(histories):>8} {elapsed * 1000:>10.1f} "
+                  f"{elapsed * 1000 / len(histories):>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MarketHistoryDB OHLCV ingestion benchmark")
+    parser.add_argument('--symbols', type=int, default=25,
+                        help='Number of symbols (default: 25, roughly indices + sector ETFs)')
+    parser.add_argument('--days', type=int, default=60,
+                        help='Trading days per symbol (default: 60)')
+    args = parser.parse_args()
+
+    histories = make_histories(args.symbols, args.days)
+
+    print("=" * 76)
+    print(f"📊 MarketHistoryDB ingestion: {args.symbols} symbols x {args.days} days")
+    print("=" * 76)
+    print(f"{'Method':<30} {'Rows':>8} {'Seconds':>10} {'Rows/sec':>14} {'Stored':>8}")
+    print("-" * 76)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        baseline = time_ingest("per-row commit (journal)", ingest_per_row, histories, tmp_dir,
+                               rollback_journal=True)
+        per_row = time_ingest("per-row commit (WAL)", ingest_per_row, histories, tmp_dir)
+        bulk = time_ingest("bulk, one transaction (WAL)",
+                           lambda db, h: db.save_daily_prices_multi(h), histories, tmp_dir)
+
+        print("-" * 76)
+        print(f"Speedup vs per-row (journal): {bulk / baseline:.0f}x, vs per-row (WAL): {bulk / per_row:.0f}x")
+
+        print()
+        print(f"{'Returns refresh (+1 day)':<30} {'Symbols':>8} {'ms':>10} {'ms/symbol':>14}")
+        print("-" * 76)
+        time_returns(histories, tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,74 @@ import sqlite3
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+# daily_prices value columns (after the symbol/date key)
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'adj_close']
+
+# multi_period_returns column -> lookback in trading days
+RETURN_PERIODS = {'return_1d': 1, 'return_5d': 5, 'return_20d': 20, 'return_60d': 60}
+
+# Prior rows needed to compute every period for a new date
+RETURN_LOOKBACK_ROWS = max(RETURN_PERIODS.values())
+
+RETURNS_UPSERT_SQL = """
+    INSERT OR REPLACE INTO multi_period_returns
+    (symbol, date, return_1d, return_5d, return_20d, return_60d)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+DAILY_PRICES_UPSERT_SQL = """
+    INSERT OR REPLACE INTO daily_prices
+    (symbol, date, open, high, low, close, volume, adj_close)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _price_rows(symbol: str, prices: pd.DataFrame) -> List[Tuple]:
+    """
+    Convert an OHLCV DataFrame into daily_prices rows.
+
+    Accepts yfinance-style frames (DatetimeIndex, Open/High/Low/Close/Volume
+    columns) or lowercase columns with an optional 'date' column. Rows without
+    a close are skipped; adj_close falls back to close.
+    """
+    if prices is None or prices.empty:
+        return []
+
+    columns = {str(c).strip().lower().replace(' ', '_'): c for c in prices.columns}
+    if 'close' not in columns:
+        return []
+
+    if 'date' in columns:
+        dates = pd.DatetimeIndex(pd.to_datetime(prices[columns['date']]))
+    else:
+        dates = pd.DatetimeIndex(prices.index)
+    dates = dates.strftime('%Y-%m-%d').tolist()
+
+    def values(name: str) -> List[Optional[float]]:
+        if name not in columns:
+            return [None] * len(prices)
+        array = pd.to_numeric(prices[columns[name]], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        return [None if v != v else v for v in array.tolist()]  # NaN -> NULL
+
+    opens, highs, lows, closes, volumes, adj_closes = (values(c) for c in PRICE_COLUMNS)
+
+    rows = {}
+    for i, date in enumerate(dates):
+        close = closes[i]
+        if close is None:
+            continue
+        volume = volumes[i]
+        adj_close = adj_closes[i]
+        rows[date] = (  # last row wins for duplicate dates
+            symbol, date, opens[i], highs[i], lows[i], close,
+            None if volume is None else int(volume),
+            close if adj_close is None else adj_close
+        )
+    return list(rows.values())
+
 
 class MarketHistoryDB:
     """
@@ -19,15 +85,18 @@ class MarketHistoryDB:
     - Multi-period returns (1d, 5d, 20d, 60d)
     - Duplicate prevention with UNIQUE constraints
     - Efficient querying with indexes
+    - Bulk ingestion (executemany in one transaction, WAL journal)
     """
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, check_same_thread: bool = True):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file.
                      Defaults to plugins/market-pulse/data/market_history.db
+            check_same_thread: Passed to sqlite3.connect. Set False to share the
+                     connection across threads (callers must serialize access).
         """
         if db_path is None:
             # Default path: same directory as this file
@@ -35,8 +104,13 @@ class MarketHistoryDB:
             db_path = os.path.join(db_dir, "market_history.db")
 
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
+
+        # WAL: commits append to the log instead of rewriting pages + journal
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
         self._create_tables()
 
     def _create_tables(self):
@@ -134,11 +208,7 @@ class MarketHistoryDB:
         cursor = self.conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO daily_prices
-                (symbol, date, open, high, low, close, volume, adj_close)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(DAILY_PRICES_UPSERT_SQL, (
                 symbol,
                 date,
                 ohlcv.get('open'),
@@ -156,6 +226,46 @@ class MarketHistoryDB:
             print(f"Error saving daily prices for {symbol} on {date}: {e}")
             return False
 
+    def save_daily_prices_bulk(self, symbol: str, prices: pd.DataFrame) -> int:
+        """
+        Save or update many days of OHLCV data for one symbol in a single transaction.
+
+        Args:
+            symbol: Stock/ETF ticker symbol
+            prices: OHLCV DataFrame (yfinance history() / download() format,
+                    or lowercase columns with an optional 'date' column)
+
+        Returns:
+            Number of rows written (0 on error)
+        """
+        return self.save_daily_prices_multi({symbol: prices})
+
+    def save_daily_prices_multi(self, prices: Dict[str, pd.DataFrame]) -> int:
+        """
+        Save or update OHLCV data for several symbols in a single transaction.
+
+        Args:
+            prices: Dictionary mapping symbol -> OHLCV DataFrame (see save_daily_prices_bulk)
+
+        Returns:
+            Number of rows written (0 on error, nothing is written)
+        """
+        rows = []
+        for symbol, frame in prices.items():
+            rows.extend(_price_rows(symbol, frame))
+
+        if not rows:
+            return 0
+
+        try:
+            with self.conn:
+                self.conn.executemany(DAILY_PRICES_UPSERT_SQL, rows)
+            return len(rows)
+
+        except sqlite3.Error as e:
+            print(f"Error bulk saving daily prices for {', '.join(prices)}: {e}")
+            return 0
+
     def save_multi_period_returns(
         self,
         symbol: str,
@@ -176,11 +286,7 @@ class MarketHistoryDB:
         cursor = self.conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO multi_period_returns
-                (symbol, date, return_1d, return_5d, return_20d, return_60d)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(RETURNS_UPSERT_SQL, (
                 symbol,
                 date,
                 returns.get('return_1d'),
@@ -196,6 +302,44 @@ class MarketHistoryDB:
             print(f"Error saving returns for {symbol} on {date}: {e}")
             return False
 
+    def save_multi_period_returns_bulk(self, symbol: str, returns: pd.DataFrame) -> int:
+        """
+        Save multi-period returns for many dates in a single transaction.
+
+        Args:
+            symbol: Stock/ETF ticker symbol
+            returns: DataFrame with columns: date, return_1d, return_5d, return_20d, return_60d
+                     (NaN is stored as NULL)
+
+        Returns:
+            Number of rows written (0 on error)
+        """
+        if returns.empty:
+            return 0
+
+        dates = pd.DatetimeIndex(pd.to_datetime(returns['date'])).strftime('%Y-%m-%d').tolist()
+        values = returns[list(RETURN_PERIODS)].astype(float).to_numpy().tolist()
+        rows = [
+            (date,) + tuple(None if v != v else v for v in row)  # NaN -> NULL
+            for date, row in zip(dates, values)
+        ]
+
+        return self._write_returns(symbol, rows)
+
+    def _write_returns(self, symbol: str, rows: List[Tuple]) -> int:
+        """Upsert (date, return_1d, return_5d, return_20d, return_60d) rows in one transaction."""
+        if not rows:
+            return 0
+
+        try:
+            with self.conn:
+                self.conn.executemany(RETURNS_UPSERT_SQL, [(symbol,) + row for row in rows])
+            return len(rows)
+
+        except sqlite3.Error as e:
+            print(f"Error bulk saving returns for {symbol}: {e}")
+            return 0
+
     def get_historical_prices(
         self,
         symbol: str,
@@ -262,42 +406,130 @@ class MarketHistoryDB:
         row = cursor.fetchone()
         return row['latest_date'] if row else None
 
-    def calculate_and_save_returns(self, symbol: str) -> bool:
+    def get_latest_return_date(self, symbol: str) -> Optional[str]:
         """
-        Calculate multi-period returns for all available dates and save to DB.
+        Get the most recent date for which multi-period returns are stored.
 
         Args:
             symbol: Stock/ETF ticker symbol
 
         Returns:
-            True if calculation successful
+            Latest date as YYYY-MM-DD string, or None if no returns
         """
-        # Get all historical prices
-        df = self.get_historical_prices(symbol, days=365)  # Get up to 1 year
+        cursor = self.conn.cursor()
 
-        if df.empty or len(df) < 2:
-            return False
+        cursor.execute("""
+            SELECT MAX(date) as latest_date
+            FROM multi_period_returns
+            WHERE symbol = ?
+        """, (symbol,))
+
+        row = cursor.fetchone()
+        return row['latest_date'] if row else None
+
+    def _get_closes_since(self, symbol: str, from_date: str) -> Tuple[List[str], List[float], int]:
+        """
+        Closes on or after a date plus the RETURN_LOOKBACK_ROWS rows before it.
+
+        Args:
+            symbol: Stock/ETF ticker symbol
+            from_date: First date to recompute (YYYY-MM-DD)
+
+        Returns:
+            Tuple of (dates, closes, first row on or after from_date), ascending
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute("""
+            SELECT date, close
+            FROM daily_prices
+            WHERE symbol = ? AND date < ?
+            ORDER BY date DESC
+            LIMIT ?
+        """, (symbol, from_date, RETURN_LOOKBACK_ROWS))
+        tail = cursor.fetchall()[::-1]
+
+        cursor.execute("""
+            SELECT date, close
+            FROM daily_prices
+            WHERE symbol = ? AND date >= ?
+            ORDER BY date ASC
+        """, (symbol, from_date))
+        new = cursor.fetchall()
+
+        rows = tail + new
+        return [row['date'] for row in rows], [row['close'] for row in rows], len(tail)
+
+    @staticmethod
+    def _compute_returns(dates: List[str], closes: List[float], start: int = 1) -> List[Tuple]:
+        """
+        Multi-period % returns (same arithmetic as pct_change) for ascending closes.
+
+        Args:
+            dates: Dates (YYYY-MM-DD), ascending
+            closes: Close prices aligned with dates
+            start: First row to emit (rows before it are lookback only)
+
+        Returns:
+            List of (date, return_1d, return_5d, return_20d, return_60d) tuples,
+            None where the lookback is too short; rows without a 1d return are skipped
+        """
+        closes = np.asarray(closes, dtype=float)
+        columns = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for periods in RETURN_PERIODS.values():
+                column = np.full(len(closes), np.nan)
+                column[periods:] = (closes[periods:] / closes[:-periods] - 1) * 100
+                columns.append(column.tolist())
+
+        rows = []
+        for i in range(max(start, 1), len(closes)):
+            values = tuple(None if column[i] != column[i] else column[i] for column in columns)  # NaN -> NULL
+            if values[0] is not None:
+                rows.append((dates[i],) + values)
+        return rows
+
+    def calculate_and_save_returns(
+        self,
+        symbol: str,
+        incremental: bool = True,
+        since: Optional[str] = None
+    ) -> bool:
+        """
+        Calculate multi-period returns and save to DB (one transaction).
+
+        Incremental mode recomputes dates from the last stored return onwards
+        (that day may have been saved from a partial intraday bar), or from
+        `since` if it is earlier, reading just the RETURN_LOOKBACK_ROWS closes
+        before them, so a refresh costs O(re-saved rows). It falls back to a
+        full recompute when the symbol has no stored returns yet.
+
+        Args:
+            symbol: Stock/ETF ticker symbol
+            incremental: Only recompute the tail instead of the full year
+            since: Earliest date whose price was just (re-)saved (YYYY-MM-DD)
+
+        Returns:
+            True if calculation successful (or returns already up to date)
+        """
+        last_return_date = self.get_latest_return_date(symbol) if incremental else None
+
+        if last_return_date is None:
+            # Full recompute over up to 1 year of prices
+            df = self.get_historical_prices(symbol, days=365)
+
+            if df.empty or len(df) < 2:
+                return False
 
-        # Calculate returns
-        df = df.sort_values('date')
-        df['return_1d'] = df['close'].pct_change(periods=1) * 100
-        df['return_5d'] = df['close'].pct_change(periods=5) * 100
-        df['return_20d'] = df['close'].pct_change(periods=20) * 100
-        df['return_60d'] = df['close'].pct_change(periods=60) * 100
+            df = df.sort_values('date')
+            returns = self._compute_returns(df['date'].dt.strftime('%Y-%m-%d').tolist(), df['close'].tolist())
+        else:
+            from_date = min(since, last_return_date) if since else last_return_date
+            dates, closes, first_row = self._get_closes_since(symbol, from_date)
+            returns = self._compute_returns(dates, closes, start=first_row)
 
         # Save to database
-        for _, row in df.iterrows():
-            if pd.notna(row['return_1d']):  # Skip first row (NaN)
-                self.save_multi_period_returns(
-                    symbol=symbol,
-                    date=row['date'].strftime('%Y-%m-%d'),
-                    returns={
-                        'return_1d': row['return_1d'],
-                        'return_5d': row['return_5d'] if pd.notna(row['return_5d']) else None,
-                        'return_20d': row['return_20d'] if pd.notna(row['return_20d']) else None,
-                        'return_60d': row['return_60d'] if pd.notna(row['return_60d']) else None
-                    }
-                )
+        self._write_returns(symbol, returns)
 
         return True
 
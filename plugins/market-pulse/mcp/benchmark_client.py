@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+StockMCPClient 벤치마크
+요청마다 서버 프로세스를 띄우던 기존 방식과 상주 세션 방식의 호출 지연 비교
+
+Usage:
+    python3 benchmark_client.py                          # tools/list (네트워크 없음, 전송 오버헤드만)
+    python3 benchmark_client.py --tool get_price_data --ticker AAPL --calls 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+# 현재 디렉토리를 Python 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from stock_client import StockMCPClient
+
+SERVER_PATH = os.path.join(current_dir, "stock_mcp_server.py")
+
+
+def legacy_request(method: str, params: Optional[Dict] = None) -> Dict:
+    """기존 방식: 요청마다 서버 프로세스 실행 (인터프리터 + yfinance import 포함)"""
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    process = subprocess.Popen(
+        [sys.executable, SERVER_PATH],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    stdout, _ = process.communicate(input=json.dumps(request) + "\n", timeout=60)
+    return json.loads(stdout.strip().split('\n')[-1]).get("result", {})
+
+
+def time_calls(call, calls: int) -> List[float]:
+    """호출별 소요 시간 (ms)"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def print_row(name: str, latencies: List[float]):
+    print(f"{name:<28} {statistics.mean(latencies):>10.1f} {statistics.median(latencies):>10.1f} "
+          f"{min(latencies):>10.1f} {max(latencies):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StockMCPClient 호출 지연 벤치마크")
+    parser.add_argument('--tool', type=str, default=None,
+                        help='호출할 도구 (기본값: 없음 = tools/list로 전송 오버헤드만 측정)')
+    parser.add_argument('--ticker', type=str, default='AAPL',
+                        help='--tool 사용 시 티커 (기본값: AAPL)')
+    parser.add_argument('--calls', type=int, default=10,
+                        help='방식별 호출 횟수 (기본값: 10)')
+    args = parser.parse_args()
+
+    if args.tool:
+        method, params = "tools/call", {"name": args.tool, "arguments": {"ticker": args.ticker}}
+        label = f"{args.tool}({args.ticker})"
+    else:
+        method, params = "tools/list", {}
+        label = "tools/list"
+
+    print("=" * 72)
+    print(f"📊 StockMCPClient 벤치마크: {label} × {args.calls}")
+    print("=" * 72)
+    print(f"{'방식':<28} {'평균(ms)':>10} {'중앙값':>10} {'최소':>10} {'최대':>10}")
+    print("-" * 72)
+
+    legacy = time_calls(lambda: legacy_request(method, params), args.calls)
+    print_row("요청마다 프로세스 실행", legacy)
+
+    with StockMCPClient() as client:
+        start = time.perf_counter()
+        client._send_request(method, params)
+        first = (time.perf_counter() - start) * 1000
+
+        persistent = time_calls(lambda: client._send_request(method, params), args.calls)
+        print_row("상주 세션 (첫 호출 제외)", persistent)
+
+    print("-" * 72)
+    print(f"상주 세션 첫 호출 (프로세스 시작 + initialize): {first:.1f} ms")
+    print(f"속도 향상 (중앙값): {statistics.median(legacy) / statistics.median(persistent):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
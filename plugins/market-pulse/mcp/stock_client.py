@@ -6,69 +6,239 @@ MCP 서버와 통신하는 클라이언트 래퍼
 import subprocess
 import json
 import os
-from typing import Dict, Optional
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional
+
+
+class MCPServerCrashed(Exception):
+    """요청 처리 중 서버 프로세스가 종료됨 (재시작 후 재시도 가능)"""
+
+
+def _terminate(process: subprocess.Popen):
+    """서버 프로세스 종료 (stdin 닫기 → 정상 종료 대기 → kill)"""
+    if process.poll() is not None:
+        return
+    try:
+        process.stdin.close()
+        process.wait(timeout=2)
+    except Exception:
+        process.kill()
+        process.wait()
 
 
 class StockMCPClient:
     """
     Stock MCP 서버와 통신하는 클라이언트
     Python 코드에서 쉽게 사용할 수 있도록 래핑
+
+    서버 프로세스는 첫 요청 시 한 번 실행되어 계속 유지됩니다 (stdin/stdout JSON-RPC).
+    - initialize 핸드셰이크는 프로세스당 한 번
+    - 요청 id로 응답을 매칭하므로 여러 스레드에서 동시에 호출 가능
+    - 서버가 죽으면 다음 요청에서 자동 재시작 (처리 중이던 요청은 한 번 재시도)
+    - 진행 알림(notifications/progress)을 받는 동안은 timeout이 연장됨 (배치 조회)
     """
 
-    def __init__(self, server_path: Optional[str] = None):
+    def __init__(self, server_path: Optional[str] = None, timeout: float = 30.0):
         """
         Args:
             server_path: MCP 서버 스크립트 경로 (기본값: 현재 디렉토리의 stock_mcp_server.py)
+            timeout: 요청당 응답 대기 시간 (초)
         """
         if server_path is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             server_path = os.path.join(current_dir, "stock_mcp_server.py")
 
         self.server_path = server_path
+        self.timeout = timeout
         self.request_id = 0
+        self.restarts = 0
 
-    def _send_request(self, method: str, params: Optional[Dict] = None) -> Dict:
-        """MCP 서버에 요청 전송"""
-        self.request_id += 1
+        self._process: Optional[subprocess.Popen] = None
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()        # 프로세스 시작/종료, id 발급
+        self._write_lock = threading.Lock()  # stdin 쓰기 직렬화
+        self._finalizer = None
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": self.request_id,
-            "method": method,
-            "params": params or {}
-        }
+    def __enter__(self) -> 'StockMCPClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """서버 프로세스 종료"""
+        with self._lock:
+            process = self._process
+            self._process = None
+
+        if process is not None:
+            _terminate(process)
+            self._fail_pending(process, MCPServerCrashed("MCP client closed"))
+
+    def _ensure_started(self) -> subprocess.Popen:
+        """서버 프로세스가 없거나 죽었으면 (재)시작하고 initialize 핸드셰이크 수행"""
+        with self._lock:
+            process = self._process
+            if process is not None and process.poll() is None and not process.stdin.closed:
+                return process
+
+            if process is not None:
+                self.restarts += 1
+                print(f"Warning: MCP server exited (code {process.returncode}), restarting")
 
-        try:
-            # MCP 서버 프로세스 시작
             process = subprocess.Popen(
-                ["python3", self.server_path],
+                [sys.executable, self.server_path],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
-            )
-
-            # 요청 전송
-            stdout, stderr = process.communicate(
-                input=json.dumps(request) + "\n",
-                timeout=10
+                text=True,
+                bufsize=1
             )
+            self._process = process
+
+            threading.Thread(target=self._read_responses, args=(process,), daemon=True).start()
+            threading.Thread(target=self._drain_stderr, args=(process,), daemon=True).start()
+
+            # 클라이언트가 GC/인터프리터 종료될 때 서버도 정리
+            if self._finalizer is not None:
+                self._finalizer.detach()
+            self._finalizer = weakref.finalize(self, _terminate, process)
+
+        self._request(process, "initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "stock-client", "version": "1.0.0"}
+        })
+
+        return process
+
+    def _read_responses(self, process: subprocess.Popen):
+        """stdout 응답을 id별 대기 중인 요청에 전달 (프로세스별 백그라운드 스레드)"""
+        for line in process.stdout:
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            if response.get("method") == "notifications/progress":
+                self._dispatch_progress(response.get("params", {}))
+                continue
+
+            with self._lock:
+                future = self._pending.pop(response.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+
+        process.wait()
+        self._fail_pending(process, MCPServerCrashed(f"MCP server exited (code {process.returncode})"))
+
+    def _dispatch_progress(self, params: Dict):
+        """진행 알림을 해당 요청의 콜백에 전달 (progressToken = 요청 id)"""
+        with self._lock:
+            future = self._pending.get(params.get("progressToken"))
+        if future is None:
+            return
+
+        future.last_activity = time.monotonic()
+        callback = getattr(future, 'progress', None)
+        if callback is not None:
+            try:
+                callback(params)
+            except Exception as e:
+                print(f"Warning: progress callback failed: {e}")
+
+    def _drain_stderr(self, process: subprocess.Popen):
+        """stderr를 계속 비워 파이프가 막히지 않게 함"""
+        for line in process.stderr:
+            if line.strip():
+                print(f"Warning: {line.rstrip()}")
+
+    def _fail_pending(self, process: subprocess.Popen, error: Exception):
+        """해당 프로세스로 보낸 미응답 요청을 모두 실패 처리"""
+        with self._lock:
+            failed = [(rid, f) for rid, f in self._pending.items() if getattr(f, 'process', None) is process]
+            for rid, _ in failed:
+                del self._pending[rid]
+
+        for _, future in failed:
+            if not future.done():
+                future.set_exception(error)
+
+    def _request(
+        self,
+        process: subprocess.Popen,
+        method: str,
+        params: Dict,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """지정한 프로세스로 요청 한 건을 보내고 응답 대기 (progress: 진행 알림 콜백)"""
+        future = Future()
+        future.process = process
+        future.progress = progress
+        future.last_activity = time.monotonic()
+
+        with self._lock:
+            self.request_id += 1
+            request_id = self.request_id
+            self._pending[request_id] = future
+
+        if progress is not None:
+            params = {**params, "_meta": {"progressToken": request_id}}
 
-            if stderr:
-                print(f"Warning: {stderr}")
-
-            # 응답 파싱
-            if stdout.strip():
-                response = json.loads(stdout.strip().split('\n')[-1])
-                if "error" in response:
-                    raise Exception(f"MCP Error: {response['error']}")
-                return response.get("result", {})
-
-            return {}
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params
+        }
 
-        except subprocess.TimeoutExpired:
-            process.kill()
-            raise Exception("MCP server timeout")
+        try:
+            with self._write_lock:
+                process.stdin.write(json.dumps(request) + "\n")
+                process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise MCPServerCrashed("MCP server pipe closed")
+
+        while True:
+            try:
+                response = future.result(timeout=self.timeout)
+                break
+            except FutureTimeoutError:
+                if time.monotonic() - future.last_activity < self.timeout:
+                    continue  # 진행 알림 수신 중 (아직 작업 중)
+
+                with self._lock:
+                    self._pending.pop(request_id, None)
+                # 서버는 요청을 순서대로 처리하므로 멈춘 프로세스는 교체
+                _terminate(process)
+                raise Exception("MCP server timeout")
+
+        if "error" in response:
+            raise Exception(f"MCP Error: {response['error']}")
+
+        return response.get("result", {})
+
+    def _send_request(
+        self,
+        method: str,
+        params: Optional[Dict] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """MCP 서버에 요청 전송 (서버 크래시 시 재시작 후 한 번 재시도)"""
+        try:
+            for attempt in range(2):
+                process = self._ensure_started()
+                try:
+                    return self._request(process, method, params or {}, progress=progress)
+                except MCPServerCrashed:
+                    if attempt == 1:
+                        raise
         except Exception as e:
             raise Exception(f"MCP client error: {str(e)}")
 
@@ -217,6 +387,54 @@ class StockMCPClient:
 
         return result
 
+    def get_batch_metrics(
+        self,
+        tickers: List[str],
+        tools: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[str, Dict], None]] = None
+    ) -> Dict[str, Dict]:
+        """
+        여러 종목 동시 조회 (서버에서 병렬 처리, 요청 1회)
+
+        Args:
+            tickers: 티커 목록
+            tools: 종목별로 실행할 도구 (기본값: ["get_all_metrics"])
+            max_workers: 서버 동시 조회 수 (기본값: 서버 기본값)
+            on_result: 종목별 결과가 도착할 때마다 호출 (ticker, {tool: 결과}) - 완료 순서,
+                       응답 수신 스레드에서 실행되므로 가볍게 유지
+
+        Returns:
+            {TICKER: {tool: 결과}} (입력 순서, 티커는 대문자)
+        """
+        arguments = {"tickers": list(tickers)}
+        if tools:
+            arguments["tools"] = list(tools)
+        if max_workers:
+            arguments["max_workers"] = max_workers
+
+        def progress(params: Dict):
+            if on_result is not None and "result" in params:
+                on_result(params.get("message"), params["result"])
+
+        result = self._send_request(
+            "tools/call",
+            {
+                "name": "get_batch_metrics",
+                "arguments": arguments
+            },
+            progress=progress
+        )
+
+        if "content" in result and len(result["content"]) > 0:
+            text = result["content"][0].get("text", "{}")
+            result = json.loads(text)
+
+        if "error" in result:
+            raise Exception(f"MCP batch error: {result['error']}")
+
+        return result.get("results", {})
+
 
 # 사용 예시
 if __name__ == "__main__":
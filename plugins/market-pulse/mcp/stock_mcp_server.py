@@ -2,14 +2,136 @@
 """
 Stock Data MCP Server
 yfinance 기반 주식 데이터 제공 MCP 서버
+
+Ticker.info는 TTL이 있는 LRU 캐시(메모리)와 선택적 SQLite 캐시(디스크)를 거쳐 조회:
+- 한 종목의 모든 도구 호출이 info 다운로드 1회를 공유
+- SQLite 캐시는 서버 재시작 후에도 유지
+
+get_batch_metrics는 여러 종목을 서버에서 동시에 조회 (동시 조회 수 제한).
+요청에 progressToken이 있으면 종목별 결과를 완료 순서대로
+notifications/progress (result 필드)로 스트리밍.
+
+설정 (인자 또는 환경 변수):
+    --cache-ttl   / STOCK_MCP_CACHE_TTL    캐시 유효 시간 (초, 기본 900)
+    --cache-size  / STOCK_MCP_CACHE_SIZE   메모리 캐시 최대 종목 수 (기본 256)
+    --cache-db    / STOCK_MCP_CACHE_DB     SQLite 캐시 파일 경로 (기본: 사용 안 함)
 """
 
+import argparse
 import json
+import os
+import sqlite3
 import sys
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Any
 import yfinance as yf
 from datetime import datetime, timedelta
 
+DEFAULT_CACHE_TTL = 900       # 15분
+DEFAULT_CACHE_SIZE = 256
+
+# get_batch_metrics 동시 조회 수
+DEFAULT_BATCH_WORKERS = 8
+MAX_BATCH_WORKERS = 32
+
+
+class TTLCache:
+    """
+    크기 제한 LRU 캐시 (항목별 만료 시간)
+    여러 스레드에서 동시에 사용 가능
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        """
+        Args:
+            maxsize: 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+            ttl: 항목 유효 시간 (초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """유효한 값 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            stored_at, value = item
+            if time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """값 저장 (stored_at: 원래 조회 시각, 디스크 캐시에서 올릴 때 사용)"""
+        with self._lock:
+            self._data[key] = (stored_at or time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    JSON 페이로드 디스크 캐시 (서버 재시작 후에도 유지)
+    """
+
+    def __init__(self, db_path: str, ttl: float = DEFAULT_CACHE_TTL):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            ttl: 항목 유효 시간 (초)
+        """
+        self.db_path = os.path.expanduser(db_path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS payloads (
+                key TEXT PRIMARY KEY,
+                payload TEXT,
+                fetched_at REAL
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[tuple]:
+        """유효한 (조회 시각, 값) 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, fetched_at FROM payloads WHERE key = ?', (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+
+        return row[1], json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """값 저장"""
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO payloads VALUES (?, ?, ?)',
+                (key, payload, time.time())
+            )
+            self._conn.commit()
+
+
 
 class StockMCPServer:
     """
@@ -17,10 +139,58 @@ class StockMCPServer:
     yfinance를 활용하여 실시간 및 펀더멘털 데이터 제공
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_db: Optional[str] = None
+    ):
+        """
+        Args:
+            cache_ttl: info 캐시 유효 시간 (초, 0이면 캐시 사용 안 함)
+            cache_size: 메모리 캐시 최대 종목 수
+            cache_db: SQLite 캐시 파일 경로 (None이면 메모리 캐시만)
+        """
         self.name = "stock-data"
         self.version = "1.0.0"
 
+        self.cache_ttl = cache_ttl
+        self._memory_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._disk_cache = SQLiteCache(cache_db, ttl=cache_ttl) if cache_db and cache_ttl > 0 else None
+        self.cache_stats = {"memory_hits": 0, "disk_hits": 0, "downloads": 0}
+
+    def _get_info(self, ticker: str) -> Dict:
+        """
+        Ticker.info 조회 (메모리 캐시 → SQLite 캐시 → yfinance)
+
+        빈 응답은 캐시하지 않음 (일시적 오류로 잘못된 값이 고정되지 않도록)
+        """
+        key = f"info:{ticker.upper()}"
+
+        if self.cache_ttl > 0:
+            info = self._memory_cache.get(key)
+            if info is not None:
+                self.cache_stats["memory_hits"] += 1
+                return info
+
+            if self._disk_cache is not None:
+                cached = self._disk_cache.get(key)
+                if cached is not None:
+                    fetched_at, info = cached
+                    self._memory_cache.set(key, info, stored_at=fetched_at)
+                    self.cache_stats["disk_hits"] += 1
+                    return info
+
+        info = yf.Ticker(ticker).info
+        self.cache_stats["downloads"] += 1
+
+        if info and self.cache_ttl > 0:
+            self._memory_cache.set(key, info)
+            if self._disk_cache is not None:
+                self._disk_cache.set(key, info)
+
+        return info
+
     def get_tools(self) -> List[Dict[str, Any]]:
         """사용 가능한 도구 목록 반환"""
         return [
@@ -149,14 +319,37 @@ class StockMCPServer:
                     },
                     "required": ["ticker"]
                 }
+            },
+            {
+                "name": "get_batch_metrics",
+                "description": "여러 종목을 동시에 조회 (종목별로 지정한 도구들 실행)",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "tickers": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "주식 티커 심볼 목록"
+                        },
+                        "tools": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": list(self._ticker_tools())},
+                            "description": "종목별로 실행할 도구 (기본값: [\"get_all_metrics\"])"
+                        },
+                        "max_workers": {
+                            "type": "integer",
+                            "description": f"동시 조회 수 (기본값: {DEFAULT_BATCH_WORKERS}, 최대 {MAX_BATCH_WORKERS})"
+                        }
+                    },
+                    "required": ["tickers"]
+                }
             }
         ]
 
     def get_fundamental_metrics(self, ticker: str) -> Dict:
         """펀더멘털 지표 조회"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -194,8 +387,7 @@ class StockMCPServer:
     def get_valuation_metrics(self, ticker: str) -> Dict:
         """밸류에이션 지표"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -214,8 +406,7 @@ class StockMCPServer:
     def get_profitability_metrics(self, ticker: str) -> Dict:
         """수익성 지표"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -232,8 +423,7 @@ class StockMCPServer:
     def get_growth_metrics(self, ticker: str) -> Dict:
         """성장률 지표"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -250,8 +440,7 @@ class StockMCPServer:
     def get_financial_health(self, ticker: str) -> Dict:
         """재무 건전성"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -269,8 +458,7 @@ class StockMCPServer:
     def get_dividend_info(self, ticker: str) -> Dict:
         """배당 정보"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -286,8 +474,7 @@ class StockMCPServer:
     def get_company_info(self, ticker: str) -> Dict:
         """기업 기본 정보"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -305,8 +492,7 @@ class StockMCPServer:
     def get_price_data(self, ticker: str) -> Dict:
         """가격 데이터"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -326,8 +512,8 @@ class StockMCPServer:
     def get_all_metrics(self, ticker: str) -> Dict:
         """모든 지표 종합"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            # info는 여기서 한 번만 다운로드되고 아래 도구들은 캐시를 사용
+            self._get_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -342,14 +528,62 @@ class StockMCPServer:
         except Exception as e:
             return {"error": str(e), "ticker": ticker}
 
-    def call_tool(self, name: str, arguments: Dict) -> Dict:
-        """도구 호출 핸들러"""
-        ticker = arguments.get("ticker", "").upper()
-
-        if not ticker:
-            return {"error": "ticker is required"}
+    def get_batch_metrics(
+        self,
+        tickers: List[str],
+        tools: Optional[List[str]] = None,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+        on_result: Optional[Callable[[str, Dict, int, int], None]] = None
+    ) -> Dict:
+        """
+        여러 종목 동시 조회
+
+        Args:
+            tickers: 티커 목록 (중복 제거, 대문자 변환)
+            tools: 종목별로 실행할 도구 이름 (기본값: get_all_metrics)
+            max_workers: 동시 조회 수 (1 ~ MAX_BATCH_WORKERS)
+            on_result: 종목 완료 시 호출 (ticker, 결과, 완료 수, 전체 수) - 완료 순서
+
+        Returns:
+            {"tools", "count", "elapsed_seconds", "results": {ticker: {tool: 결과}}} (입력 순서)
+        """
+        tool_map = self._ticker_tools()
+        tools = tools or ["get_all_metrics"]
+        unknown = [tool for tool in tools if tool not in tool_map]
+        if unknown:
+            return {"error": f"Unknown tool: {', '.join(unknown)}"}
+
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        workers = max(1, min(int(max_workers or DEFAULT_BATCH_WORKERS), MAX_BATCH_WORKERS, len(tickers) or 1))
+
+        def fetch(ticker: str) -> Dict:
+            # 첫 도구가 info를 받아오고 나머지는 캐시 사용
+            return {tool: tool_map[tool](ticker) for tool in tools}
+
+        start = time.time()
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch, ticker): ticker for ticker in tickers}
+            for done, future in enumerate(as_completed(futures), 1):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    results[ticker] = {"error": str(e), "ticker": ticker}
+
+                if on_result is not None:
+                    on_result(ticker, results[ticker], done, len(tickers))
+
+        return {
+            "tools": tools,
+            "count": len(tickers),
+            "elapsed_seconds": round(time.time() - start, 3),
+            "results": {ticker: results[ticker] for ticker in tickers}
+        }
 
-        tool_map = {
+    def _ticker_tools(self) -> Dict[str, Callable[[str], Dict]]:
+        """단일 종목 도구 이름 → 메서드"""
+        return {
             "get_fundamental_metrics": self.get_fundamental_metrics,
             "get_valuation_metrics": self.get_valuation_metrics,
             "get_profitability_metrics": self.get_profitability_metrics,
@@ -361,6 +595,31 @@ class StockMCPServer:
             "get_all_metrics": self.get_all_metrics
         }
 
+    def call_tool(
+        self,
+        name: str,
+        arguments: Dict,
+        on_result: Optional[Callable[[str, Dict, int, int], None]] = None
+    ) -> Dict:
+        """도구 호출 핸들러 (on_result: get_batch_metrics 종목별 결과 콜백)"""
+        if name == "get_batch_metrics":
+            tickers = arguments.get("tickers")
+            if not tickers or not isinstance(tickers, list):
+                return {"error": "tickers is required"}
+            return self.get_batch_metrics(
+                tickers,
+                tools=arguments.get("tools"),
+                max_workers=arguments.get("max_workers") or DEFAULT_BATCH_WORKERS,
+                on_result=on_result
+            )
+
+        ticker = arguments.get("ticker", "").upper()
+
+        if not ticker:
+            return {"error": "ticker is required"}
+
+        tool_map = self._ticker_tools()
+
         if name not in tool_map:
             return {"error": f"Unknown tool: {name}"}
 
@@ -369,7 +628,23 @@ class StockMCPServer:
 
 def main():
     """MCP 서버 메인 루프"""
-    server = StockMCPServer()
+    parser = argparse.ArgumentParser(description="Stock Data MCP Server")
+    parser.add_argument('--cache-ttl', type=float,
+                        default=float(os.environ.get('STOCK_MCP_CACHE_TTL', DEFAULT_CACHE_TTL)),
+                        help=f'info 캐시 유효 시간 (초, 0 = 캐시 사용 안 함, 기본값: {DEFAULT_CACHE_TTL})')
+    parser.add_argument('--cache-size', type=int,
+                        default=int(os.environ.get('STOCK_MCP_CACHE_SIZE', DEFAULT_CACHE_SIZE)),
+                        help=f'메모리 캐시 최대 종목 수 (기본값: {DEFAULT_CACHE_SIZE})')
+    parser.add_argument('--cache-db', type=str,
+                        default=os.environ.get('STOCK_MCP_CACHE_DB') or None,
+                        help='SQLite 캐시 파일 경로 (재시작 후에도 유지, 기본값: 사용 안 함)')
+    args = parser.parse_args()
+
+    server = StockMCPServer(
+        cache_ttl=args.cache_ttl,
+        cache_size=args.cache_size,
+        cache_db=args.cache_db
+    )
 
     # MCP 프로토콜 핸들러
     for line in sys.stdin:
@@ -405,7 +680,27 @@ def main():
             elif method == "tools/call":
                 tool_name = params.get("name")
                 arguments = params.get("arguments", {})
-                result = server.call_tool(tool_name, arguments)
+                progress_token = (params.get("_meta") or {}).get("progressToken")
+
+                def send_progress(ticker, ticker_result, done, total, token=progress_token):
+                    # 종목별 결과 스트리밍 (완료 순서)
+                    print(json.dumps({
+                        "jsonrpc": "2.0",
+                        "method": "notifications/progress",
+                        "params": {
+                            "progressToken": token,
+                            "progress": done,
+                            "total": total,
+                            "message": ticker,
+                            "result": ticker_result
+                        }
+                    }, ensure_ascii=False, default=str), flush=True)
+
+                result = server.call_tool(
+                    tool_name,
+                    arguments,
+                    on_result=send_progress if progress_token is not None else None
+                )
 
                 response = {
                     "jsonrpc": "2.0",
@@ -8,26 +8,61 @@ Combines all Portfolio Copilot features into a comprehensive analysis:
 - Sprint 4: Fundamental analysis (scorecard, data quality)
 - Sprint 5: Rebalancing recommendations
 
+Every analyzer reads prices and quotes from one per-run MarketDataContext
+(bulk price panel + quote snapshot). The analysis sections then run
+concurrently with per-section timeouts; a failed or timed-out section leaves
+its results empty and the rest of the report is still produced. The time
+spent in each section is reported at the end of the run.
+
 Usage:
-    python3 all_in_one_analysis.py <portfolio_id> [--html]
+    python3 all_in_one_analysis.py <portfolio_id> [--html] [--sequential] [--timeout SECONDS]
 """
 
 import sys
 import argparse
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional
 import os
+import pandas as pd
 
 # Import all analysis modules
 from tax_loss_harvester import TaxLossHarvester
 from tax_calculator import TaxCalculator
 from dividend_tracker import DividendTracker
 from benchmark_analyzer import BenchmarkAnalyzer
-from performance_calculator import PerformanceCalculator
-from risk_metrics import RiskAnalyzer
+from performance_calculator import PerformanceCalculator, PerformanceMetrics
+from risk_metrics import RiskMetricsCalculator
 from rebalance_engine import RebalanceEngine
 from scorecard import CompanyScorecardGenerator
 from database import get_database, Holding
+from market_data_context import MarketDataContext, get_quote
+
+BENCHMARK = 'SPY'
+
+# Per-section time budget for concurrent runs (seconds)
+DEFAULT_SECTION_TIMEOUTS = {
+    'summary': 60,
+    'tax': 120,
+    'dividends': 180,
+    'benchmark': 120,
+    'performance': 120,
+    'risk': 180,
+    'rebalancing': 120,
+}
+DEFAULT_SECTION_TIMEOUT = 120
+
+
+@dataclass
+class AnalysisSection:
+    """One independently runnable part of the comprehensive analysis."""
+    name: str
+    label: str
+    run: Callable[[], Dict[str, Any]]  # Returns {result_key: value}
+    defaults: Dict[str, Any] = field(default_factory=dict)  # Result keys used when the section fails
 
 
 class PortfolioCopilot:
@@ -45,10 +80,28 @@ class PortfolioCopilot:
         self.dividend_tracker = DividendTracker(db_path)
         self.benchmark_analyzer = BenchmarkAnalyzer(db_path)
         self.performance_calculator = PerformanceCalculator(db_path)
-        self.risk_analyzer = RiskAnalyzer(db_path)
+        self.risk_analyzer = RiskMetricsCalculator(db_path)
         self.rebalance_engine = RebalanceEngine(db_path)
         self.scorecard_generator = CompanyScorecardGenerator()
 
+        # Per-run shared market data and step timings (seconds)
+        self.market_data = None
+        self.timings: Dict[str, float] = {}
+
+    def _attach_market_data(self, context):
+        """Point every analyzer at the run's MarketDataContext (None = live fetches)."""
+        self.market_data = context
+        for analyzer in (
+            self.tax_harvester,
+            self.dividend_tracker,
+            self.benchmark_analyzer,
+            self.performance_calculator,
+            self.risk_analyzer,
+            self.rebalance_engine,
+            self.rebalance_engine.tax_harvester,
+        ):
+            analyzer.market_data = context
+
     def get_portfolio_summary(self) -> Dict:
         """Get basic portfolio information."""
         holdings = self.session.query(Holding).filter_by(portfolio_id=self.portfolio_id).all()
@@ -58,8 +111,7 @@ class PortfolioCopilot:
         num_holdings = len(holdings)
 
         for holding in holdings:
-            from data_fetcher import get_stock_data
-            stock_data = get_stock_data(holding.ticker, holding.market)
+            stock_data = get_quote(holding.ticker, holding.market, self.market_data, self.db.db_path)
             current_price = stock_data.get('current_price', holding.avg_price) if stock_data else holding.avg_price
 
             position_value = current_price * holding.quantity
@@ -79,64 +131,267 @@ class PortfolioCopilot:
             'num_holdings': num_holdings
         }
 
-    def run_comprehensive_analysis(self) -> Dict:
+    def _build_sections(self, today) -> List[AnalysisSection]:
+        """
+        Analysis sections of a comprehensive run.
+
+        Each section only touches its own analyzer instances, and therefore its
+        own SQLAlchemy Session, so sections can run on separate threads.
+        """
+        pid = self.portfolio_id
+        one_year_ago = today - timedelta(days=365)
+
+        def tax():
+            return {
+                'tax_harvesting': self.tax_harvester.find_harvest_opportunities(pid, min_loss_threshold=500),
+                'tax_report': self.tax_calculator.calculate_capital_gains_tax(pid, today.year),
+            }
+
+        def risk():
+            var_results = self.risk_analyzer.calculate_var(pid, confidence=0.95, horizon_days=1)
+            correlation = self.risk_analyzer.calculate_correlation_matrix(pid)
+            concentration = self.risk_analyzer.calculate_concentration_risk(pid)
+            warnings = self.risk_analyzer.generate_risk_warnings(
+                pid,
+                var_results=var_results,
+                concentration=concentration,
+                correlation_matrix=correlation
+            )
+            return {
+                'var_analysis': var_results,
+                'correlation': correlation,
+                'concentration': concentration,
+                'risk_warnings': warnings,
+            }
+
+        return [
+            AnalysisSection(
+                'summary', "📊 Portfolio Summary",
+                lambda: {'summary': self.get_portfolio_summary()},
+                {'summary': None}
+            ),
+            AnalysisSection(
+                'tax', "💰 Tax Optimization", tax,
+                {'tax_harvesting': [], 'tax_report': None}
+            ),
+            AnalysisSection(
+                'dividends', "💵 Dividend Analysis",
+                lambda: {'dividends': self.dividend_tracker.calculate_dividend_yields(pid)},
+                {'dividends': []}
+            ),
+            AnalysisSection(
+                'benchmark', "📊 Benchmark Comparison",
+                lambda: {'benchmark_spy': self.benchmark_analyzer.compare_to_benchmark(
+                    pid, BENCHMARK, start_date=one_year_ago, end_date=today
+                )},
+                {'benchmark_spy': None}
+            ),
+            AnalysisSection(
+                'performance', "📈 Performance Analysis",
+                lambda: {'performance': self.performance_calculator.calculate_comprehensive_metrics(
+                    pid, start_date=one_year_ago, end_date=today
+                )},
+                {'performance': None}
+            ),
+            AnalysisSection(
+                'risk', "⚠️  Risk Analysis", risk,
+                {'var_analysis': {}, 'correlation': pd.DataFrame(), 'concentration': {}, 'risk_warnings': []}
+            ),
+            AnalysisSection(
+                'rebalancing', "🔄 Rebalancing Analysis",
+                lambda: {'rebalancing': self.rebalance_engine.analyze_rebalancing(pid)},
+                {'rebalancing': None}
+            ),
+        ]
+
+    def _run_sequentially(self, sections: List[AnalysisSection]) -> Dict[str, Dict[str, Any]]:
+        """Run sections one after another (no timeouts)."""
+        outcomes = {}
+        for section in sections:
+            print(f"{section.label}...")
+            start = time.perf_counter()
+            try:
+                value = section.run()
+                outcomes[section.name] = {'status': 'ok', 'seconds': time.perf_counter() - start, 'value': value}
+            except Exception as e:
+                print(f"❌ {section.name} failed: {e}")
+                outcomes[section.name] = {'status': 'error', 'seconds': time.perf_counter() - start, 'error': str(e)}
+        return outcomes
+
+    def _run_concurrently(
+        self,
+        sections: List[AnalysisSection],
+        timeouts: Dict[str, float]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run sections in parallel with per-section timeouts.
+
+        Each section runs on its own daemon thread, so a hung section neither
+        blocks the others nor keeps the process alive after the report is written.
+
+        Returns:
+            Dictionary mapping section -> {'status': ok|error|timeout, 'seconds', 'value'/'error'}
+        """
+        futures = {}
+        started = time.perf_counter()
+
+        def run(section: AnalysisSection, future: Future):
+            start = time.perf_counter()
+            try:
+                future.set_result((section.run(), time.perf_counter() - start, None))
+            except Exception as e:
+                future.set_result((None, time.perf_counter() - start, e))
+
+        for section in sections:
+            future = Future()
+            futures[future] = section.name
+            print(f"{section.label}...")
+            threading.Thread(target=run, args=(section, future),
+                             name=f"analysis-{section.name}", daemon=True).start()
+
+        deadlines = {
+            future: started + timeouts.get(name, DEFAULT_SECTION_TIMEOUT)
+            for future, name in futures.items()
+        }
+        outcomes = {}
+        pending = set(futures)
+
+        while pending:
+            now = time.perf_counter()
+            for future in [f for f in pending if deadlines[f] <= now and not f.done()]:
+                name = futures[future]
+                pending.discard(future)
+                limit = timeouts.get(name, DEFAULT_SECTION_TIMEOUT)
+                print(f"⏱️  {name} timed out after {limit}s, continuing without it")
+                outcomes[name] = {'status': 'timeout', 'seconds': now - started,
+                                  'error': f"timed out after {limit}s"}
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                pending.discard(future)
+                value, elapsed, error = future.result()
+                if error is None:
+                    outcomes[name] = {'status': 'ok', 'seconds': elapsed, 'value': value}
+                else:
+                    print(f"❌ {name} failed: {error}")
+                    outcomes[name] = {'status': 'error', 'seconds': elapsed, 'error': str(error)}
+
+        return outcomes
+
+    def run_comprehensive_analysis(
+        self,
+        concurrent: bool = True,
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict:
         """
         Run all analyses and return comprehensive results.
 
+        Args:
+            concurrent: Run sections in parallel (default) instead of one by one
+            timeouts: Per-section timeout overrides in seconds (concurrent mode only;
+                      defaults: DEFAULT_SECTION_TIMEOUTS)
+
         Returns:
-            Dictionary with all analysis results
+            Dictionary with all analysis results. Sections that failed or timed
+            out keep their default (empty) values; 'section_status' maps each
+            section to ok/error/timeout and 'timings' to its wall time.
         """
         results = {}
+        timings: Dict[str, float] = {}
+        today = datetime.now().date()
+        run_started = time.perf_counter()
 
         print("🔍 Running comprehensive portfolio analysis...")
         print("=" * 80)
 
-        # Portfolio Summary
-        print("\n📊 Portfolio Summary...")
-        results['summary'] = self.get_portfolio_summary()
+        # Shared market data: one price panel + quote snapshot for all analyzers
+        print("\n📥 Loading market data...")
+        start = time.perf_counter()
+        holdings = self.session.query(Holding).filter_by(portfolio_id=self.portfolio_id).all()
+        context = MarketDataContext.for_holdings(
+            holdings, benchmarks=[BENCHMARK], end_date=today, db_path=self.db.db_path
+        ).load()
+        timings['market_data'] = time.perf_counter() - start
+        self._attach_market_data(context)
+
+        sections = self._build_sections(today)
+        try:
+            if concurrent:
+                limits = {**DEFAULT_SECTION_TIMEOUTS, **(timeouts or {})}
+                outcomes = self._run_concurrently(sections, limits)
+            else:
+                outcomes = self._run_sequentially(sections)
+        finally:
+            self._attach_market_data(None)
+
+        results['section_status'] = {}
+        for section in sections:
+            outcome = outcomes[section.name]
+            results.update(outcome['value'] if outcome['status'] == 'ok' else section.defaults)
+            results['section_status'][section.name] = outcome['status']
+            timings[section.name] = outcome['seconds']
+
+        self.timings = timings
+        results['timings'] = dict(timings)
+        results['wall_seconds'] = time.perf_counter() - run_started
+        results['market_data'] = context.summary()
+
+        failed = [name for name, status in results['section_status'].items() if status != 'ok']
+        if failed:
+            print(f"⚠️  Analysis complete with partial results (missing: {', '.join(failed)})\n")
+        else:
+            print("✅ Analysis complete!\n")
 
-        # Sprint 1: Tax Optimization
-        print("💰 Tax Optimization Analysis...")
-        results['tax_harvesting'] = self.tax_harvester.find_harvest_opportunities(
-            self.portfolio_id,
-            min_loss_threshold=500
-        )
-        results['tax_report'] = self.tax_calculator.calculate_annual_tax(
-            self.portfolio_id,
-            datetime.now().year
-        )
-        results['dividends'] = self.dividend_tracker.calculate_dividend_yields(self.portfolio_id)
-
-        # Sprint 2: Performance Analysis
-        print("📈 Performance Analysis...")
-        results['benchmark_spy'] = self.benchmark_analyzer.compare_to_benchmark(
-            self.portfolio_id,
-            'SPY',
-            days=365
-        )
-        results['performance'] = self.performance_calculator.calculate_performance_metrics(
-            self.portfolio_id,
-            start_date=datetime.now().date() - timedelta(days=365),
-            end_date=datetime.now().date()
-        )
+        return results
 
-        # Sprint 3: Risk Management
-        print("⚠️  Risk Analysis...")
-        results['var_analysis'] = self.risk_analyzer.calculate_var(
-            self.portfolio_id,
-            confidence=0.95,
-            horizon_days=1
-        )
-        results['correlation'] = self.risk_analyzer.analyze_correlation_risk(self.portfolio_id)
-        results['risk_warnings'] = self.risk_analyzer.generate_risk_warnings(self.portfolio_id)
+    def format_timing_report(
+        self,
+        timings: Dict[str, float],
+        market_data: str = None,
+        section_status: Dict[str, str] = None,
+        wall_seconds: float = None
+    ) -> str:
+        """
+        Format per-section wall times of a comprehensive run.
 
-        # Sprint 4: Rebalancing
-        print("🔄 Rebalancing Analysis...")
-        results['rebalancing'] = self.rebalance_engine.analyze_rebalancing(self.portfolio_id)
+        Args:
+            timings: {section: seconds} in execution order
+            market_data: MarketDataContext.summary() line (optional)
+            section_status: {section: ok|error|timeout} (optional)
+            wall_seconds: End-to-end run time (optional; below the sum when concurrent)
 
-        print("✅ Analysis complete!\n")
+        Returns:
+            Formatted table string
+        """
+        section_status = section_status or {}
+        total = sum(timings.values())
+        lines = []
+        lines.append("⏱️  ANALYSIS TIMINGS")
+        lines.append("-" * 80)
+        lines.append(f"{'Section':<20} {'Seconds':>10} {'Share':>10}   Status")
+        for name, seconds in timings.items():
+            share = seconds / total * 100 if total > 0 else 0
+            lines.append(f"{name:<20} {seconds:>10.2f} {share:>9.1f}%   {section_status.get(name, 'ok')}")
+        lines.append("-" * 80)
+        lines.append(f"{'Sum of sections':<20} {total:>10.2f}")
+        if wall_seconds is not None:
+            lines.append(f"{'Wall clock':<20} {wall_seconds:>10.2f}")
+        if market_data:
+            lines.append(f"Market data: {market_data}")
+        lines.append("")
 
-        return results
+        return "\n".join(lines)
+
+    @staticmethod
+    def _unavailable(results: Dict, section: str) -> str:
+        """Placeholder line for a section without results."""
+        status = results.get('section_status', {}).get(section, 'error')
+        return f"Unavailable ({section} section: {status})."
 
     def generate_text_report(self, results: Dict) -> str:
         """Generate comprehensive text report."""
@@ -154,42 +409,58 @@ class PortfolioCopilot:
         summary = results['summary']
         lines.append("📊 EXECUTIVE SUMMARY")
         lines.append("-" * 80)
-        lines.append(f"Total Value:           ${summary['total_value']:>15,.2f}")
-        lines.append(f"Total Cost:            ${summary['total_cost']:>15,.2f}")
-        lines.append(f"Unrealized P&L:        ${summary['unrealized_pnl']:>15,.2f} ({summary['unrealized_pnl_pct']:+.2f}%)")
-        lines.append(f"Number of Holdings:    {summary['num_holdings']:>15}")
+        if summary:
+            lines.append(f"Total Value:           ${summary['total_value']:>15,.2f}")
+            lines.append(f"Total Cost:            ${summary['total_cost']:>15,.2f}")
+            lines.append(f"Unrealized P&L:        ${summary['unrealized_pnl']:>15,.2f} ({summary['unrealized_pnl_pct']:+.2f}%)")
+            lines.append(f"Number of Holdings:    {summary['num_holdings']:>15}")
+        else:
+            lines.append(self._unavailable(results, 'summary'))
         lines.append("")
 
         # Performance Overview
         perf = results['performance']
         lines.append("📈 PERFORMANCE OVERVIEW")
         lines.append("-" * 80)
-        lines.append(f"Time-Weighted Return:  {perf['twr']*100:>15.2f}%")
-        lines.append(f"Sharpe Ratio:          {perf['sharpe_ratio']:>15.2f}")
-        lines.append(f"Sortino Ratio:         {perf['sortino_ratio']:>15.2f}")
-        lines.append(f"Max Drawdown:          {perf['max_drawdown']*100:>15.2f}%")
-        lines.append(f"Volatility (Ann.):     {perf['volatility']*100:>15.2f}%")
+        if perf:
+            lines.append(f"Time-Weighted Return:  {perf.twr_total*100:>15.2f}%")
+            lines.append(f"Sharpe Ratio:          {perf.sharpe_ratio:>15.2f}")
+            lines.append(f"Sortino Ratio:         {perf.sortino_ratio:>15.2f}")
+            lines.append(f"Max Drawdown:          {perf.max_drawdown*100:>15.2f}%")
+            lines.append(f"Volatility (Ann.):     {perf.volatility_annual*100:>15.2f}%")
+        else:
+            lines.append(self._unavailable(results, 'performance'))
         lines.append("")
 
         # Benchmark Comparison
         bench = results['benchmark_spy']
         lines.append("📊 BENCHMARK COMPARISON (vs S&P 500)")
         lines.append("-" * 80)
-        lines.append(f"Portfolio Return:      {bench['portfolio_return']*100:>15.2f}%")
-        lines.append(f"S&P 500 Return:        {bench['benchmark_return']*100:>15.2f}%")
-        lines.append(f"Excess Return:         {bench['excess_return']*100:>15.2f}%")
-        lines.append(f"Alpha:                 {bench['alpha']*100:>15.2f}%")
-        lines.append(f"Beta:                  {bench['beta']:>15.2f}")
-        lines.append(f"Information Ratio:     {bench['information_ratio']:>15.2f}")
+        if results.get('section_status', {}).get('benchmark', 'ok') != 'ok':
+            lines.append(self._unavailable(results, 'benchmark'))
+        elif bench:
+            lines.append(f"Portfolio Return:      {bench.portfolio_return*100:>15.2f}%")
+            lines.append(f"S&P 500 Return:        {bench.benchmark_return*100:>15.2f}%")
+            lines.append(f"Excess Return:         {bench.excess_return*100:>15.2f}%")
+            lines.append(f"Alpha:                 {bench.alpha*100:>15.2f}%")
+            lines.append(f"Beta:                  {bench.beta:>15.2f}")
+            lines.append(f"Information Ratio:     {bench.information_ratio:>15.2f}")
+        else:
+            lines.append("Insufficient price history for benchmark comparison.")
         lines.append("")
 
         # Risk Metrics
         var = results['var_analysis']
         lines.append("⚠️  RISK METRICS")
         lines.append("-" * 80)
-        lines.append(f"VaR (95%, 1-day):      ${var['var_95_amount']:>15,.2f} ({var['var_95_pct']*100:.2f}%)")
-        lines.append(f"CVaR (95%, 1-day):     ${var['cvar_95_amount']:>15,.2f} ({var['cvar_95_pct']*100:.2f}%)")
-        lines.append(f"VaR (99%, 1-day):      ${var['var_99_amount']:>15,.2f} ({var['var_99_pct']*100:.2f}%)")
+        if results.get('section_status', {}).get('risk', 'ok') != 'ok':
+            lines.append(self._unavailable(results, 'risk'))
+        elif var:
+            lines.append(f"VaR (95%, 1-day):      ${var['var_95_amount']:>15,.2f} ({var['var_95_pct']*100:.2f}%)")
+            lines.append(f"CVaR (95%, 1-day):     ${var['cvar_95_amount']:>15,.2f} ({var['cvar_95_pct']*100:.2f}%)")
+            lines.append(f"VaR (99%, 1-day):      ${var['var_99_amount']:>15,.2f} ({var['var_99_pct']*100:.2f}%)")
+        else:
+            lines.append("Insufficient price history for VaR.")
         lines.append("")
 
         # Risk Warnings
@@ -198,7 +469,7 @@ class PortfolioCopilot:
             lines.append("🚨 RISK WARNINGS")
             lines.append("-" * 80)
             for warning in warnings:
-                lines.append(f"  {warning}")
+                lines.append(f"  [{warning.level}] {warning.message}")
             lines.append("")
 
         # Tax Optimization
@@ -206,15 +477,15 @@ class PortfolioCopilot:
         lines.append("💰 TAX OPTIMIZATION OPPORTUNITIES")
         lines.append("-" * 80)
         if tax_opps:
-            total_savings = sum(opp['tax_savings'] for opp in tax_opps)
+            total_savings = sum(opp.tax_savings for opp in tax_opps)
             lines.append(f"Total Potential Savings: ${total_savings:,.2f}")
             lines.append("")
             lines.append(f"{'Ticker':<10} {'Loss':<15} {'Tax Savings':<15} {'Replacements'}")
             lines.append("-" * 80)
             for opp in tax_opps[:5]:
-                replacements = ', '.join(opp['replacement_stocks'][:3])
+                replacements = ', '.join(opp.replacement_stocks[:3])
                 lines.append(
-                    f"{opp['ticker']:<10} ${opp['current_loss']:>13,.0f} ${opp['tax_savings']:>13,.0f} {replacements}"
+                    f"{opp.ticker:<10} ${opp.unrealized_loss:>13,.0f} ${opp.tax_savings:>13,.0f} {replacements}"
                 )
         else:
             lines.append("No tax-loss harvesting opportunities found.")
@@ -237,7 +508,9 @@ class PortfolioCopilot:
         rebal = results['rebalancing']
         lines.append("🔄 REBALANCING RECOMMENDATIONS")
         lines.append("-" * 80)
-        if rebal.needs_rebalancing:
+        if rebal is None:
+            lines.append(self._unavailable(results, 'rebalancing'))
+        elif rebal.needs_rebalancing:
             lines.append(f"Status: ⚠️  REBALANCING RECOMMENDED (Max drift: {rebal.max_drift*100:.1f}%)")
             lines.append(f"Recommended Trades: {len(rebal.recommended_trades)}")
             lines.append(f"Tax Impact: ${rebal.total_tax_impact:,.2f}")
@@ -254,11 +527,11 @@ class PortfolioCopilot:
 
         # Tax harvesting
         if tax_opps:
-            lines.append(f"{action_count}. Consider tax-loss harvesting for ${sum(o['tax_savings'] for o in tax_opps):,.0f} in savings")
+            lines.append(f"{action_count}. Consider tax-loss harvesting for ${sum(o.tax_savings for o in tax_opps):,.0f} in savings")
             action_count += 1
 
         # Rebalancing
-        if rebal.needs_rebalancing:
+        if rebal is not None and rebal.needs_rebalancing:
             lines.append(f"{action_count}. Review {len(rebal.recommended_trades)} rebalancing trades")
             action_count += 1
 
@@ -268,7 +541,7 @@ class PortfolioCopilot:
             action_count += 1
 
         # Performance
-        if bench['excess_return'] < 0:
+        if bench and bench.excess_return < 0:
             lines.append(f"{action_count}. Portfolio underperforming S&P 500 - review holdings")
             action_count += 1
 
@@ -277,6 +550,13 @@ class PortfolioCopilot:
 
         lines.append("")
         lines.append("=" * 80)
+        if results.get('timings'):
+            lines.append(self.format_timing_report(
+                results['timings'],
+                results.get('market_data'),
+                results.get('section_status'),
+                results.get('wall_seconds')
+            ))
         lines.append("📝 For detailed analysis, use individual modules:")
         lines.append("   - scorecard.py <ticker>        : Stock fundamental analysis")
         lines.append("   - tax_loss_harvester.py <id>  : Tax optimization details")
@@ -291,6 +571,21 @@ class PortfolioCopilot:
         """Generate and save HTML report."""
         # This would create a comprehensive HTML dashboard
         # For now, we'll create a simplified version
+        bench = results['benchmark_spy']
+        excess_return = bench.excess_return if bench else 0.0
+        var = results['var_analysis'] or {}
+
+        # Missing sections render as zeros under a partial-report notice
+        summary = results['summary'] or {
+            'total_value': 0.0, 'unrealized_pnl': 0.0, 'unrealized_pnl_pct': 0.0, 'num_holdings': 0
+        }
+        perf = results['performance'] or PerformanceMetrics(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        rebal = results['rebalancing']
+        missing = [name for name, status in results.get('section_status', {}).items() if status != 'ok']
+        notice = (
+            f"""<div class="card warning">⚠️ Partial report: {', '.join(missing)} unavailable</div>"""
+            if missing else ""
+        )
 
         html = f"""<!DOCTYPE html>
 <html>
@@ -356,21 +651,23 @@ class PortfolioCopilot:
         <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
     </div>
 
+    {notice}
+
     <div class="card">
         <h2>📊 Portfolio Overview</h2>
         <div class="metric">
             <div class="metric-label">Total Value</div>
-            <div class="metric-value">${results['summary']['total_value']:,.2f}</div>
+            <div class="metric-value">${summary['total_value']:,.2f}</div>
         </div>
         <div class="metric">
             <div class="metric-label">Unrealized P&L</div>
-            <div class="metric-value {'positive' if results['summary']['unrealized_pnl'] > 0 else 'negative'}">
-                ${results['summary']['unrealized_pnl']:,.2f} ({results['summary']['unrealized_pnl_pct']:+.2f}%)
+            <div class="metric-value {'positive' if summary['unrealized_pnl'] > 0 else 'negative'}">
+                ${summary['unrealized_pnl']:,.2f} ({summary['unrealized_pnl_pct']:+.2f}%)
             </div>
         </div>
         <div class="metric">
             <div class="metric-label">Holdings</div>
-            <div class="metric-value">{results['summary']['num_holdings']}</div>
+            <div class="metric-value">{summary['num_holdings']}</div>
         </div>
     </div>
 
@@ -378,21 +675,21 @@ class PortfolioCopilot:
         <h2>📈 Performance Metrics</h2>
         <div class="metric">
             <div class="metric-label">Time-Weighted Return</div>
-            <div class="metric-value">{results['performance']['twr']*100:.2f}%</div>
+            <div class="metric-value">{perf.twr_total*100:.2f}%</div>
         </div>
         <div class="metric">
             <div class="metric-label">vs S&P 500</div>
-            <div class="metric-value {'positive' if results['benchmark_spy']['excess_return'] > 0 else 'negative'}">
-                {results['benchmark_spy']['excess_return']*100:+.2f}%
+            <div class="metric-value {'positive' if excess_return > 0 else 'negative'}">
+                {excess_return*100:+.2f}%
             </div>
         </div>
         <div class="metric">
             <div class="metric-label">Sharpe Ratio</div>
-            <div class="metric-value">{results['performance']['sharpe_ratio']:.2f}</div>
+            <div class="metric-value">{perf.sharpe_ratio:.2f}</div>
         </div>
         <div class="metric">
             <div class="metric-label">Max Drawdown</div>
-            <div class="metric-value negative">{results['performance']['max_drawdown']*100:.2f}%</div>
+            <div class="metric-value negative">{perf.max_drawdown*100:.2f}%</div>
         </div>
     </div>
 
@@ -400,23 +697,23 @@ class PortfolioCopilot:
         <h2>⚠️ Risk Metrics</h2>
         <div class="metric">
             <div class="metric-label">VaR (95%, 1-day)</div>
-            <div class="metric-value warning">${results['var_analysis']['var_95_amount']:,.2f}</div>
+            <div class="metric-value warning">${var.get('var_95_amount', 0.0):,.2f}</div>
         </div>
         <div class="metric">
             <div class="metric-label">CVaR (95%, 1-day)</div>
-            <div class="metric-value warning">${results['var_analysis']['cvar_95_amount']:,.2f}</div>
+            <div class="metric-value warning">${var.get('cvar_95_amount', 0.0):,.2f}</div>
         </div>
     </div>
 
     <div class="card">
         <h2>💰 Tax Optimization</h2>
-        {"<p>Potential savings: $" + f"{sum(o['tax_savings'] for o in results['tax_harvesting']):,.2f}" + "</p>" if results['tax_harvesting'] else "<p>No tax-loss harvesting opportunities found.</p>"}
+        {"<p>Potential savings: $" + f"{sum(o.tax_savings for o in results['tax_harvesting']):,.2f}" + "</p>" if results['tax_harvesting'] else "<p>No tax-loss harvesting opportunities found.</p>"}
     </div>
 
     <div class="card">
         <h2>🔄 Rebalancing</h2>
-        <p>Status: {"⚠️ Rebalancing recommended" if results['rebalancing'].needs_rebalancing else "✅ Portfolio is balanced"}</p>
-        {f"<p>Max drift: {results['rebalancing'].max_drift*100:.1f}%</p>"}
+        <p>Status: {"Unavailable" if rebal is None else "⚠️ Rebalancing recommended" if rebal.needs_rebalancing else "✅ Portfolio is balanced"}</p>
+        {f"<p>Max drift: {rebal.max_drift*100:.1f}%</p>" if rebal is not None else ""}
     </div>
 
 </body>
@@ -445,14 +742,22 @@ def main():
     parser.add_argument('portfolio_id', type=int, help='Portfolio ID to analyze')
     parser.add_argument('--html', action='store_true', help='Generate HTML report')
     parser.add_argument('--output', type=str, help='Output path for HTML report')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Run analysis sections one by one instead of concurrently')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='Timeout in seconds applied to every section (default: per-section defaults)')
 
     args = parser.parse_args()
 
     copilot = PortfolioCopilot(args.portfolio_id)
 
+    timeouts = None
+    if args.timeout is not None:
+        timeouts = {name: args.timeout for name in DEFAULT_SECTION_TIMEOUTS}
+
     try:
         # Run analysis
-        results = copilot.run_comprehensive_analysis()
+        results = copilot.run_comprehensive_analysis(concurrent=not args.sequential, timeouts=timeouts)
 
         # Generate text report
         report = copilot.generate_text_report(results)
@@ -23,9 +23,9 @@ from datetime import datetime, timedelta, date
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
-import yfinance as yf
 from sqlalchemy import and_, func
 from database import get_database, Holding, Transaction, PortfolioSnapshot
+from market_data_context import get_history
 
 
 class BenchmarkComparison:
@@ -97,6 +97,7 @@ class BenchmarkAnalyzer:
         """Initialize benchmark analyzer."""
         self.db = get_database(db_path)
         self.session = self.db.get_session()
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
 
     def get_portfolio_returns(
         self, portfolio_id: int, start_date: date, end_date: date, frequency: str = "D"
@@ -126,8 +127,7 @@ class BenchmarkAnalyzer:
 
         for holding in holdings:
             try:
-                stock = yf.Ticker(holding.ticker)
-                hist = stock.history(start=start_date, end=end_date, interval="1d")
+                hist = get_history(holding.ticker, start_date, end_date, self.market_data)
 
                 if not hist.empty:
                     # Calculate daily returns
@@ -158,8 +158,7 @@ class BenchmarkAnalyzer:
             Pandas Series of returns indexed by date
         """
         try:
-            bench = yf.Ticker(benchmark)
-            hist = bench.history(start=start_date, end=end_date, interval="1d")
+            hist = get_history(benchmark, start_date, end_date, self.market_data)
 
             if hist.empty:
                 print(f"⚠️  No data for benchmark {benchmark}")
@@ -7,15 +7,273 @@ Supports:
 - pykrx (primary for Korean stocks)
 
 Auto-detects market (US vs KR) based on ticker format and provides seamless fallback.
+
+Managers share a process-wide read-through cache per database (in-memory LRU backed
+by that database's DataCache table), so a ticker is fetched once per TTL across
+modules and runs.
 """
 
+import os
 import re
 import json
+import copy
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
 
+# Cache lifetime per data kind (seconds)
+DEFAULT_CACHE_TTLS = {
+    'stock_info': 15 * 60,            # Quotes and ratios
+    'historical_prices': 60 * 60,     # Daily bars change once per session
+    'financials': 24 * 60 * 60,       # Statements change quarterly
+}
+DEFAULT_MEMORY_CACHE_SIZE = 512
+
+
+def _encode_cache_value(value: Any) -> Any:
+    """Make a fetched payload JSON-safe (Timestamp keys/values, numpy scalars) for DataCache."""
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            return {k: _encode_cache_value(v) for k, v in value.items()}
+        return {'__items__': [[_encode_cache_value(k), _encode_cache_value(v)] for k, v in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_encode_cache_value(v) for v in value]
+    if isinstance(value, datetime):
+        return {'__timestamp__': pd.Timestamp(value).isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _decode_cache_value(value: Any) -> Any:
+    """Inverse of _encode_cache_value."""
+    if isinstance(value, dict):
+        if '__timestamp__' in value:
+            return pd.Timestamp(value['__timestamp__'])
+        if '__items__' in value:
+            return {_decode_cache_value(k): _decode_cache_value(v) for k, v in value['__items__']}
+        return {k: _decode_cache_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode_cache_value(v) for v in value]
+    return value
+
+
+class ReadThroughCache:
+    """
+    Two-tier read-through cache for data source responses.
+
+    Lookup order: in-memory LRU → DataCache table (SQLite) → fetch. Successful
+    responses are written to both tiers with a per-kind TTL; responses with an
+    'error' key are never cached. Concurrent requests for the same key wait for
+    a single fetch.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = DEFAULT_MEMORY_CACHE_SIZE, persist: bool = True):
+        """
+        Initialize cache.
+
+        Args:
+            db_path: SQLite database holding the DataCache table (default: portfolio.db)
+            ttls: Overrides for DEFAULT_CACHE_TTLS (seconds, 0 disables caching for a kind)
+            max_entries: In-memory LRU capacity
+            persist: Use the DataCache table as second tier
+        """
+        self.db_path = db_path
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.persist = persist
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._db = None
+
+    def _database(self):
+        """Lazily open the DataCache database; disables the disk tier on failure."""
+        if self._db is None and self.persist:
+            try:
+                from database import get_database
+                self._db = get_database(self.db_path)
+            except Exception as e:
+                print(f"⚠️  DataCache unavailable, using memory cache only: {e}")
+                self.persist = False
+        return self._db
+
+    def get_or_fetch(self, kind: str, key: str, fetch: Callable[[], Dict]) -> Dict:
+        """
+        Return the cached response for kind:key, calling fetch() on a miss.
+
+        Args:
+            kind: Data kind (key of DEFAULT_CACHE_TTLS)
+            key: Kind-specific key, e.g. ticker or 'AAPL:1y:1d'
+            fetch: Callable producing the response dict
+
+        Returns:
+            Response dict (a deep copy, safe to mutate)
+        """
+        ttl = self.ttls.get(kind, 0)
+        if ttl <= 0:
+            return fetch()
+
+        cache_key = f"{kind}:{key}"
+        with self._lock:
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
+
+        with key_lock:
+            value = self._memory_get(cache_key)
+            if value is not None:
+                self._count('memory_hits')
+                return copy.deepcopy(value)
+
+            value, expires_at = self._disk_get(cache_key)
+            if value is not None:
+                self._count('disk_hits')
+                self._memory_put(cache_key, value, expires_at)
+                return copy.deepcopy(value)
+
+            self._count('misses')
+            value = fetch()
+            if isinstance(value, dict) and 'error' not in value:
+                expires_at = time.time() + ttl
+                self._memory_put(cache_key, value, expires_at)
+                self._disk_put(cache_key, value, value.get('source'), expires_at)
+                return copy.deepcopy(value)
+            return value
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _memory_get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+
+    def _memory_put(self, key: str, value: Dict, expires_at: float):
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str):
+        db = self._database()
+        if db is None:
+            return None, None
+
+        from database import DataCache
+        session = db.get_session()
+        try:
+            row = session.get(DataCache, key)
+            if row is None or row.expires_at is None or row.expires_at <= datetime.utcnow():
+                return None, None
+            expires_at = time.time() + (row.expires_at - datetime.utcnow()).total_seconds()
+            return _decode_cache_value(json.loads(row.value)), expires_at
+        except Exception as e:
+            print(f"⚠️  DataCache read failed for {key}: {e}")
+            return None, None
+        finally:
+            session.close()
+
+    def _disk_put(self, key: str, value: Dict, source: Optional[str], expires_at: float):
+        db = self._database()
+        if db is None:
+            return
+
+        from database import DataCache
+        session = db.get_session()
+        try:
+            now = datetime.utcnow()
+            session.merge(DataCache(
+                key=key,
+                value=json.dumps(_encode_cache_value(value)),
+                source=source,
+                fetched_at=now,
+                expires_at=now + timedelta(seconds=expires_at - time.time())
+            ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"⚠️  DataCache write failed for {key}: {e}")
+        finally:
+            session.close()
+
+    def clear(self, persistent: bool = False):
+        """Drop the in-memory tier (and the DataCache rows if persistent=True)."""
+        with self._lock:
+            self._memory.clear()
+        if persistent and self._database() is not None:
+            from database import DataCache
+            session = self._db.get_session()
+            try:
+                session.query(DataCache).delete()
+                session.commit()
+            finally:
+                session.close()
+
+    def summary(self) -> str:
+        """One-line hit/miss summary."""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        rate = hits / total * 100 if total else 0.0
+        return (f"cache: {hits}/{total} hits ({rate:.0f}%) — "
+                f"memory {self.stats['memory_hits']}, disk {self.stats['disk_hits']}, "
+                f"fetched {self.stats['misses']}")
+
+
+_shared_caches: Dict[Optional[str], ReadThroughCache] = {}
+_shared_cache_lock = threading.Lock()
+
+
+def _cache_db_key(db_path: Optional[str]) -> Optional[str]:
+    """Registry key for a database path (None = default portfolio.db)."""
+    return os.path.abspath(db_path) if db_path else None
+
+
+def get_shared_cache(db_path: Optional[str] = None) -> ReadThroughCache:
+    """
+    Process-wide cache for one database, used by DataSourceManager by default.
+
+    Args:
+        db_path: Database holding the DataCache table (default: portfolio.db)
+    """
+    key = _cache_db_key(db_path)
+    with _shared_cache_lock:
+        if key not in _shared_caches:
+            _shared_caches[key] = ReadThroughCache(db_path=db_path)
+        return _shared_caches[key]
+
+
+def configure_cache(**kwargs) -> ReadThroughCache:
+    """
+    Replace the shared cache for a database (e.g. to change TTLs or go memory-only).
+
+    Args:
+        **kwargs: ReadThroughCache arguments (db_path, ttls, max_entries, persist)
+
+    Returns:
+        The new shared cache for kwargs['db_path'] (default database if omitted)
+    """
+    key = _cache_db_key(kwargs.get('db_path'))
+    with _shared_cache_lock:
+        _shared_caches[key] = ReadThroughCache(**kwargs)
+        return _shared_caches[key]
+
+
 class DataSourceManager:
     """
     Unified data source manager with automatic market detection and fallback logic.
@@ -26,15 +284,18 @@ class DataSourceManager:
     - Global indices/FX: yfinance
     """
 
-    def __init__(self, mcp_available=False):
+    def __init__(self, mcp_available=False, cache: Optional[ReadThroughCache] = None,
+                 db_path: Optional[str] = None):
         """
         Initialize data source manager.
 
         Args:
             mcp_available: Whether UsStockInfo MCP is available in current session
+            cache: Read-through cache (default: shared cache for db_path)
+            db_path: Database whose DataCache table backs the shared cache
         """
         self.mcp_available = mcp_available
-        self.cache = {}  # In-memory cache for session
+        self.cache = cache if cache is not None else get_shared_cache(db_path)
 
     def detect_market(self, ticker: str) -> str:
         """
@@ -77,11 +338,9 @@ class DataSourceManager:
             - ... and more
         """
         market = self.detect_market(ticker)
+        fetch = self._get_us_stock_info if market == 'US' else self._get_kr_stock_info
 
-        if market == 'US':
-            return self._get_us_stock_info(ticker)
-        elif market == 'KR':
-            return self._get_kr_stock_info(ticker)
+        return self.cache.get_or_fetch('stock_info', ticker, lambda: fetch(ticker))
 
     def get_historical_prices(self, ticker: str, period: str = '1y', interval: str = '1d') -> Dict:
         """
@@ -96,11 +355,12 @@ class DataSourceManager:
             Dictionary with OHLCV data
         """
         market = self.detect_market(ticker)
-
         if market == 'US':
-            return self._get_us_historical(ticker, period, interval)
-        elif market == 'KR':
-            return self._get_kr_historical(ticker, period)
+            fetch = lambda: self._get_us_historical(ticker, period, interval)
+        else:
+            fetch = lambda: self._get_kr_historical(ticker, period)
+
+        return self.cache.get_or_fetch('historical_prices', f"{ticker}:{period}:{interval}", fetch)
 
     def get_financials(self, ticker: str) -> Dict:
         """
@@ -113,11 +373,9 @@ class DataSourceManager:
             Dictionary with quarterly and annual financials
         """
         market = self.detect_market(ticker)
+        fetch = self._get_us_financials if market == 'US' else self._get_kr_financials
 
-        if market == 'US':
-            return self._get_us_financials(ticker)
-        elif market == 'KR':
-            return self._get_kr_financials(ticker)
+        return self.cache.get_or_fetch('financials', ticker, lambda: fetch(ticker))
 
     # ===== US Stock Methods =====
 
@@ -312,23 +570,24 @@ class DataSourceManager:
 
 
 # Convenience functions
-def get_data_source_manager(mcp_available=False) -> DataSourceManager:
-    """Get a DataSourceManager instance."""
-    return DataSourceManager(mcp_available=mcp_available)
+def get_data_source_manager(mcp_available=False, db_path: Optional[str] = None) -> DataSourceManager:
+    """Get a DataSourceManager instance (cache backed by db_path's DataCache table)."""
+    return DataSourceManager(mcp_available=mcp_available, db_path=db_path)
 
 
-def get_stock_data(ticker: str, market: str = None) -> Dict:
+def get_stock_data(ticker: str, market: str = None, db_path: Optional[str] = None) -> Dict:
     """
     Simple convenience function to get stock data.
 
     Args:
         ticker: Stock ticker symbol
         market: Market hint ('US' or 'KR'), auto-detected if not provided
+        db_path: Database for the response cache (default: portfolio.db)
 
     Returns:
         Dictionary with stock info including 'current_price', 'pe_ratio', 'sector', etc.
     """
-    dsm = get_data_source_manager()
+    dsm = get_data_source_manager(db_path=db_path)
     info = dsm.get_stock_info(ticker)
 
     if 'error' in info:
@@ -373,4 +632,5 @@ if __name__ == "__main__":
         print(f"❌ Error: {samsung_info['error']}")
 
     print()
+    print(f"📦 {dsm.cache.summary()}")
     print("✅ DataSourceManager test complete!")
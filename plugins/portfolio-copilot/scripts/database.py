@@ -191,6 +191,8 @@ class Database:
     """Database manager for Portfolio Copilot."""
 
     def __init__(self, db_path=None):
+        self.db_path = db_path  # As requested (None = default), keys the data_fetcher cache
+
         if db_path is None:
             # Default to plugins/investment-analyzer/data/portfolio.db
             db_dir = os.path.join(os.path.dirname(__file__), "..", "data")
@@ -23,7 +23,7 @@ from sqlalchemy import and_, func, desc
 from sqlalchemy.orm import Session
 import yfinance as yf
 from database import get_database, Holding, Transaction, DividendCalendar
-from data_fetcher import get_stock_data
+from market_data_context import get_quote
 
 
 class DividendSummary:
@@ -63,6 +63,7 @@ class DividendTracker:
         """Initialize dividend tracker with database connection."""
         self.db = get_database(db_path)
         self.session = self.db.get_session()
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
 
     def get_annual_dividend_income(self, portfolio_id: int, year: int) -> Dict:
         """
@@ -139,7 +140,7 @@ class DividendTracker:
 
         for holding in holdings:
             # Get current price
-            stock_data = get_stock_data(holding.ticker, holding.market)
+            stock_data = get_quote(holding.ticker, holding.market, self.market_data, self.db.db_path)
             if not stock_data or "current_price" not in stock_data:
                 continue
 
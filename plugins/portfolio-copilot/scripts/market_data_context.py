@@ -0,0 +1,279 @@
+"""
+Market Data Context for Portfolio Copilot.
+
+Per-run market data shared by the analysis modules, so a comprehensive analysis
+downloads each holding once instead of once per analyzer.
+
+Key Features:
+- Date x ticker price panel from one bulk yf.download (holdings + benchmarks)
+- Quote snapshot (get_stock_data) taken once per holding
+- history() slices match yf.Ticker(...).history(start, end) rows (end exclusive)
+- Requests outside the panel fall back to a single per-ticker download
+
+Usage:
+    context = MarketDataContext.for_holdings(holdings, benchmarks=['SPY']).load()
+    risk_calculator.market_data = context
+
+Analyzers read through get_history() / get_quote(), which use the context when
+one is attached and fall back to live yfinance / data_fetcher calls otherwise.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, date
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import yfinance as yf
+from data_fetcher import get_stock_data
+
+# Longest lookback used by the analyzers (risk: 252 trading days * 1.5 calendar buffer)
+DEFAULT_LOOKBACK_DAYS = 400
+
+# Concurrent quote lookups while taking the snapshot
+DEFAULT_QUOTE_WORKERS = 8
+
+
+def _to_day(value) -> pd.Timestamp:
+    """Normalize date/datetime/str to a tz-naive midnight Timestamp."""
+    ts = pd.Timestamp(value)
+    if ts.tz is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize()
+
+
+def _naive_index(frame: pd.DataFrame) -> pd.DataFrame:
+    """Drop the exchange timezone so frames from different markets align by date."""
+    if isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is not None:
+        frame = frame.copy()
+        frame.index = frame.index.tz_localize(None)
+    return frame
+
+
+class MarketDataContext:
+    """
+    Price panel and quote snapshot for one analysis run.
+
+    Attributes:
+        tickers: Tickers in the panel (holdings first, then benchmarks)
+        start_date: First day covered by the panel (inclusive)
+        end_date: Panel end (exclusive, like yfinance)
+        timings: Seconds spent loading {'price_panel': s, 'quotes': s}
+        stats: {'panel_hits', 'fallback_downloads', 'quote_hits', 'quote_fetches'}
+    """
+
+    def __init__(
+        self,
+        tickers: List[str],
+        start_date: date,
+        end_date: date,
+        markets: Optional[Dict[str, str]] = None,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize market data context (nothing is downloaded until load()).
+
+        Args:
+            tickers: Tickers to load
+            start_date: Panel start (inclusive)
+            end_date: Panel end (exclusive)
+            markets: {ticker: 'US' | 'KR'} for quote lookups
+            db_path: Database whose response cache quote lookups use
+        """
+        self.tickers = list(dict.fromkeys(tickers))
+        self.start_date = _to_day(start_date)
+        self.end_date = _to_day(end_date)
+        self.markets = markets or {}
+        self.db_path = db_path
+
+        self.timings: Dict[str, float] = {}
+        self.stats = {"panel_hits": 0, "fallback_downloads": 0, "quote_hits": 0, "quote_fetches": 0}
+
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._fallback: Dict[Tuple[str, pd.Timestamp, pd.Timestamp], pd.DataFrame] = {}
+        self._quotes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_holdings(
+        cls,
+        holdings: List,
+        benchmarks: Optional[List[str]] = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+        end_date: Optional[date] = None,
+        db_path: Optional[str] = None,
+    ) -> "MarketDataContext":
+        """
+        Build a context covering every holding plus benchmark tickers.
+
+        Args:
+            holdings: Holding rows (ticker, market)
+            benchmarks: Extra tickers for the panel (e.g. ['SPY'])
+            lookback_days: Calendar days of history before end_date
+            end_date: Panel end, exclusive (default: today)
+            db_path: Database whose response cache quote lookups use
+
+        Returns:
+            MarketDataContext (call load() before use)
+        """
+        if end_date is None:
+            end_date = datetime.now().date()
+
+        markets = {h.ticker: h.market for h in holdings}
+        tickers = list(markets) + list(benchmarks or [])
+
+        return cls(tickers, end_date - timedelta(days=lookback_days), end_date, markets=markets, db_path=db_path)
+
+    def load(self, quote_workers: int = DEFAULT_QUOTE_WORKERS) -> "MarketDataContext":
+        """
+        Download the price panel and the quote snapshot.
+
+        Args:
+            quote_workers: Threads for the per-holding quote lookups (1 = serial)
+        """
+        start = time.perf_counter()
+        self._load_prices()
+        self.timings["price_panel"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        items = list(self.markets.items())
+        if items:
+            with ThreadPoolExecutor(max_workers=max(1, min(quote_workers, len(items)))) as executor:
+                quotes = executor.map(lambda item: get_stock_data(*item, db_path=self.db_path), items)
+                self._quotes.update(zip(self.markets, quotes))
+        self.timings["quotes"] = time.perf_counter() - start
+
+        return self
+
+    def _load_prices(self):
+        """One yf.download for all tickers, split into per-ticker OHLCV frames."""
+        if not self.tickers:
+            return
+
+        try:
+            data = yf.download(
+                self.tickers,
+                start=self.start_date.date(),
+                end=self.end_date.date(),
+                interval="1d",
+                auto_adjust=True,
+                actions=True,
+                group_by="ticker",
+                progress=False,
+            )
+        except Exception as e:
+            print(f"⚠️  Bulk price download failed, falling back to per-ticker history: {e}")
+            return
+
+        if data is None or data.empty:
+            return
+
+        for ticker in self.tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                frame = data[ticker]
+            elif len(self.tickers) == 1:
+                frame = data
+            else:
+                continue
+
+            if "Close" not in frame.columns:
+                continue
+
+            # All-NaN columns (e.g. KR codes yfinance does not serve) stay out of the panel
+            frame = frame[frame["Close"].notna()]
+            if not frame.empty:
+                self._frames[ticker] = _naive_index(frame)
+
+    @property
+    def closes(self) -> pd.DataFrame:
+        """Date x ticker close panel (NaN where a ticker did not trade)."""
+        return pd.DataFrame({ticker: frame["Close"] for ticker, frame in self._frames.items()})
+
+    def covers(self, ticker: str, start_date, end_date) -> bool:
+        """True if history(ticker, start_date, end_date) is served from the panel."""
+        return (
+            ticker in self.tickers
+            and _to_day(start_date) >= self.start_date
+            and _to_day(end_date) <= self.end_date
+        )
+
+    def history(self, ticker: str, start_date, end_date) -> pd.DataFrame:
+        """
+        Daily OHLCV rows with start_date <= date < end_date.
+
+        Args:
+            ticker: Ticker symbol
+            start_date: First day (inclusive)
+            end_date: Last day (exclusive)
+
+        Returns:
+            DataFrame with yfinance history columns and a tz-naive date index
+            (empty if the ticker has no data)
+        """
+        start, end = _to_day(start_date), _to_day(end_date)
+
+        if self.covers(ticker, start, end):
+            with self._lock:
+                self.stats["panel_hits"] += 1
+            frame = self._frames.get(ticker)
+            if frame is None:
+                return pd.DataFrame()
+            return frame[(frame.index >= start) & (frame.index < end)]
+
+        key = (ticker, start, end)
+        with self._lock:
+            cached = self._fallback.get(key)
+        if cached is not None:
+            return cached
+
+        hist = yf.Ticker(ticker).history(start=start.date(), end=end.date(), interval="1d")
+        hist = _naive_index(hist)
+        with self._lock:
+            self.stats["fallback_downloads"] += 1
+            self._fallback[key] = hist
+        return hist
+
+    def quote(self, ticker: str, market: Optional[str] = None) -> Dict:
+        """
+        Quote snapshot for ticker (same shape as data_fetcher.get_stock_data).
+
+        Tickers outside the snapshot are fetched once and added to it.
+        """
+        with self._lock:
+            quote = self._quotes.get(ticker)
+            if quote is not None:
+                self.stats["quote_hits"] += 1
+                return dict(quote)
+
+        quote = get_stock_data(ticker, market or self.markets.get(ticker), db_path=self.db_path)
+        with self._lock:
+            self.stats["quote_fetches"] += 1
+            self._quotes[ticker] = quote
+        return dict(quote)
+
+    def summary(self) -> str:
+        """One-line load/usage summary."""
+        return (
+            f"{len(self._frames)}/{len(self.tickers)} tickers in panel "
+            f"({self.start_date.date()} ~ {self.end_date.date()}), "
+            f"{self.stats['panel_hits']} panel reads, {self.stats['fallback_downloads']} fallback downloads, "
+            f"{self.stats['quote_hits']} quote reads, {self.stats['quote_fetches']} quote fetches"
+        )
+
+
+def get_history(ticker: str, start_date, end_date, context: Optional[MarketDataContext] = None) -> pd.DataFrame:
+    """Daily history from the run context if attached, else yfinance."""
+    if context is not None:
+        return context.history(ticker, start_date, end_date)
+    return yf.Ticker(ticker).history(start=start_date, end=end_date, interval="1d")
+
+
+def get_quote(
+    ticker: str, market: str = None, context: Optional[MarketDataContext] = None, db_path: Optional[str] = None
+) -> Dict:
+    """Current quote from the run context if attached, else data_fetcher (cached in db_path)."""
+    if context is not None:
+        return context.quote(ticker, market)
+    return get_stock_data(ticker, market, db_path=db_path)
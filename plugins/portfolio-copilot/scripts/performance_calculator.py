@@ -10,6 +10,7 @@ Key Features:
 - Maximum drawdown analysis
 - Rolling returns and volatility
 - Risk-adjusted performance metrics
+- Reads the local daily PortfolioSnapshot series (appends missing days first)
 
 TWR vs MWR:
 - TWR: Measures investment skill (removes cash flow timing)
@@ -20,10 +21,9 @@ from datetime import datetime, timedelta, date
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
-import yfinance as yf
 from sqlalchemy import and_, func, desc
 from database import get_database, Holding, Transaction, PortfolioSnapshot
-from data_fetcher import get_stock_data
+from portfolio_snapshots import PortfolioSnapshotJob
 
 
 class PerformanceMetrics:
@@ -70,6 +70,33 @@ class PerformanceCalculator:
         """Initialize performance calculator."""
         self.db = get_database(db_path)
         self.session = self.db.get_session()
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
+        self.snapshots = PortfolioSnapshotJob(db_path)
+
+    def get_daily_series(self, portfolio_id: int, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Daily portfolio values and flow-adjusted returns from PortfolioSnapshot.
+
+        Missing days are appended to the snapshot table first (one price
+        download for the new days only), then the local series is read.
+
+        Args:
+            portfolio_id: Portfolio ID
+            start_date: First day (inclusive)
+            end_date: Last day (exclusive)
+
+        Returns:
+            DataFrame indexed by date with 'value' and 'daily_return'
+        """
+        self.snapshots.market_data = self.market_data
+
+        try:
+            self.snapshots.update(portfolio_id, start_date, end_date)
+        except Exception as e:
+            self.snapshots.session.rollback()
+            print(f"⚠️  Could not update portfolio snapshots: {e}")
+
+        return self.snapshots.get_series(portfolio_id, start_date, end_date)
 
     def calculate_time_weighted_return(
         self, portfolio_id: int, start_date: date, end_date: date
@@ -80,91 +107,20 @@ class PerformanceCalculator:
         TWR removes the effect of cash flows, measuring pure investment performance.
 
         Algorithm:
-        1. Split period by cash flow events (transactions)
-        2. Calculate sub-period returns
-        3. Chain multiply: (1+r1) × (1+r2) × ... × (1+rn) - 1
+        1. Daily snapshot returns with each day's BUY/SELL cash flow removed
+        2. Chain multiply: (1+r1) × (1+r2) × ... × (1+rn) - 1
 
         Returns:
             (total_return, annualized_return)
         """
-        # Get all transactions in period
-        transactions = (
-            self.session.query(Transaction)
-            .join(Holding)
-            .filter(
-                and_(
-                    Holding.portfolio_id == portfolio_id,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
-                    Transaction.type.in_(["BUY", "SELL"]),
-                )
-            )
-            .order_by(Transaction.date)
-            .all()
-        )
-
-        # Get holdings
-        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
-
-        if not holdings:
-            return (0.0, 0.0)
-
-        # For simplicity, calculate using current holdings
-        # In production, would use PortfolioSnapshot for exact historical values
-
-        # Calculate daily returns
         try:
-            portfolio_values = self._get_daily_portfolio_values(holdings, start_date, end_date)
+            series = self.get_daily_series(portfolio_id, start_date, end_date)
 
-            if len(portfolio_values) < 2:
+            if len(series) < 2:
                 return (0.0, 0.0)
 
-            # Calculate sub-period returns at each transaction
-            sub_returns = []
-            transaction_dates = [t.date for t in transactions]
-
-            if not transaction_dates:
-                # No transactions, simple return calculation
-                start_value = portfolio_values.iloc[0]
-                end_value = portfolio_values.iloc[-1]
-
-                if start_value == 0:
-                    return (0.0, 0.0)
-
-                total_return = (end_value / start_value) - 1
-            else:
-                # Split by transaction dates
-                periods = []
-                prev_date = start_date
-
-                for txn_date in transaction_dates:
-                    if txn_date > prev_date:
-                        periods.append((prev_date, txn_date))
-                    prev_date = txn_date
-
-                # Last period
-                if prev_date < end_date:
-                    periods.append((prev_date, end_date))
-
-                # Calculate returns for each period
-                period_returns = []
-                for period_start, period_end in periods:
-                    # Convert dates to pandas Timestamp for timezone compatibility
-                    period_start_ts = pd.Timestamp(period_start)
-                    period_end_ts = pd.Timestamp(period_end)
-
-                    # Use loc with converted timestamps
-                    values_in_period = portfolio_values.loc[period_start_ts:period_end_ts]
-
-                    if len(values_in_period) >= 2:
-                        period_return = (values_in_period.iloc[-1] / values_in_period.iloc[0]) - 1
-                        period_returns.append(period_return)
-
-                # Chain multiply
-                if period_returns:
-                    total_return = np.prod([1 + r for r in period_returns]) - 1
-                else:
-                    total_return = 0.0
+            # First row's return is relative to the day before the period
+            total_return = np.prod(1 + series["daily_return"].iloc[1:].values) - 1
 
             # Annualize
             days = (end_date - start_date).days
@@ -180,39 +136,6 @@ class PerformanceCalculator:
             print(f"⚠️  Error calculating TWR: {e}")
             return (0.0, 0.0)
 
-    def _get_daily_portfolio_values(
-        self, holdings: List[Holding], start_date: date, end_date: date
-    ) -> pd.Series:
-        """Get daily portfolio values."""
-        # Simplified calculation using current holdings
-        # In production, would use historical snapshots
-
-        all_prices = {}
-
-        for holding in holdings:
-            try:
-                stock = yf.Ticker(holding.ticker)
-                hist = stock.history(start=start_date, end=end_date, interval="1d")
-
-                if not hist.empty:
-                    all_prices[holding.ticker] = hist["Close"] * holding.quantity
-
-            except Exception as e:
-                print(f"⚠️  Could not fetch history for {holding.ticker}: {e}")
-
-        if not all_prices:
-            return pd.Series()
-
-        # Sum across all holdings
-        prices_df = pd.DataFrame(all_prices)
-        portfolio_values = prices_df.sum(axis=1)
-
-        # Remove timezone info for easier date comparison
-        if portfolio_values.index.tz is not None:
-            portfolio_values.index = portfolio_values.index.tz_localize(None)
-
-        return portfolio_values
-
     def calculate_money_weighted_return(self, portfolio_id: int, start_date: date, end_date: date) -> float:
         """
         Calculate Money-Weighted Return (MWR) / Internal Rate of Return (IRR).
@@ -223,38 +146,28 @@ class PerformanceCalculator:
         Returns:
             Annualized MWR
         """
-        # Get current holdings
-        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
+        # Beginning / ending portfolio values from the snapshot series
+        series = self.get_daily_series(portfolio_id, start_date, end_date)
 
-        if not holdings:
+        if len(series) < 2:
             return 0.0
 
-        # Get beginning portfolio value (at start_date)
-        try:
-            beginning_value = 0.0
-            for holding in holdings:
-                stock = yf.Ticker(holding.ticker)
-                hist = stock.history(start=start_date, end=start_date + timedelta(days=5), interval="1d")
-                if not hist.empty:
-                    start_price = hist["Close"].iloc[0]
-                    beginning_value += start_price * holding.quantity
-
-            if beginning_value == 0:
-                return 0.0
+        first_date, last_date = series.index[0].date(), series.index[-1].date()
+        beginning_value = series["value"].iloc[0]
+        ending_value = series["value"].iloc[-1]
 
-        except Exception as e:
-            print(f"⚠️  Could not determine beginning value: {e}")
+        if beginning_value == 0:
             return 0.0
 
-        # Get all cash flows (transactions) during period
+        # Cash flows after the first snapshot (earlier ones are in beginning_value)
         transactions = (
             self.session.query(Transaction)
             .join(Holding)
             .filter(
                 and_(
                     Holding.portfolio_id == portfolio_id,
-                    Transaction.date >= start_date,
-                    Transaction.date <= end_date,
+                    Transaction.date > first_date,
+                    Transaction.date <= last_date,
                     Transaction.type.in_(["BUY", "SELL"]),
                 )
             )
@@ -265,7 +178,7 @@ class PerformanceCalculator:
         # Build cash flow array
         # Start with negative of beginning value (initial investment)
         cash_flows = [-beginning_value]
-        dates = [start_date]
+        dates = [first_date]
 
         for txn in transactions:
             amount = txn.quantity * txn.price
@@ -277,12 +190,8 @@ class PerformanceCalculator:
             dates.append(txn.date)
 
         # Add ending value (final inflow)
-        ending_value = sum(
-            [self._get_current_value(h.ticker, h.market) * h.quantity for h in holdings]
-        )
-
         cash_flows.append(ending_value)
-        dates.append(end_date)
+        dates.append(last_date)
 
         if len(cash_flows) < 2:
             return 0.0
@@ -290,7 +199,7 @@ class PerformanceCalculator:
         # Calculate IRR
         try:
             # Convert dates to years from start
-            days_from_start = [(d - start_date).days for d in dates]
+            days_from_start = [(d - first_date).days for d in dates]
             years_from_start = [d / 365.25 for d in days_from_start]
 
             # Use Newton's method to find IRR
@@ -307,11 +216,6 @@ class PerformanceCalculator:
             print(f"⚠️  Error calculating MWR: {e}")
             return 0.0
 
-    def _get_current_value(self, ticker: str, market: str) -> float:
-        """Get current stock price."""
-        data = get_stock_data(ticker, market)
-        return data.get("current_price", 0.0)
-
     def _calculate_irr(self, cash_flows: List[float], times: List[float], guess: float = 0.1) -> float:
         """Calculate IRR using Newton's method with improved stability."""
         max_iterations = 100
@@ -470,11 +374,10 @@ class PerformanceCalculator:
         # Calculate MWR
         mwr = self.calculate_money_weighted_return(portfolio_id, start_date, end_date)
 
-        # Get portfolio values and returns
-        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
-        portfolio_values = self._get_daily_portfolio_values(holdings, start_date, end_date)
+        # Daily flow-adjusted returns from the snapshot series
+        series = self.get_daily_series(portfolio_id, start_date, end_date)
 
-        if len(portfolio_values) < 2:
+        if len(series) < 2:
             # Not enough data
             return PerformanceMetrics(
                 twr_total=twr_total,
@@ -487,10 +390,13 @@ class PerformanceCalculator:
                 calmar_ratio=0.0,
             )
 
-        returns = portfolio_values.pct_change().dropna()
+        returns = series["daily_return"].iloc[1:]
+
+        # Growth of 1 unit (deposits/withdrawals don't count as gains or drawdowns)
+        growth = (1 + series["daily_return"].where(series.index > series.index[0], 0.0)).cumprod()
 
         # Calculate risk metrics
-        max_dd = self.calculate_maximum_drawdown(portfolio_values)
+        max_dd = self.calculate_maximum_drawdown(growth)
         volatility = self.calculate_volatility(returns)
 
         # Sharpe ratio
@@ -623,7 +529,8 @@ class PerformanceCalculator:
             return "Poor"
 
     def close(self):
-        """Close database session."""
+        """Close database sessions."""
+        self.snapshots.close()
         self.session.close()
 
 
@@ -34,8 +34,8 @@ class PortfolioManager:
         """
         self.db = get_database(db_path)
         self.session = self.db.get_session()
-        self.data_source = get_data_source_manager()
-        self.scorecard_generator = CompanyScorecardGenerator()
+        self.data_source = get_data_source_manager(db_path=db_path)
+        self.scorecard_generator = CompanyScorecardGenerator(db_path)
 
     def create_portfolio(self, name: str, base_currency: str = 'USD', target_allocation: Optional[Dict] = None) -> Portfolio:
         """
@@ -126,6 +126,16 @@ class PortfolioManager:
             total_cost = (existing.quantity * existing.avg_price) + (quantity * avg_price)
             existing.quantity += quantity
             existing.avg_price = total_cost / existing.quantity
+
+            # Record transaction
+            transaction = Transaction(
+                holding_id=existing.id,
+                type='BUY',
+                date=date.today(),
+                quantity=quantity,
+                price=avg_price
+            )
+            self.session.add(transaction)
             self.session.commit()
             return existing
         else:
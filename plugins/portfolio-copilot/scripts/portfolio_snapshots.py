@@ -0,0 +1,387 @@
+"""
+Portfolio Snapshot Job for Portfolio Copilot.
+
+Materializes daily portfolio valuations into the portfolio_snapshots table so
+performance analytics read a local time series instead of downloading price
+history on every call.
+
+Key Features:
+- Per-day quantities rebuilt from BUY/SELL transactions (not current quantities)
+- Incremental: only trading days missing from the table are priced and inserted
+- Rebuilds from the first stored day whose quantities no longer match the
+  holdings/transactions (backdated trades, removed holdings, edits)
+- Days missing a close for a held ticker are not stored, so the next update retries
+- One price download per update (attached MarketDataContext or one bulk download)
+- Flow-neutral daily returns (previous day's positions at today's closes) for TWR
+
+Snapshot values sum position values in each holding's own currency, like the
+other analyzers. daily_return_pct / total_return_pct are stored in percent.
+
+Usage:
+    python3 portfolio_snapshots.py <portfolio_id> [start_date]
+
+Run daily (e.g. from cron) to keep the series current. PerformanceCalculator
+also appends missing days before it reads the series.
+"""
+
+import json
+from datetime import datetime, timedelta, date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func
+from database import get_database, Holding, Transaction, PortfolioSnapshot
+from market_data_context import MarketDataContext, get_history
+
+# Initial backfill for a portfolio without snapshots (performance default period)
+DEFAULT_HISTORY_DAYS = 365
+
+# Extra calendar days priced before a range so the first day can forward-fill
+PRICE_BUFFER_DAYS = 10
+
+
+class PortfolioSnapshotJob:
+    """Builds and reads the daily portfolio_snapshots series."""
+
+    def __init__(self, db_path: str = None):
+        """Initialize snapshot job."""
+        self.db = get_database(db_path)
+        self.session = self.db.get_session()
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
+
+    def update(self, portfolio_id: int, start_date: date = None, end_date: date = None) -> int:
+        """
+        Append snapshots for trading days not yet materialized.
+
+        Days after the last snapshot are always filled; days before the first
+        snapshot only when start_date asks for them. Stored days whose
+        quantities no longer match the holdings and transactions are deleted
+        and rebuilt first.
+
+        Args:
+            portfolio_id: Portfolio ID
+            start_date: First day to cover (default: end_date - DEFAULT_HISTORY_DAYS
+                for a new series, otherwise the existing first snapshot)
+            end_date: Snapshot days before this date (exclusive, default today so
+                only final closes are stored)
+
+        Returns:
+            Number of snapshots added
+        """
+        if end_date is None:
+            end_date = datetime.now().date()
+
+        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
+        transactions = self._get_transactions(portfolio_id)
+        stored = self._get_positions(portfolio_id)
+
+        stale_date = self._first_stale_date(stored, holdings, transactions)
+        if stale_date is not None:
+            print(f"🔄 Holdings changed on or before {stale_date}, rebuilding snapshots from that day")
+            self.session.query(PortfolioSnapshot).filter(
+                and_(PortfolioSnapshot.portfolio_id == portfolio_id, PortfolioSnapshot.date >= stale_date)
+            ).delete(synchronize_session=False)
+            self.session.commit()
+            if start_date is None:
+                start_date = stored[0][0]  # Rebuild keeps the series' original start
+            stored = [(day, positions) for day, positions in stored if day < stale_date]
+
+        ranges = self._missing_ranges(portfolio_id, start_date, end_date)
+        if not ranges or not holdings:
+            return 0
+
+        closes = self._get_closes(holdings, ranges[0][0] - timedelta(days=PRICE_BUFFER_DAYS), ranges[-1][1])
+        if closes.empty:
+            return 0
+
+        # Tickers never priced (no close in this window or any stored day) are
+        # left out of the value, e.g. symbols the price source does not serve
+        priced_before = {
+            ticker for _, positions in stored for ticker, p in positions.items() if p.get("close") is not None
+        }
+        unpriced = [t for t in closes.columns if closes[t].isna().all() and t not in priced_before]
+        for ticker in unpriced:
+            print(f"⚠️  No price history for {ticker}, excluded from snapshot values")
+
+        quantities = self._get_quantities(holdings, transactions, closes.index)
+        priced = closes.drop(columns=unpriced)
+        complete = ~(priced.isna() & (quantities[priced.columns] > 0)).any(axis=1).to_numpy()
+
+        # Keep each range contiguous with the stored series: stop a range after
+        # the last snapshot at its first incomplete day, start a range before the
+        # first snapshot after its last incomplete day
+        last_stored = stored[-1][0] if stored else None
+        keep = np.zeros(len(closes), dtype=bool)
+        requested = np.zeros(len(closes), dtype=bool)
+
+        for range_start, range_end in ranges:
+            in_range = (closes.index >= pd.Timestamp(range_start)) & (closes.index < pd.Timestamp(range_end))
+            requested |= in_range
+            days = np.flatnonzero(in_range)
+            gaps = days[~complete[days]]
+
+            if len(gaps) and last_stored is not None and range_start > last_stored:
+                days = days[days < gaps[0]]
+            elif len(gaps):
+                days = days[days > gaps[-1]]
+
+            keep[days] = True
+
+        skipped = int(np.count_nonzero(requested & ~keep))
+        if skipped:
+            print(f"⚠️  {skipped} day(s) missing a close for a held ticker, left for the next update")
+
+        closes, quantities = closes[keep], quantities[keep]
+        if closes.empty:
+            return 0
+
+        values = (closes.drop(columns=unpriced) * quantities.drop(columns=unpriced)).sum(axis=1)
+
+        for day, value in values.items():
+            positions = {
+                ticker: {
+                    "quantity": float(quantities.at[day, ticker]),
+                    "close": None if ticker in unpriced else float(closes.at[day, ticker]),
+                }
+                for ticker in closes.columns
+                if quantities.at[day, ticker] > 0
+            }
+            self.session.add(
+                PortfolioSnapshot(
+                    portfolio_id=portfolio_id,
+                    date=day.date(),
+                    total_value_usd=float(value),
+                    holdings_json=json.dumps(positions),
+                )
+            )
+
+        self.session.flush()
+        self._chain_returns(portfolio_id, closes.index[0].date())
+        self.session.commit()
+
+        return len(values)
+
+    def _missing_ranges(
+        self, portfolio_id: int, start_date: Optional[date], end_date: date
+    ) -> List[Tuple[date, date]]:
+        """[start, end) date ranges without snapshots that contain business days."""
+        first, last = (
+            self.session.query(func.min(PortfolioSnapshot.date), func.max(PortfolioSnapshot.date))
+            .filter(PortfolioSnapshot.portfolio_id == portfolio_id)
+            .one()
+        )
+
+        if first is None:
+            ranges = [(start_date or end_date - timedelta(days=DEFAULT_HISTORY_DAYS), end_date)]
+        else:
+            ranges = []
+            if start_date is not None and start_date < first:
+                ranges.append((start_date, first))
+            if end_date > last + timedelta(days=1):
+                ranges.append((last + timedelta(days=1), end_date))
+
+        # Skip ranges that are only weekends (e.g. the Saturday after a Friday update)
+        return [(s, e) for s, e in ranges if np.busday_count(s, e) > 0]
+
+    def _get_positions(self, portfolio_id: int) -> List[Tuple[date, Dict]]:
+        """Stored (date, {ticker: {quantity, close}}) pairs in date order."""
+        rows = (
+            self.session.query(PortfolioSnapshot.date, PortfolioSnapshot.holdings_json)
+            .filter(PortfolioSnapshot.portfolio_id == portfolio_id)
+            .order_by(PortfolioSnapshot.date)
+            .all()
+        )
+
+        return [(day, json.loads(holdings_json or "{}")) for day, holdings_json in rows]
+
+    def _first_stale_date(
+        self, stored: List[Tuple[date, Dict]], holdings: List[Holding], transactions: List[Transaction]
+    ) -> Optional[date]:
+        """
+        First stored day whose quantities differ from the current records.
+
+        A backdated transaction changes the days from its date on, a removed
+        holding or a quantity edit every stored day.
+        """
+        if not stored:
+            return None
+
+        dates = pd.DatetimeIndex([pd.Timestamp(day) for day, _ in stored])
+        expected = self._get_quantities(holdings, transactions, dates)
+        recorded = pd.DataFrame(
+            [{ticker: p["quantity"] for ticker, p in positions.items()} for _, positions in stored],
+            index=dates,
+        )
+
+        columns = expected.columns.union(recorded.columns)
+        expected = expected.reindex(columns=columns, fill_value=0.0)
+        recorded = recorded.reindex(columns=columns).fillna(0.0)
+
+        changed = ((expected - recorded).abs() > 1e-9).any(axis=1).to_numpy()
+        if not changed.any():
+            return None
+
+        return stored[int(np.argmax(changed))][0]
+
+    def _get_transactions(self, portfolio_id: int) -> List[Transaction]:
+        """BUY/SELL transactions of the portfolio in date order."""
+        return (
+            self.session.query(Transaction)
+            .join(Holding)
+            .filter(
+                and_(
+                    Holding.portfolio_id == portfolio_id,
+                    Transaction.type.in_(["BUY", "SELL"]),
+                )
+            )
+            .order_by(Transaction.date)
+            .all()
+        )
+
+    def _get_closes(self, holdings: List[Holding], start_date: date, end_date: date) -> pd.DataFrame:
+        """Date x holding ticker closes (forward-filled, NaN before a ticker's first close)."""
+        context = self.market_data
+        if context is None:
+            context = MarketDataContext([h.ticker for h in holdings], start_date, end_date, db_path=self.db.db_path).load()
+
+        closes = {}
+        for holding in holdings:
+            try:
+                hist = get_history(holding.ticker, start_date, end_date, context)
+
+                if not hist.empty:
+                    closes[holding.ticker] = hist["Close"]
+
+            except Exception as e:
+                print(f"⚠️  Could not fetch history for {holding.ticker}: {e}")
+
+        if not closes:
+            return pd.DataFrame()
+
+        frame = pd.DataFrame(closes).sort_index()
+        if isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is not None:
+            frame.index = frame.index.tz_localize(None)
+        frame.index = frame.index.normalize()
+
+        # Failed tickers stay as all-NaN columns so their days are not stored
+        return frame.reindex(columns=[h.ticker for h in holdings]).ffill()
+
+    def _get_quantities(
+        self, holdings: List[Holding], transactions: List[Transaction], dates: pd.DatetimeIndex
+    ) -> pd.DataFrame:
+        """
+        Date x ticker quantities held at each close.
+
+        Starts from current quantities and backs out later transactions, so
+        holdings added without transaction records keep their quantity.
+        """
+        quantities = pd.DataFrame(
+            {h.ticker: np.full(len(dates), float(h.quantity)) for h in holdings}, index=dates
+        )
+
+        for txn in transactions:
+            signed = txn.quantity if txn.type == "BUY" else -txn.quantity
+            quantities.loc[quantities.index < pd.Timestamp(txn.date), txn.holding.ticker] -= signed
+
+        return quantities.clip(lower=0.0)
+
+    def _chain_returns(self, portfolio_id: int, from_date: date):
+        """
+        Recompute daily / cumulative returns for snapshots on or after from_date.
+
+        daily return = previous day's positions at today's closes / previous
+        value - 1, so buys, sells and quantity edits between two days are not
+        counted as return. A position gone today is taken at its last close.
+        """
+        rows = (
+            self.session.query(PortfolioSnapshot)
+            .filter(PortfolioSnapshot.portfolio_id == portfolio_id)
+            .order_by(PortfolioSnapshot.date)
+            .all()
+        )
+
+        growth = 1.0
+        previous = None
+
+        for row in rows:
+            positions = json.loads(row.holdings_json or "{}")
+            daily_return = 0.0  # First day or nothing priced the day before
+
+            if previous:
+                start_value = end_value = 0.0
+                for ticker, p in previous.items():
+                    if p.get("close") is None:
+                        continue
+                    close = positions.get(ticker, {}).get("close")
+                    start_value += p["quantity"] * p["close"]
+                    end_value += p["quantity"] * (p["close"] if close is None else close)
+
+                if start_value > 0:
+                    daily_return = end_value / start_value - 1
+
+            growth *= 1 + daily_return
+            previous = positions
+
+            if row.date >= from_date:
+                row.daily_return_pct = daily_return * 100
+                row.total_return_pct = (growth - 1) * 100
+
+    def get_series(self, portfolio_id: int, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Stored snapshots with start_date <= date < end_date.
+
+        Returns:
+            DataFrame indexed by date with 'value' and 'daily_return' (fraction)
+        """
+        rows = (
+            self.session.query(
+                PortfolioSnapshot.date, PortfolioSnapshot.total_value_usd, PortfolioSnapshot.daily_return_pct
+            )
+            .filter(
+                and_(
+                    PortfolioSnapshot.portfolio_id == portfolio_id,
+                    PortfolioSnapshot.date >= start_date,
+                    PortfolioSnapshot.date < end_date,
+                )
+            )
+            .order_by(PortfolioSnapshot.date)
+            .all()
+        )
+
+        frame = pd.DataFrame(rows, columns=["date", "value", "daily_return"])
+        frame.index = pd.to_datetime(frame.pop("date"))
+        frame["daily_return"] = frame["daily_return"].fillna(0.0) / 100
+
+        return frame
+
+    def close(self):
+        """Close database session."""
+        self.session.close()
+
+
+# CLI interface
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 portfolio_snapshots.py <portfolio_id> [start_date]")
+        print("\nExamples:")
+        print("  python3 portfolio_snapshots.py 1")
+        print("  python3 portfolio_snapshots.py 1 2025-01-01")
+        sys.exit(1)
+
+    portfolio_id = int(sys.argv[1])
+    start_date = datetime.strptime(sys.argv[2], "%Y-%m-%d").date() if len(sys.argv) > 2 else None
+
+    job = PortfolioSnapshotJob()
+
+    try:
+        added = job.update(portfolio_id, start_date)
+        series = job.get_series(portfolio_id, date.min, datetime.now().date())
+
+        print(f"✅ Added {added} snapshot(s) for portfolio {portfolio_id}")
+        if not series.empty:
+            print(f"   {len(series)} days stored ({series.index[0].date()} ~ {series.index[-1].date()}), "
+                  f"latest value {series['value'].iloc[-1]:,.2f}")
+    finally:
+        job.close()
@@ -19,7 +19,7 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from database import get_database, Holding, Portfolio
-from data_fetcher import get_stock_data
+from market_data_context import get_quote
 from tax_loss_harvester import TaxLossHarvester
 
 
@@ -69,6 +69,7 @@ class RebalanceEngine:
         self.db = get_database(db_path)
         self.session = self.db.get_session()
         self.tax_harvester = TaxLossHarvester(db_path)
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
 
         # Default target allocations (can be customized)
         self.default_targets = {
@@ -99,7 +100,7 @@ class RebalanceEngine:
 
         for holding in holdings:
             # Get current price
-            stock_data = get_stock_data(holding.ticker, holding.market)
+            stock_data = get_quote(holding.ticker, holding.market, self.market_data, self.db.db_path)
             if not stock_data or 'current_price' not in stock_data:
                 print(f"⚠️  Warning: Could not fetch price for {holding.ticker}")
                 current_price = holding.avg_price  # Fallback
@@ -190,7 +191,7 @@ class RebalanceEngine:
         # Calculate current values by sector and stock
         holdings_by_sector = {}
         for holding in holdings:
-            stock_data = get_stock_data(holding.ticker, holding.market)
+            stock_data = get_quote(holding.ticker, holding.market, self.market_data, self.db.db_path)
             if not stock_data:
                 continue
 
@@ -5,8 +5,9 @@ Comprehensive risk analysis including VaR, correlation analysis,
 concentration risk, and diversification scoring.
 
 Key Features:
-- Value at Risk (VaR) - historical simulation method
+- Value at Risk (VaR) - historical, parametric and Monte Carlo methods
 - Conditional VaR (CVaR / Expected Shortfall)
+- Multi-day horizons by compounding asset returns (not sqrt(h) scaling)
 - Correlation matrix and high-correlation warnings
 - Concentration risk (sector, single stock, top holdings)
 - Diversification score
@@ -20,13 +21,20 @@ Risk Metrics:
 """
 
 from datetime import datetime, timedelta, date
+from statistics import NormalDist
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
-import yfinance as yf
 from sqlalchemy import func
 from database import get_database, Holding
-from data_fetcher import get_stock_data
+from market_data_context import MarketDataContext, get_history, get_quote
+
+VAR_METHODS = ("historical", "parametric", "monte_carlo")
+VAR_CONFIDENCE_LEVELS = (0.95, 0.99)
+
+# Monte Carlo paths, drawn in batches to bound memory (batch x assets floats)
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_SIMULATION_BATCH = 25_000
 
 
 class RiskWarning:
@@ -42,6 +50,140 @@ class RiskWarning:
         return f"<RiskWarning({self.level}: {self.category} - {self.message})>"
 
 
+def _covariance_factor(cov: np.ndarray) -> np.ndarray:
+    """Lower-triangular L with L @ L.T == cov (eigen square root if cov is singular)."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        # More assets than days or duplicate series: cov is only semi-definite
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0, None))
+
+
+class VaREngine:
+    """
+    VaR / CVaR over one aligned daily returns matrix.
+
+    Methods:
+    - historical: portfolio returns over every overlapping horizon window,
+      each asset compounded over the window
+    - parametric: normal portfolio returns (mean * h, volatility * sqrt(h))
+    - monte_carlo: correlated h-day log returns (Cholesky factor of the daily
+      covariance) compounded per asset, simulated in batches
+
+    Returns are fractions of portfolio value (negative = loss).
+    """
+
+    def __init__(self, returns, weights):
+        """
+        Initialize VaR engine.
+
+        Args:
+            returns: Date x asset daily simple returns without NaN
+            weights: Position weights per asset column (sum to 1)
+        """
+        self.returns = np.asarray(returns, dtype=float)
+        self.weights = np.asarray(weights, dtype=float)
+
+    def historical_returns(self, horizon_days: int = 1) -> np.ndarray:
+        """Portfolio returns over each overlapping horizon_days window (buy and hold)."""
+        if horizon_days == 1:
+            return self.returns @ self.weights
+
+        log_growth = np.cumsum(np.log1p(self.returns), axis=0)
+        log_growth = np.vstack([np.zeros((1, log_growth.shape[1])), log_growth])
+        window = log_growth[horizon_days:] - log_growth[:-horizon_days]
+        return np.expm1(window) @ self.weights
+
+    def simulate_returns(
+        self,
+        horizon_days: int = 1,
+        simulations: int = DEFAULT_SIMULATIONS,
+        batch_size: int = DEFAULT_SIMULATION_BATCH,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Monte Carlo portfolio returns over horizon_days.
+
+        Daily log returns are treated as i.i.d. normal, so an h-day path sums to
+        N(h * mean, h * cov) and is drawn in one step per asset.
+
+        Args:
+            horizon_days: Holding period in trading days
+            simulations: Number of paths
+            batch_size: Paths generated per NumPy batch
+            seed: Random seed (None = non-deterministic)
+
+        Returns:
+            Array of simulated portfolio returns (length simulations)
+        """
+        log_returns = np.log1p(self.returns)
+        mean = log_returns.mean(axis=0) * horizon_days
+        cov = np.atleast_2d(np.cov(log_returns, rowvar=False))
+        factor_t = (_covariance_factor(cov) * np.sqrt(horizon_days)).T
+
+        rng = np.random.default_rng(seed)
+        results = np.empty(simulations)
+
+        for start in range(0, simulations, batch_size):
+            stop = min(start + batch_size, simulations)
+            shocks = rng.standard_normal((stop - start, len(mean)))
+            results[start:stop] = np.expm1(mean + shocks @ factor_t) @ self.weights
+
+        return results
+
+    def var_cvar(
+        self,
+        method: str = "historical",
+        confidence_levels: Tuple[float, ...] = VAR_CONFIDENCE_LEVELS,
+        horizon_days: int = 1,
+        simulations: int = DEFAULT_SIMULATIONS,
+        seed: Optional[int] = None,
+    ) -> Dict[float, Tuple[float, float]]:
+        """
+        VaR and CVaR per confidence level.
+
+        Args:
+            method: 'historical', 'parametric' or 'monte_carlo'
+            confidence_levels: Levels to evaluate (0.95 = 95%)
+            horizon_days: Holding period in trading days
+            simulations: Monte Carlo paths
+            seed: Monte Carlo random seed
+
+        Returns:
+            {confidence: (var_pct, cvar_pct)}
+        """
+        if method not in VAR_METHODS:
+            raise ValueError(f"Unknown VaR method '{method}' (expected one of {', '.join(VAR_METHODS)})")
+
+        if method == "parametric":
+            daily = self.returns @ self.weights
+            mean = daily.mean() * horizon_days
+            volatility = daily.std(ddof=1) * np.sqrt(horizon_days)
+            normal = NormalDist()
+
+            results = {}
+            for confidence in confidence_levels:
+                z = normal.inv_cdf(1 - confidence)
+                results[confidence] = (
+                    mean + z * volatility,
+                    mean - volatility * normal.pdf(z) / (1 - confidence),
+                )
+            return results
+
+        if method == "monte_carlo":
+            samples = self.simulate_returns(horizon_days, simulations, seed=seed)
+        else:
+            samples = self.historical_returns(horizon_days)
+
+        results = {}
+        for confidence in confidence_levels:
+            var_pct = np.percentile(samples, (1 - confidence) * 100)
+            tail = samples[samples <= var_pct]
+            results[confidence] = (var_pct, tail.mean() if len(tail) > 0 else var_pct)
+        return results
+
+
 class RiskMetricsCalculator:
     """Comprehensive risk metrics calculator."""
 
@@ -49,6 +191,58 @@ class RiskMetricsCalculator:
         """Initialize risk metrics calculator."""
         self.db = get_database(db_path)
         self.session = self.db.get_session()
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
+        self._returns_cache: Dict[Tuple, Tuple[pd.DataFrame, pd.Series]] = {}
+
+    def get_returns_matrix(self, portfolio_id: int, lookback_days: int = 252) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Aligned daily returns and position values shared by VaR and correlation.
+
+        Prices come from the attached MarketDataContext, or from one bulk
+        download for all holdings when none is attached. Results are memoized
+        per holdings / window.
+
+        Args:
+            portfolio_id: Portfolio ID
+            lookback_days: Historical data window (trading days)
+
+        Returns:
+            (returns, position_values): date x ticker daily returns (days with
+            any missing ticker dropped) and last close x quantity per ticker
+        """
+        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
+
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=lookback_days * 1.5)  # Extra buffer
+
+        key = (tuple((h.ticker, h.quantity) for h in holdings), start_date, end_date)
+        if key in self._returns_cache:
+            return self._returns_cache[key]
+
+        context = self.market_data
+        if context is None and holdings:
+            context = MarketDataContext([h.ticker for h in holdings], start_date, end_date, db_path=self.db.db_path).load()
+
+        returns_dict = {}
+        position_values = {}
+
+        for holding in holdings:
+            try:
+                hist = get_history(holding.ticker, start_date, end_date, context)
+
+                if not hist.empty:
+                    returns_dict[holding.ticker] = hist["Close"].pct_change().dropna()
+                    position_value = hist["Close"].iloc[-1] * holding.quantity
+                    position_values[holding.ticker] = position_values.get(holding.ticker, 0.0) + position_value
+
+            except Exception as e:
+                print(f"⚠️  Could not fetch data for {holding.ticker}: {e}")
+
+        returns_df = pd.DataFrame(returns_dict).dropna()
+        result = (returns_df, pd.Series(position_values, dtype=float).reindex(returns_df.columns))
+
+        self._returns_cache[key] = result
+        return result
 
     def calculate_var(
         self,
@@ -56,15 +250,21 @@ class RiskMetricsCalculator:
         confidence: float = 0.95,
         horizon_days: int = 1,
         lookback_days: int = 252,
+        method: str = "historical",
+        simulations: int = DEFAULT_SIMULATIONS,
+        seed: Optional[int] = None,
     ) -> Dict:
         """
-        Calculate Value at Risk (VaR) using historical simulation.
+        Calculate Value at Risk (VaR) and CVaR.
 
         Args:
             portfolio_id: Portfolio ID
-            confidence: Confidence level (0.95 = 95%)
-            horizon_days: Time horizon in days (default 1 day)
+            confidence: Confidence level (0.95 = 95%), reported as var_pct / cvar_pct
+            horizon_days: Time horizon in trading days (default 1 day)
             lookback_days: Historical data window (default 252 trading days = 1 year)
+            method: 'historical', 'parametric' or 'monte_carlo' (see VaREngine)
+            simulations: Monte Carlo paths
+            seed: Monte Carlo random seed (None = non-deterministic)
 
         Returns:
             {
@@ -73,96 +273,60 @@ class RiskMetricsCalculator:
                 'var_99_pct': float,
                 'var_99_amount': float,
                 'cvar_95': float,         # Expected shortfall (CVaR)
-                'worst_day_loss': float,  # Worst historical loss
-                'portfolio_value': float
+                'worst_day_loss': float,  # Worst historical loss over the horizon
+                'portfolio_value': float,
+                'var_pct' / 'cvar_pct': float,  # At the requested confidence
+                'method': str
             }
         """
-        # Get holdings
-        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
-
-        if not holdings:
-            return {}
-
-        # Get historical returns for all holdings
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=lookback_days * 1.5)  # Extra buffer
-
-        returns_data = []
-        weights = []
-        total_value = 0.0
-
-        for holding in holdings:
-            try:
-                stock = yf.Ticker(holding.ticker)
-                hist = stock.history(start=start_date, end=end_date, interval="1d")
-
-                if not hist.empty:
-                    # Get daily returns
-                    daily_returns = hist["Close"].pct_change().dropna()
-
-                    # Calculate position value
-                    current_price = hist["Close"].iloc[-1]
-                    position_value = current_price * holding.quantity
-                    total_value += position_value
+        if method not in VAR_METHODS:
+            raise ValueError(f"Unknown VaR method '{method}' (expected one of {', '.join(VAR_METHODS)})")
 
-                    returns_data.append(daily_returns)
-                    weights.append(position_value)
+        returns_df, position_values = self.get_returns_matrix(portfolio_id, lookback_days)
+        total_value = position_values.sum()
 
-            except Exception as e:
-                print(f"⚠️  Could not fetch data for {holding.ticker}: {e}")
-
-        if not returns_data or total_value == 0:
+        if returns_df.empty or total_value == 0:
             return {}
 
-        # Normalize weights
-        weights = np.array(weights) / total_value
-
-        # Align returns
-        returns_df = pd.DataFrame({f"stock_{i}": ret for i, ret in enumerate(returns_data)})
-        returns_df = returns_df.dropna()
-
         if len(returns_df) < 30:
             print(f"⚠️  Insufficient data ({len(returns_df)} days), need at least 30")
             return {}
 
-        # Calculate portfolio returns (weighted)
-        portfolio_returns = (returns_df * weights).sum(axis=1)
-
-        # Scale to horizon
-        if horizon_days > 1:
-            portfolio_returns = portfolio_returns * np.sqrt(horizon_days)
-
-        # Calculate VaR at different confidence levels
-        var_95_pct = np.percentile(portfolio_returns, (1 - 0.95) * 100)
-        var_99_pct = np.percentile(portfolio_returns, (1 - 0.99) * 100)
+        engine = VaREngine(returns_df.values, (position_values / total_value).values)
 
-        # Calculate CVaR (Conditional VaR / Expected Shortfall)
-        # Average of losses beyond VaR threshold
-        losses_beyond_var = portfolio_returns[portfolio_returns <= var_95_pct]
-        cvar_95_pct = losses_beyond_var.mean() if len(losses_beyond_var) > 0 else var_95_pct
+        levels = tuple(dict.fromkeys(VAR_CONFIDENCE_LEVELS + (confidence,)))
+        estimates = engine.var_cvar(method, levels, horizon_days, simulations, seed)
 
-        # Convert to dollar amounts
-        var_95_amount = total_value * abs(var_95_pct)
-        var_99_amount = total_value * abs(var_99_pct)
-        cvar_95_amount = total_value * abs(cvar_95_pct)
+        var_95_pct, cvar_95_pct = estimates[0.95]
+        var_99_pct, cvar_99_pct = estimates[0.99]
+        var_pct, cvar_pct = estimates[confidence]
 
-        # Worst day
-        worst_day_loss = portfolio_returns.min()
-        worst_day_amount = total_value * abs(worst_day_loss)
+        # Worst day (worst horizon window for multi-day VaR)
+        worst_day_loss = engine.historical_returns(horizon_days).min()
 
         return {
             "var_95_pct": var_95_pct,
-            "var_95_amount": var_95_amount,
+            "var_95_amount": total_value * abs(var_95_pct),
             "var_99_pct": var_99_pct,
-            "var_99_amount": var_99_amount,
+            "var_99_amount": total_value * abs(var_99_pct),
             "cvar_95_pct": cvar_95_pct,
-            "cvar_95_amount": cvar_95_amount,
+            "cvar_95_amount": total_value * abs(cvar_95_pct),
+            "cvar_99_pct": cvar_99_pct,
+            "cvar_99_amount": total_value * abs(cvar_99_pct),
+            "var_pct": var_pct,
+            "var_amount": total_value * abs(var_pct),
+            "cvar_pct": cvar_pct,
+            "cvar_amount": total_value * abs(cvar_pct),
             "worst_day_loss_pct": worst_day_loss,
-            "worst_day_loss_amount": worst_day_amount,
+            "worst_day_loss_amount": total_value * abs(worst_day_loss),
             "portfolio_value": total_value,
             "horizon_days": horizon_days,
+            "confidence": confidence,
             "confidence_95": 0.95,
             "confidence_99": 0.99,
+            "method": method,
+            "simulations": simulations if method == "monte_carlo" else 0,
+            "observations": len(returns_df),
         }
 
     def calculate_correlation_matrix(self, portfolio_id: int, lookback_days: int = 252) -> pd.DataFrame:
@@ -176,37 +340,12 @@ class RiskMetricsCalculator:
         Returns:
             Pandas DataFrame with correlation matrix
         """
-        holdings = self.session.query(Holding).filter_by(portfolio_id=portfolio_id).all()
-
-        if len(holdings) < 2:
-            return pd.DataFrame()
-
-        # Get returns
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=lookback_days * 1.5)
-
-        returns_dict = {}
+        returns_df, _ = self.get_returns_matrix(portfolio_id, lookback_days)
 
-        for holding in holdings:
-            try:
-                stock = yf.Ticker(holding.ticker)
-                hist = stock.history(start=start_date, end=end_date, interval="1d")
-
-                if not hist.empty:
-                    returns = hist["Close"].pct_change().dropna()
-                    returns_dict[holding.ticker] = returns
-
-            except Exception as e:
-                print(f"⚠️  Could not fetch data for {holding.ticker}: {e}")
-
-        if len(returns_dict) < 2:
+        if returns_df.shape[1] < 2:
             return pd.DataFrame()
 
-        # Build returns dataframe and calculate correlation
-        returns_df = pd.DataFrame(returns_dict).dropna()
-        correlation_matrix = returns_df.corr()
-
-        return correlation_matrix
+        return returns_df.corr()
 
     def find_high_correlation_pairs(
         self, correlation_matrix: pd.DataFrame, threshold: float = 0.8
@@ -263,7 +402,7 @@ class RiskMetricsCalculator:
 
         for holding in holdings:
             try:
-                current_data = get_stock_data(holding.ticker, holding.market)
+                current_data = get_quote(holding.ticker, holding.market, self.market_data, self.db.db_path)
                 current_price = current_data.get("current_price", 0)
 
                 if current_price == 0:
@@ -436,10 +575,14 @@ class RiskMetricsCalculator:
 
         return warnings
 
-    def generate_risk_report(self, portfolio_id: int) -> str:
+    def generate_risk_report(self, portfolio_id: int, var_method: str = "historical") -> str:
         """
         Generate comprehensive risk report.
 
+        Args:
+            portfolio_id: Portfolio ID
+            var_method: VaR method ('historical', 'parametric' or 'monte_carlo')
+
         Returns:
             Formatted report string
         """
@@ -453,13 +596,14 @@ class RiskMetricsCalculator:
 
         # VaR Analysis
         print("📊 Calculating VaR...")
-        var_results = self.calculate_var(portfolio_id)
+        var_results = self.calculate_var(portfolio_id, method=var_method)
 
         if var_results:
             lines.append("💰 VALUE AT RISK (VaR)")
             lines.append("-" * 80)
             lines.append(f"Portfolio Value:        ${var_results['portfolio_value']:>12,.2f}")
             lines.append(f"Time Horizon:           {var_results['horizon_days']:>13} day(s)")
+            lines.append(f"Method:                 {self._describe_var_method(var_results):>13}")
             lines.append("")
             lines.append(f"VaR (95% confidence):   ${var_results['var_95_amount']:>12,.2f}  ({var_results['var_95_pct']:>6.2%})")
             lines.append(f"VaR (99% confidence):   ${var_results['var_99_amount']:>12,.2f}  ({var_results['var_99_pct']:>6.2%})")
@@ -467,7 +611,10 @@ class RiskMetricsCalculator:
             lines.append(f"Worst Historical Day:   ${var_results['worst_day_loss_amount']:>12,.2f}  ({var_results['worst_day_loss_pct']:>6.2%})")
             lines.append("")
             lines.append("💡 Interpretation:")
-            lines.append(f"   There is a 5% chance of losing more than ${var_results['var_95_amount']:,.2f} in one day")
+            lines.append(
+                f"   There is a 5% chance of losing more than ${var_results['var_95_amount']:,.2f} "
+                f"in {var_results['horizon_days']} day(s)"
+            )
             lines.append("")
 
         # Concentration Analysis
@@ -543,6 +690,12 @@ class RiskMetricsCalculator:
 
         return "\n".join(lines)
 
+    def _describe_var_method(self, var_results: Dict) -> str:
+        """Short label for the VaR method used."""
+        if var_results["method"] == "monte_carlo":
+            return f"Monte Carlo ({var_results['simulations']:,} paths)"
+        return var_results["method"].capitalize()
+
     def _interpret_div_score(self, score: float) -> str:
         """Interpret diversification score."""
         if score >= 80:
@@ -563,18 +716,20 @@ class RiskMetricsCalculator:
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) < 2:
-        print("Usage: python3 risk_metrics.py <portfolio_id>")
+    if len(sys.argv) < 2 or (len(sys.argv) > 2 and sys.argv[2] not in VAR_METHODS):
+        print("Usage: python3 risk_metrics.py <portfolio_id> [historical|parametric|monte_carlo]")
         print("\nExample:")
         print("  python3 risk_metrics.py 1")
+        print("  python3 risk_metrics.py 1 monte_carlo")
         sys.exit(1)
 
     portfolio_id = int(sys.argv[1])
+    var_method = sys.argv[2] if len(sys.argv) > 2 else "historical"
 
     calculator = RiskMetricsCalculator()
 
     try:
-        report = calculator.generate_risk_report(portfolio_id)
+        report = calculator.generate_risk_report(portfolio_id, var_method)
         print("\n" + report)
     finally:
         calculator.close()
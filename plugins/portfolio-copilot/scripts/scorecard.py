@@ -26,8 +26,8 @@ from data_fetcher import DataSourceManager
 class CompanyScorecardGenerator:
     """Generate comprehensive company scorecards"""
 
-    def __init__(self):
-        self.data_manager = DataSourceManager()
+    def __init__(self, db_path: str = None):
+        self.data_manager = DataSourceManager(db_path=db_path)
 
     def calculate_scorecard(self, ticker: str) -> Dict:
         """
@@ -22,7 +22,7 @@ from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 import yfinance as yf
 from database import get_database, Holding, Transaction
-from data_fetcher import get_stock_data
+from market_data_context import get_quote
 
 
 class HarvestOpportunity:
@@ -74,6 +74,7 @@ class TaxLossHarvester:
         """Initialize tax loss harvester with database connection."""
         self.db = get_database(db_path)
         self.session = self.db.get_session()
+        self.market_data = None  # MarketDataContext attached by a comprehensive run
 
     def find_harvest_opportunities(
         self, portfolio_id: int, min_loss_threshold: float = 100.0, tax_rate_override: Dict = None
@@ -95,7 +96,7 @@ class TaxLossHarvester:
 
         for holding in holdings:
             # Get current price
-            stock_data = get_stock_data(holding.ticker, holding.market)
+            stock_data = get_quote(holding.ticker, holding.market, self.market_data, self.db.db_path)
             if not stock_data or "current_price" not in stock_data:
                 print(f"⚠️  Could not fetch price for {holding.ticker}, skipping")
                 continue